@@ -0,0 +1,70 @@
+"""
+bench_astar.py
+
+This file compares Dijkstra's algorithm and A* search on a 50k-vertex grid road network,
+by settled-vertex count and wall time, for short and long (cross-city) trips.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, grid_label
+
+
+def compare(graph, pairs, name: str):
+    """Run both searches over the (start label, end label) pairs and print the averages."""
+    csr = graph.get_csr()
+    ids = np.empty((len(pairs), 2), dtype=np.int64)
+    for i in range(len(pairs)):
+        ids[i, 0] = graph.find_vertex(pairs[i][0]).get_id()
+        ids[i, 1] = graph.find_vertex(pairs[i][1]).get_id()
+
+    dijkstra_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        distances, _ = csr.dijkstra(start_id, end_id)
+        # Dijkstra settles every vertex closer than the end vertex before settling the end vertex
+        dijkstra_settled += np.count_nonzero(distances < distances[end_id]) + 1
+    dijkstra_time = time.perf_counter() - start
+
+    astar_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        _, _, settled = csr.astar(start_id, end_id)
+        astar_settled += settled
+    astar_time = time.perf_counter() - start
+
+    print(f"{name}: dijkstra {dijkstra_settled / len(ids):.0f} settled, {dijkstra_time / len(ids) * 1e3:.1f} ms"
+          f" | astar {astar_settled / len(ids):.0f} settled, {astar_time / len(ids) * 1e3:.1f} ms")
+
+
+def main():
+    rows = cols = 224  # ~50k vertices, ~100k roads
+    # Intersections 100m apart, with each road 100-130m long (roads are never shorter than the straight line)
+    graph = build_grid_graph(rows, cols, spacing=100, min_weight=100, max_weight=130)
+    print(f"heuristic scale: {graph.get_csr().get_heuristic_scale()}")
+
+    rng = np.random.default_rng(2)
+    short_trips = np.empty((10, 2), dtype=object)
+    long_trips = np.empty((10, 2), dtype=object)
+    straight_trips = np.empty((10, 2), dtype=object)
+    for i in range(10):
+        row, col = rng.integers(20, rows - 20, 2)
+        short_trips[i] = (grid_label(row, col), grid_label(row + 10, col + 10))
+        long_trips[i] = (grid_label(rng.integers(10), rng.integers(10)),
+                         grid_label(rows - 1 - rng.integers(10), cols - 1 - rng.integers(10)))
+        row = rng.integers(rows)
+        straight_trips[i] = (grid_label(row, 0), grid_label(row, cols - 1))
+    compare(graph, short_trips, "short trips")
+    compare(graph, long_trips, "cross-city diagonal trips")
+    # On a grid the straight line is tightest for trips along a row, and weakest (1/sqrt(2)) across the diagonal
+    compare(graph, straight_trips, "cross-city trips along a row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+bench_bidirectional.py
+
+This file compares forward and bidirectional Dijkstra on a 50k-vertex grid road network,
+by settled-vertex count and wall time.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, random_queries
+
+
+def main():
+    rows = cols = 224  # ~50k vertices, ~100k roads
+    graph = build_grid_graph(rows, cols)
+    csr = graph.get_csr()
+    queries = random_queries(rows, cols, 20)
+    ids = np.empty(queries.shape, dtype=np.int64)
+    for i in range(len(queries)):
+        ids[i, 0] = graph.find_vertex(queries[i, 0]).get_id()
+        ids[i, 1] = graph.find_vertex(queries[i, 1]).get_id()
+
+    forward_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        distances, _ = csr.dijkstra(start_id, end_id)
+        # Forward Dijkstra settles every vertex closer than the end vertex before settling the end vertex
+        forward_settled += np.count_nonzero(distances < distances[end_id]) + 1
+    forward_time = time.perf_counter() - start
+
+    bidirectional_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        _, _, settled = csr.bidirectional_dijkstra(start_id, end_id)
+        bidirectional_settled += settled
+    bidirectional_time = time.perf_counter() - start
+
+    print(f"{'algorithm':<15}{'settled/query':>15}{'ms/query':>12}")
+    print(f"{'dijkstra':<15}{forward_settled / len(ids):>15.0f}{forward_time / len(ids) * 1e3:>12.1f}")
+    print(f"{'bidirectional':<15}{bidirectional_settled / len(ids):>15.0f}"
+          f"{bidirectional_time / len(ids) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+bench_contraction_hierarchy.py
+
+This file benchmarks contraction hierarchy preprocessing time, and compares its query time and settled-vertex count
+against forward Dijkstra on a grid road network.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, random_queries
+
+
+def main():
+    rows = cols = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    graph = build_grid_graph(rows, cols)
+    csr = graph.get_csr()
+    print(f"{graph.get_vertex_count()} vertices / {graph.edge_count} roads")
+
+    start = time.perf_counter()
+    hierarchy = graph.build_contraction_hierarchy()
+    preprocess_time = time.perf_counter() - start
+    shortcuts = np.count_nonzero(hierarchy.up_middle != -1)
+    print(f"preprocessing: {preprocess_time:.1f}s, {shortcuts} shortcuts added")
+
+    queries = random_queries(rows, cols, 50)
+    ids = np.empty(queries.shape, dtype=np.int64)
+    for i in range(len(queries)):
+        ids[i, 0] = graph.find_vertex(queries[i, 0]).get_id()
+        ids[i, 1] = graph.find_vertex(queries[i, 1]).get_id()
+
+    dijkstra_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        distances, _ = csr.dijkstra(start_id, end_id)
+        dijkstra_settled += np.count_nonzero(distances < distances[end_id]) + 1
+    dijkstra_time = (time.perf_counter() - start) / len(ids)
+
+    ch_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        _, _, settled = hierarchy.query(start_id, end_id)
+        ch_settled += settled
+    ch_time = (time.perf_counter() - start) / len(ids)
+
+    print(f"dijkstra: {dijkstra_settled / len(ids):.0f} settled, {dijkstra_time * 1e3:.2f} ms/query")
+    print(f"ch query (incl. path unpacking): {ch_settled / len(ids):.0f} settled, {ch_time * 1e3:.2f} ms/query"
+          f" ({dijkstra_time / ch_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
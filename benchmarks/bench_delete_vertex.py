@@ -0,0 +1,34 @@
+"""
+bench_delete_vertex.py
+
+This file benchmarks Graph.delete_vertex on a 50k-vertex grid road network.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+from grid import build_grid_graph, random_queries
+
+
+def main():
+    rows = cols = 224  # ~50k vertices, ~100k roads
+    graph = build_grid_graph(rows, cols)
+
+    # Each random query's start is a location to delete, skipping repeats
+    labels = []
+    for label in random_queries(rows, cols, 200)[:, 0]:
+        if label not in labels:
+            labels.append(label)
+    start = time.perf_counter()
+    for label in labels:
+        graph.delete_vertex(label)
+    elapsed = time.perf_counter() - start
+    print(f"delete_vertex: {elapsed / len(labels) * 1e6:.0f} us/location over {len(labels)} locations"
+          f" ({graph.edge_count} roads left)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+bench_dijkstra.py
+
+This file benchmarks point-to-point Graph.dijkstra queries on a 50k-vertex grid road network.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+from grid import build_grid_graph, random_queries
+
+
+def main():
+    rows = cols = 224  # ~50k vertices, ~100k roads
+    start = time.perf_counter()
+    graph = build_grid_graph(rows, cols)
+    print(f"Built {graph.get_vertex_count()} vertices / {graph.edge_count} roads in {time.perf_counter() - start:.2f}s")
+
+    queries = random_queries(rows, cols, 20)
+    start = time.perf_counter()
+    for start_label, end_label in queries:
+        graph.dijkstra(start_label, end_label)
+    elapsed = time.perf_counter() - start
+    print(f"dijkstra: {elapsed / len(queries) * 1e3:.1f} ms/query over {len(queries)} random queries")
+
+
+if __name__ == "__main__":
+    main()
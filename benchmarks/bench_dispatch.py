@@ -0,0 +1,53 @@
+"""
+bench_dispatch.py
+
+This file benchmarks finding the nearest vehicles to a pickup on a 10k-vertex grid road network, with one search
+against one Graph.dijkstra query per vehicle.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, grid_label, random_queries
+
+from Dispatch import find_nearest_vehicles
+from Vehicle import Vehicle
+
+
+def main():
+    rows = cols = 100  # 10k vertices, ~20k roads
+    vehicle_count = 200
+    k = 5
+    graph = build_grid_graph(rows, cols)
+
+    rng = np.random.default_rng(2)
+    vehicles = np.empty(vehicle_count, dtype=object)
+    for i in range(vehicle_count):
+        vehicles[i] = Vehicle(f"V{i}", 100)
+        vehicles[i].set_location(graph.find_vertex(grid_label(int(rng.integers(rows)), int(rng.integers(cols)))))
+    pickups = random_queries(rows, cols, 5)[:, 0]
+
+    start = time.perf_counter()
+    for pickup in pickups:
+        nearest = find_nearest_vehicles(graph, vehicles, pickup, k)
+    elapsed = time.perf_counter() - start
+    print(f"find_nearest_vehicles (k={k}): {elapsed / len(pickups) * 1e3:.1f} ms/pickup")
+
+    start = time.perf_counter()
+    for pickup in pickups:
+        distances = np.empty(vehicle_count)
+        for i, vehicle in enumerate(vehicles):
+            distances[i] = graph.dijkstra(pickup, vehicle.get_location().get_label())[0]
+        baseline = np.sort(distances)[:k]
+    elapsed = time.perf_counter() - start
+    print(f"dijkstra per vehicle ({vehicle_count} vehicles): {elapsed / len(pickups) * 1e3:.1f} ms/pickup")
+    assert [distance for _, distance in nearest] == list(baseline)
+
+
+if __name__ == "__main__":
+    main()
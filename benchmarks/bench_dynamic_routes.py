@@ -0,0 +1,58 @@
+"""
+bench_dynamic_routes.py
+
+This file benchmarks keeping the shortest path trees of 20 vehicle locations up to date on a 10k-vertex grid road
+network as roads are added and deleted, against searching again from every location after each change.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, grid_label
+
+
+def main():
+    rows = cols = 100  # 10k vertices, ~20k roads
+    source_count = 20
+    change_count = 50
+    graph = build_grid_graph(rows, cols)
+    rng = np.random.default_rng(4)
+    sources = [grid_label(int(rng.integers(rows)), int(rng.integers(cols))) for _ in range(source_count)]
+    trees = [graph.track_source(label) for label in sources]
+
+    # Alternate between opening a diagonal shortcut and closing an existing road
+    changes = []
+    for i in range(change_count):
+        row, col = int(rng.integers(rows - 1)), int(rng.integers(cols - 1))
+        if i % 2 == 0:
+            changes.append(("add", grid_label(row, col), grid_label(row + 1, col + 1)))
+        else:
+            changes.append(("delete", grid_label(row, col), grid_label(row, col + 1)))
+
+    start = time.perf_counter()
+    for kind, label1, label2 in changes:
+        if kind == "add":
+            if not graph.is_adjacent(label1, label2):
+                graph.add_edge(label1, label2, 1)
+        elif graph.is_adjacent(label1, label2):
+            graph.delete_edge(label1, label2)
+    elapsed = time.perf_counter() - start
+    print(f"incremental repair: {elapsed / change_count * 1e3:.1f} ms/change for {source_count} tracked locations")
+
+    csr = graph.get_csr()
+    start = time.perf_counter()
+    for tree in trees[:5]:
+        distances, _ = csr.dijkstra(tree.source_id)
+        assert np.array_equal(distances, tree.get_distances()[:distances.size])
+    per_search = (time.perf_counter() - start) / 5
+    print(f"full recomputation: {per_search * source_count * 1e3:.1f} ms/change"
+          f" ({source_count} searches x {per_search * 1e3:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+bench_find_vertex.py
+
+This file benchmarks building a Graph and looking up vertices by label through Graph.find_vertex.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from Graph import Graph
+
+
+def bench(size: int, lookups: int):
+    """Build a graph of the given size and time label lookups against it."""
+    labels = np.empty(size, dtype=object)
+    for i in range(size):
+        labels[i] = f"LOC{i:07d}"
+
+    graph = Graph()
+    start = time.perf_counter()
+    for label in labels:
+        graph.add_vertex(label)
+    build_time = time.perf_counter() - start
+
+    # Look up random labels, mixing the case to exercise the case-insensitive match
+    rng = np.random.default_rng(0)
+    queries = labels[rng.integers(0, size, lookups)]
+    start = time.perf_counter()
+    for label in queries:
+        graph.find_vertex(label.lower())
+    lookup_time = time.perf_counter() - start
+
+    print(f"{size:>8} vertices | build {build_time:8.3f}s ({build_time / size * 1e6:6.2f} us/vertex)"
+          f" | lookup {lookup_time / lookups * 1e6:6.2f} us/call")
+
+
+def main():
+    for size in (1_000, 10_000, 100_000):
+        bench(size, 10_000)
+
+
+if __name__ == "__main__":
+    main()
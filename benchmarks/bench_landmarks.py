@@ -0,0 +1,66 @@
+"""
+bench_landmarks.py
+
+This file compares Dijkstra's algorithm and the ALT (landmark) search on a 50k-vertex grid road network without
+coordinates, by settled-vertex count and wall time, and times saving and loading the landmark table with the graph.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, random_queries
+
+from Graph import Graph
+from Landmarks import Landmarks
+
+
+def main():
+    rows = cols = 224  # ~50k vertices, ~100k roads
+    query_count = 20
+    graph = build_grid_graph(rows, cols)
+    csr = graph.get_csr()
+    queries = random_queries(rows, cols, query_count)
+    ids = np.array([[graph.find_vertex(start).get_id(), graph.find_vertex(end).get_id()] for start, end in queries])
+
+    dijkstra_settled = 0
+    start = time.perf_counter()
+    for start_id, end_id in ids:
+        distances, _ = csr.dijkstra(start_id, end_id)
+        # Dijkstra settles every vertex closer than the end vertex before settling the end vertex
+        dijkstra_settled += np.count_nonzero(distances < distances[end_id]) + 1
+    dijkstra_time = (time.perf_counter() - start) / query_count
+    print(f"dijkstra: {dijkstra_settled / query_count:.0f} settled, {dijkstra_time * 1e3:.1f} ms/query")
+
+    for count in (4, 8, 16):
+        start = time.perf_counter()
+        landmarks = graph.build_landmarks(count)
+        build_time = time.perf_counter() - start
+        alt_settled = 0
+        start = time.perf_counter()
+        for start_id, end_id in ids:
+            alt_settled += csr.astar(start_id, end_id, landmarks.lower_bounds(end_id))[2]
+        alt_time = (time.perf_counter() - start) / query_count
+        print(f"alt ({count} landmarks, built in {build_time:.1f}s): {alt_settled / query_count:.0f} settled, "
+              f"{alt_time * 1e3:.1f} ms/query")
+
+    with tempfile.TemporaryDirectory() as path:
+        graph.save(path)
+        size = os.path.getsize(os.path.join(path, "landmark_distances.npy"))
+        start = time.perf_counter()
+        Landmarks.load(path)
+        print(f"loading the landmark table ({size / 1e6:.1f} MB): {(time.perf_counter() - start) * 1e3:.1f} ms")
+        start = time.perf_counter()
+        loaded = Graph.load(path)
+        print(f"Graph.load with landmarks: {time.perf_counter() - start:.1f}s, "
+              f"landmarks ready: {loaded.landmarks is not None}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+bench_load_csv.py
+
+This file compares bulk loading a grid road network from an edge list file with Graph.from_edge_list against adding
+the same locations and roads one at a time. The rows are shuffled, as real exports aren't sorted by label.
+
+Usage: python bench_load_csv.py [grid size]
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from grid import grid_label
+from Graph import Graph
+
+
+def write_grid_csv(path: str, rows: int, cols: int, seed: int = 0) -> None:
+    """Write the roads of a rows x cols grid, with random weights, to an edge list file in a random order."""
+    rng = np.random.default_rng(seed)
+    edges = np.empty((2 * rows * cols - rows - cols, 3), dtype=object)
+    count = 0
+    for row in range(rows):
+        for col in range(cols):
+            if col + 1 < cols:
+                edges[count] = (grid_label(row, col), grid_label(row, col + 1), int(rng.integers(1, 11)))
+                count += 1
+            if row + 1 < rows:
+                edges[count] = (grid_label(row, col), grid_label(row + 1, col), int(rng.integers(1, 11)))
+                count += 1
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(("from", "to", "distance"))
+        writer.writerows(edges[rng.permutation(count)])
+
+
+def load_one_at_a_time(path: str) -> Graph:
+    """Load an edge list file through Graph.add_vertex and Graph.add_edge."""
+    graph = Graph()
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        for label1, label2, weight in reader:
+            for label in (label1, label2):
+                if not graph.has_vertex(label):
+                    graph.add_vertex(label)
+            graph.add_edge(label1, label2, float(weight))
+    return graph
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "grid.csv")
+        write_grid_csv(path, size, size)
+
+        graph = Graph.from_edge_list(path, verbose=True)
+        print(f"from_edge_list: {graph.get_vertex_count()} locations, {graph.edge_count} roads")
+
+        # Inserting each label into the sorted vertex list is O(V), so only time the old path on smaller grids
+        if size <= 100:
+            start = time.perf_counter()
+            load_one_at_a_time(path)
+            seconds = time.perf_counter() - start
+            print(f"add_vertex/add_edge: {seconds:.2f}s ({graph.edge_count / seconds:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+bench_mapped_graph.py
+
+This file times opening a saved grid road network as a MappedGraph and querying it, and shows several worker processes
+sharing the mapped pages (file-backed memory) rather than each holding a private copy of the graph.
+
+Usage: python bench_mapped_graph.py [grid size] [workers]
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from bench_load_csv import write_grid_csv
+from grid import random_queries
+from Graph import Graph
+from MappedGraph import MappedGraph
+
+
+def memory_usage() -> str:
+    """Return the process's file-backed (shareable) and anonymous (private) resident memory, on Linux."""
+    try:
+        with open("/proc/self/status") as file:
+            fields = dict(line.split(":", 1) for line in file if line.startswith(("RssAnon", "RssFile")))
+        return f"RssFile {fields['RssFile'].strip()}, RssAnon {fields['RssAnon'].strip()}"
+    except OSError:
+        return "memory usage not available"
+
+
+def run_queries(path: str, size: int, seed: int) -> str:
+    """Open the snapshot and time some random queries against it."""
+    start = time.perf_counter()
+    graph = MappedGraph(path)
+    open_time = time.perf_counter() - start
+    queries = random_queries(size, size, 20, seed)
+
+    start = time.perf_counter()
+    for label, _ in queries:
+        graph.find_vertex(label)
+    find_time = (time.perf_counter() - start) / len(queries)
+    start = time.perf_counter()
+    for start_label, end_label in queries:
+        graph.is_path(start_label, end_label)
+    path_time = (time.perf_counter() - start) / len(queries)
+    start = time.perf_counter()
+    for start_label, end_label in queries[:5]:
+        graph.dijkstra(start_label, end_label)
+    dijkstra_time = (time.perf_counter() - start) / 5
+    return (f"open {open_time * 1e3:.1f} ms, find_vertex {find_time * 1e6:.0f} us, is_path {path_time * 1e6:.0f} us, "
+            f"dijkstra {dijkstra_time * 1e3:.0f} ms | {memory_usage()}")
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "grid.csv")
+        snapshot_path = os.path.join(directory, "grid")
+        write_grid_csv(csv_path, size, size)
+        graph = Graph.from_edge_list(csv_path)
+        graph.save(snapshot_path)
+        print(f"{graph.get_vertex_count()} locations, {graph.edge_count} roads | in-memory Graph: {memory_usage()}")
+        del graph
+
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            for worker, result in enumerate(pool.starmap(run_queries,
+                                                         [(snapshot_path, size, seed) for seed in range(workers)])):
+                print(f"worker {worker}: {result}")
+
+
+if __name__ == "__main__":
+    main()
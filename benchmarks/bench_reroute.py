@@ -0,0 +1,54 @@
+"""
+bench_reroute.py
+
+This file benchmarks re-routing a fleet of vehicles on a 10k-vertex grid road network, against one Graph.dijkstra
+query per vehicle, and with different numbers of worker processes.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import time
+
+import numpy as np
+
+from grid import build_grid_graph, grid_label
+
+from Dispatch import reroute_vehicles
+from Vehicle import Vehicle
+
+
+def main():
+    rows = cols = 100  # 10k vertices, ~20k roads
+    vehicle_count = 1000
+    location_count = 100
+    graph = build_grid_graph(rows, cols)
+
+    # Vehicles gather at a limited number of locations (depots, ranks), heading to random destinations
+    rng = np.random.default_rng(3)
+    locations = [graph.find_vertex(grid_label(int(rng.integers(rows)), int(rng.integers(cols))))
+                 for _ in range(location_count)]
+    vehicles = np.empty(vehicle_count, dtype=object)
+    for i in range(vehicle_count):
+        vehicles[i] = Vehicle(f"V{i}", 100)
+        vehicles[i].set_location(locations[int(rng.integers(location_count))])
+        vehicles[i].set_destination(graph.find_vertex(grid_label(int(rng.integers(rows)), int(rng.integers(cols)))))
+
+    sample = vehicles[:50]
+    start = time.perf_counter()
+    for vehicle in sample:
+        graph.dijkstra(vehicle.get_location().get_label(), vehicle.get_destination().get_label())
+    per_vehicle = (time.perf_counter() - start) / sample.size
+    print(f"dijkstra per vehicle: {per_vehicle * vehicle_count:.1f}s for {vehicle_count} vehicles (estimated)")
+
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        reroute_vehicles(graph, vehicles, workers)
+        print(f"reroute_vehicles ({workers} workers): {time.perf_counter() - start:.1f}s for {vehicle_count} vehicles"
+              f" from {location_count} locations")
+
+
+if __name__ == "__main__":
+    main()
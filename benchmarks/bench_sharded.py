@@ -0,0 +1,43 @@
+"""
+bench_sharded.py
+
+This file benchmarks shortest path queries answered by a ShardedGraph (one worker process per region) on a 10k-vertex
+grid road network, against Graph.dijkstra on the whole graph.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import time
+
+from grid import build_grid_graph, random_queries
+
+from ShardedGraph import ShardedGraph
+
+
+def main():
+    rows = cols = 100  # 10k vertices, ~20k roads
+    query_count = 100
+    graph = build_grid_graph(rows, cols)
+    queries = random_queries(rows, cols, query_count)
+
+    start = time.perf_counter()
+    for start_label, end_label in queries:
+        graph.dijkstra(start_label, end_label)
+    print(f"Graph.dijkstra: {(time.perf_counter() - start) / query_count * 1e3:.1f} ms/query")
+
+    for shard_count in (2, 4, 8):
+        start = time.perf_counter()
+        with ShardedGraph(graph, shard_count) as sharded_graph:
+            build_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for start_label, end_label in queries:
+                sharded_graph.dijkstra(start_label, end_label)
+            per_query = (time.perf_counter() - start) / query_count
+            print(f"ShardedGraph ({shard_count} shards, {sharded_graph.get_boundary_count()} boundary vertices): "
+                  f"built in {build_time:.1f}s, {per_query * 1e3:.1f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+bench_snapshot.py
+
+This file times saving a grid road network as a binary snapshot and restoring it with Graph.load, against bulk loading
+the same network from an edge list file.
+
+Usage: python bench_snapshot.py [grid size]
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from bench_load_csv import write_grid_csv
+from Graph import Graph
+from GraphCSR import GraphCSR
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "grid.csv")
+        snapshot_path = os.path.join(directory, "grid")
+        write_grid_csv(csv_path, size, size)
+
+        start = time.perf_counter()
+        graph = Graph.from_edge_list(csv_path)
+        print(f"from_edge_list: {time.perf_counter() - start:.2f}s "
+              f"({graph.get_vertex_count()} locations, {graph.edge_count} roads)")
+
+        start = time.perf_counter()
+        graph.save(snapshot_path)
+        print(f"save: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        GraphCSR.load(snapshot_path)
+        print(f"read snapshot arrays (GraphCSR.load): {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        loaded = Graph.load(snapshot_path)
+        print(f"Graph.load: {time.perf_counter() - start:.2f}s ({loaded.edge_count} roads)")
+
+
+if __name__ == "__main__":
+    main()
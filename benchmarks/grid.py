@@ -0,0 +1,57 @@
+"""
+grid.py
+
+This file contains helpers shared by the benchmarks for building grid-shaped road networks.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from Graph import Graph
+
+
+def grid_label(row: int, col: int) -> str:
+    """Return the label of the vertex at the given grid position."""
+    return f"R{row:04d}C{col:04d}"
+
+
+def build_grid_graph(rows: int, cols: int, seed: int = 0, spacing: float = 1, min_weight: int = 1,
+                     max_weight: int = 10) -> Graph:
+    """Build a rows x cols grid graph with random integer road lengths between min_weight and max_weight.
+
+    Each vertex is given its grid position times spacing as coordinates.
+    Labels are added in sorted order, so vertex insertion takes the O(1) append path.
+    """
+    rng = np.random.default_rng(seed)
+    graph = Graph()
+    for row in range(rows):
+        for col in range(cols):
+            graph.add_vertex(grid_label(row, col), coordinates=(col * spacing, row * spacing))
+
+    for row in range(rows):
+        for col in range(cols):
+            if col + 1 < cols:
+                graph.add_edge(grid_label(row, col), grid_label(row, col + 1),
+                               int(rng.integers(min_weight, max_weight + 1)))
+            if row + 1 < rows:
+                graph.add_edge(grid_label(row, col), grid_label(row + 1, col),
+                               int(rng.integers(min_weight, max_weight + 1)))
+    return graph
+
+
+def random_queries(rows: int, cols: int, count: int, seed: int = 1) -> np.ndarray:
+    """Return an array of count random (start label, end label) pairs on the grid."""
+    rng = np.random.default_rng(seed)
+    queries = np.empty((count, 2), dtype=object)
+    for i in range(count):
+        queries[i, 0] = grid_label(int(rng.integers(rows)), int(rng.integers(cols)))
+        queries[i, 1] = grid_label(int(rng.integers(rows)), int(rng.integers(cols)))
+    return queries
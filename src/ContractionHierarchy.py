@@ -0,0 +1,469 @@
+"""
+ContractionHierarchy.py
+
+This file contains the ContractionHierarchy class, a preprocessed form of a graph that answers shortest path queries
+on large road networks much faster than Dijkstra's algorithm.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import hashlib
+
+import numpy as np
+
+from GraphCSR import GraphCSR
+from LinkedList import LinkedList
+from MinHeap import MinHeap
+from VertexHashTable import VertexHashTable
+
+
+class ContractionHierarchy:
+    """A class to represent a contraction hierarchy of a graph.
+
+    Vertices are contracted (removed) one at a time, least important first. When removing a vertex would break the
+    only shortest path between two of its neighbours, a shortcut edge is added between them. Every shortest path can
+    then be found by searching only "upwards" (towards vertices contracted later) from both ends, which settles a tiny
+    fraction of the graph.
+
+    The upward edges are stored in CSR form: the upward edges of vertex v are up_targets[up_offsets[v]:up_offsets[v + 1]].
+
+    Attributes:
+        version: The graph version the hierarchy was built from.
+        rank: An int64 array giving the contraction order of each vertex id (-1 for deleted vertex ids).
+        up_offsets: An int64 array of size V + 1 giving where each vertex's upward edges start.
+        up_targets: An int64 array of the higher ranked vertex id at the end of each upward edge.
+        up_weights: A float64 array of upward edge weights.
+        up_middle: An int64 array giving the contracted vertex each shortcut skips over (-1 for original edges).
+        labels: A unicode array of the vertex labels the hierarchy was built for ("" for deleted vertex ids).
+        fingerprint: A SHA-256 hex digest of the offsets, targets and weights of the snapshot the hierarchy was built
+            from, so a saved hierarchy is only loaded into a graph with the same roads.
+    """
+
+    def __init__(self, version: int, rank: np.ndarray, up_offsets: np.ndarray, up_targets: np.ndarray,
+                 up_weights: np.ndarray, up_middle: np.ndarray, labels: np.ndarray, fingerprint: str):
+        """Initialize a ContractionHierarchy object.
+
+        Args:
+            version: The graph version the hierarchy was built from.
+            rank: The contraction order of each vertex id.
+            up_offsets: Offsets of each vertex's upward edges.
+            up_targets: Target vertex ids of the upward edges.
+            up_weights: Weights of the upward edges.
+            up_middle: Middle vertex ids of the upward edges (-1 for original edges).
+            labels: The vertex labels the hierarchy was built for.
+            fingerprint: The digest of the snapshot the hierarchy was built from (see csr_fingerprint).
+        """
+        self.version = version
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+        self.labels = labels
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_csr(cls, csr: GraphCSR, settle_limit: int = 50) -> "ContractionHierarchy":
+        """Build a contraction hierarchy from a CSR snapshot of a graph.
+
+        Vertices are ordered by edge difference (shortcuts added minus edges removed) plus the number of neighbours
+        already contracted, with priorities updated lazily as the graph shrinks.
+
+        Args:
+            csr: The CSR snapshot of the graph.
+            settle_limit: The most vertices a witness search settles before giving up. A lower limit preprocesses
+                faster but may add unnecessary (though still correct) shortcuts.
+
+        Returns:
+            The ContractionHierarchy of the snapshot.
+        """
+        builder = _HierarchyBuilder(csr, settle_limit)
+        builder.contract_all()
+
+        size = csr.get_size()
+        labels = np.array([label if label is not None else "" for label in csr.labels], dtype=str)
+        if size == 0:
+            labels = np.empty(0, dtype=str)
+
+        # Flatten the upward edges recorded for each vertex into CSR arrays
+        up_offsets = np.zeros(size + 1, dtype=np.int64)
+        for vertex_id in range(size):
+            if builder.upward[vertex_id] is not None:
+                up_offsets[vertex_id + 1] = len(builder.upward[vertex_id])
+        np.cumsum(up_offsets, out=up_offsets)
+
+        up_targets = np.empty(up_offsets[size], dtype=np.int64)
+        up_weights = np.empty(up_offsets[size], dtype=np.float64)
+        up_middle = np.empty(up_offsets[size], dtype=np.int64)
+        for vertex_id in range(size):
+            if builder.upward[vertex_id] is not None:
+                position = up_offsets[vertex_id]
+                for node in builder.upward[vertex_id]:
+                    up_targets[position], up_weights[position], up_middle[position] = node.get_value()
+                    position += 1
+
+        return cls(csr.version, builder.rank, up_offsets, up_targets, up_weights, up_middle, labels,
+                   csr_fingerprint(csr))
+
+    def save(self, path: str) -> None:
+        """Save the hierarchy to a .npz file.
+
+        Args:
+            path: Path of the file to write.
+        """
+        np.savez(path, version=self.version, rank=self.rank, up_offsets=self.up_offsets,
+                 up_targets=self.up_targets, up_weights=self.up_weights, up_middle=self.up_middle, labels=self.labels,
+                 fingerprint=self.fingerprint)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """Load a hierarchy saved with save.
+
+        Args:
+            path: Path of the file to read.
+
+        Returns:
+            The loaded ContractionHierarchy. A hierarchy saved without a fingerprint gets an empty one, so it matches
+            no snapshot.
+        """
+        with np.load(path) as data:
+            fingerprint = str(data["fingerprint"]) if "fingerprint" in data.files else ""
+            return cls(int(data["version"]), data["rank"], data["up_offsets"], data["up_targets"],
+                       data["up_weights"], data["up_middle"], data["labels"], fingerprint)
+
+    def matches(self, csr: GraphCSR) -> bool:
+        """Check if the hierarchy was built for the same vertices (by id and label) and roads as a snapshot.
+
+        Args:
+            csr: The CSR snapshot to compare against.
+
+        Returns:
+            True if the vertex ids, labels and roads (with their weights) match, False otherwise.
+        """
+        if self.labels.size != csr.get_size() or self.fingerprint != csr_fingerprint(csr):
+            return False
+        for vertex_id in range(csr.get_size()):
+            if (csr.labels[vertex_id] or "") != self.labels[vertex_id]:
+                return False
+        return True
+
+    def query(self, start_id: int, end_id: int) -> tuple[float, np.ndarray, int]:
+        """Find the shortest path between two vertices with a bidirectional search over upward edges only.
+
+        Each side can stop once its closest unsettled vertex is no closer than the best path found so far.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+
+        Returns:
+            A tuple of the shortest distance (inf if there is no path), the unpacked path vertex ids (empty if there
+            is no path) and the number of vertices settled by both searches together.
+        """
+        up_offsets = self.up_offsets
+        up_targets = self.up_targets
+        up_weights = self.up_weights
+
+        # Index 0 holds the forward search (from the start), index 1 the backward search (from the end)
+        size = self.rank.size
+        distances = (np.full(size, np.inf, dtype=np.float64), np.full(size, np.inf, dtype=np.float64))
+        prev = (np.full(size, -1, dtype=np.int64), np.full(size, -1, dtype=np.int64))
+        queues = (MinHeap(up_targets.size + 1), MinHeap(up_targets.size + 1))
+        distances[0][start_id] = 0.0
+        distances[1][end_id] = 0.0
+        queues[0].add(0.0, start_id)
+        queues[1].add(0.0, end_id)
+
+        best = 0.0 if start_id == end_id else np.inf
+        meeting = start_id
+        settled = 0
+
+        while True:
+            # Pick the side with the closer frontier, among those that could still improve the best path
+            side = -1
+            for candidate in (0, 1):
+                if queues[candidate].get_count() > 0 and queues[candidate].peek().get_priority() < best:
+                    if side == -1 or queues[candidate].peek().get_priority() < queues[side].peek().get_priority():
+                        side = candidate
+            if side == -1:
+                break
+
+            current_entry = queues[side].remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            own_distances = distances[side]
+            if current_distance > own_distances[vertex_id]:
+                continue
+            settled += 1
+
+            through = current_distance + distances[1 - side][vertex_id]
+            if through < best:
+                best = through
+                meeting = vertex_id
+
+            for i in range(up_offsets[vertex_id], up_offsets[vertex_id + 1]):
+                neighbour_id = up_targets[i]
+                alt = current_distance + up_weights[i]
+                if alt < own_distances[neighbour_id]:
+                    own_distances[neighbour_id] = alt
+                    prev[side][neighbour_id] = vertex_id
+                    queues[side].add(alt, neighbour_id)
+
+        if best == np.inf:
+            return best, np.empty(0, dtype=np.int64), settled
+
+        # Chain of (possibly shortcut) edges: start -> meeting from the forward search, then meeting -> end
+        chain = LinkedList()
+        current = meeting
+        while current != -1:
+            chain.insert_first(current)
+            current = prev[0][current]
+        current = prev[1][meeting]
+        while current != -1:
+            chain.insert_last(current)
+            current = prev[1][current]
+
+        # Unpack each edge of the chain into the original edges it stands for
+        path = LinkedList()
+        path.insert_last(start_id)
+        previous_id = None
+        for node in chain:
+            if previous_id is not None:
+                self._unpack_edge(previous_id, node.get_value(), path)
+            previous_id = node.get_value()
+
+        path_ids = np.empty(len(path), dtype=np.int64)
+        for i, node in enumerate(path):
+            path_ids[i] = node.get_value()
+        return float(best), path_ids, settled
+
+    def _find_edge(self, id1: int, id2: int) -> int:
+        """Find the index of the upward edge between two adjacent vertices in the hierarchy.
+
+        Args:
+            id1: Id of one end of the edge.
+            id2: Id of the other end of the edge.
+
+        Returns:
+            The index of the edge in the upward edge arrays.
+        """
+        # The edge is stored with the lower ranked vertex
+        low, high = (id1, id2) if self.rank[id1] < self.rank[id2] else (id2, id1)
+        for i in range(self.up_offsets[low], self.up_offsets[low + 1]):
+            if self.up_targets[i] == high:
+                return i
+        raise ValueError(f"No hierarchy edge between vertex ids {id1} and {id2}.")
+
+    def _unpack_edge(self, source_id: int, target_id: int, path: LinkedList) -> None:
+        """Append the original vertices of a hierarchy edge to a path, excluding the source (already on the path).
+
+        Args:
+            source_id: Id of the vertex the edge is followed from.
+            target_id: Id of the vertex the edge is followed to.
+            path: LinkedList of vertex ids to append to.
+        """
+        # A stack of edges still to unpack, the next edge along the path on top
+        stack = LinkedList()
+        stack.insert_last((source_id, target_id))
+        while not stack.is_empty():
+            edge_source, edge_target = stack.remove_last()
+            middle = self.up_middle[self._find_edge(edge_source, edge_target)]
+            if middle == -1:
+                path.insert_last(edge_target)
+            else:
+                stack.insert_last((middle, edge_target))
+                stack.insert_last((edge_source, middle))
+
+
+def csr_fingerprint(csr: GraphCSR) -> str:
+    """Digest the roads of a snapshot, so a saved hierarchy can tell whether it was built from the same graph.
+
+    Args:
+        csr: The CSR snapshot.
+
+    Returns:
+        The SHA-256 hex digest of the snapshot's offsets, targets and weights.
+    """
+    digest = hashlib.sha256()
+    for array in (csr.offsets, csr.targets, csr.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class _HierarchyBuilder:
+    """Helper holding the state of the graph while its vertices are being contracted.
+
+    Attributes:
+        adjacency: An array of VertexHashTables, one per vertex id, mapping each remaining neighbour id to a
+            (weight, middle vertex id) tuple.
+        contracted: A boolean array marking contracted vertices.
+        contracted_neighbours: An int array counting each vertex's contracted neighbours.
+        rank: An int64 array of contraction order (-1 until contracted).
+        upward: An array of LinkedLists of (target id, weight, middle id) upward edges, one per vertex id.
+        settle_limit: The most vertices a witness search settles.
+        witness_distances: Distance array reused by every witness search.
+        witness_stamp: The search number each witness distance was written by, so the array never needs clearing.
+        search_number: The number of the current witness search.
+    """
+
+    def __init__(self, csr: GraphCSR, settle_limit: int):
+        size = csr.get_size()
+        self.csr = csr
+        self.settle_limit = settle_limit
+        self.adjacency = np.empty(size, dtype=object)
+        self.contracted = np.zeros(size, dtype=bool)
+        self.contracted_neighbours = np.zeros(size, dtype=np.int64)
+        self.rank = np.full(size, -1, dtype=np.int64)
+        self.upward = np.empty(size, dtype=object)
+        self.witness_distances = np.full(size, np.inf, dtype=np.float64)
+        self.witness_stamp = np.zeros(size, dtype=np.int64)
+        self.search_number = 0
+
+        for vertex_id in range(size):
+            if csr.labels[vertex_id] is not None:
+                neighbours = VertexHashTable(2 * csr.get_degree(vertex_id))
+                for i in range(csr.offsets[vertex_id], csr.offsets[vertex_id + 1]):
+                    neighbours.put(int(csr.targets[i]), (float(csr.weights[i]), -1))
+                self.adjacency[vertex_id] = neighbours
+
+    def contract_all(self) -> None:
+        """Contract every vertex, in order of (lazily updated) priority."""
+        live = np.flatnonzero(np.not_equal(self.csr.labels, None))
+        pq = MinHeap(live.size)
+        for vertex_id in live:
+            pq.add(self._priority(int(vertex_id)), int(vertex_id))
+
+        order = 0
+        while pq.get_count() > 0:
+            vertex_id = pq.remove().get_value()
+            # Lazy update: priorities go stale as neighbours are contracted, so recheck before contracting
+            shortcuts = self._find_shortcuts(vertex_id)
+            priority = self._priority(vertex_id, shortcuts)
+            if pq.get_count() > 0 and priority > pq.peek().get_priority():
+                pq.add(priority, vertex_id)
+                continue
+            self._contract(vertex_id, shortcuts)
+            self.rank[vertex_id] = order
+            order += 1
+
+    def _priority(self, vertex_id: int, shortcuts: LinkedList = None) -> int:
+        """Work out the contraction priority of a vertex (lower is contracted sooner).
+
+        Args:
+            vertex_id: Id of the vertex.
+            shortcuts: The shortcuts contracting the vertex would add, if already found.
+
+        Returns:
+            The edge difference of contracting the vertex, plus its number of contracted neighbours.
+        """
+        if shortcuts is None:
+            shortcuts = self._find_shortcuts(vertex_id)
+        return len(shortcuts) - len(self.adjacency[vertex_id]) + int(self.contracted_neighbours[vertex_id])
+
+    def _contract(self, vertex_id: int, shortcuts: LinkedList) -> None:
+        """Contract a vertex: record its upward edges, add its shortcuts and remove it from the remaining graph.
+
+        Args:
+            vertex_id: Id of the vertex.
+            shortcuts: The shortcuts needed to contract the vertex, from _find_shortcuts.
+        """
+        upward = LinkedList()
+        for entry in self.adjacency[vertex_id]:
+            weight, middle = entry.get_value()
+            upward.insert_last((entry.get_key(), weight, middle))
+        self.upward[vertex_id] = upward
+
+        for node in shortcuts:
+            id1, id2, weight = node.get_value()
+            existing = self.adjacency[id1].get(id2)
+            if existing is None or weight < existing[0]:
+                self.adjacency[id1].put(id2, (weight, vertex_id))
+                self.adjacency[id2].put(id1, (weight, vertex_id))
+
+        for entry in self.adjacency[vertex_id]:
+            neighbour_id = entry.get_key()
+            self.adjacency[neighbour_id].remove(vertex_id)
+            self.contracted_neighbours[neighbour_id] += 1
+        self.contracted[vertex_id] = True
+
+    def _find_shortcuts(self, vertex_id: int) -> LinkedList:
+        """Find the shortcuts needed to contract a vertex.
+
+        For each pair of neighbours u, w a shortcut u-w is needed unless a witness search from u (avoiding the vertex)
+        finds a path to w no longer than the path through the vertex.
+
+        Args:
+            vertex_id: Id of the vertex.
+
+        Returns:
+            A LinkedList of (neighbour id, neighbour id, weight) shortcuts.
+        """
+        shortcuts = LinkedList()
+        neighbours = np.empty(len(self.adjacency[vertex_id]), dtype=object)
+        for i, entry in enumerate(self.adjacency[vertex_id]):
+            neighbours[i] = (entry.get_key(), entry.get_value()[0])
+
+        # Only pairs (i, j) with j > i, as the graph is undirected. A pair joined by zero-weight roads still needs a
+        # witness or a shortcut.
+        for i in range(neighbours.size - 1):
+            source_id, source_weight = neighbours[i]
+            max_distance = 0.0
+            for j in range(i + 1, neighbours.size):
+                max_distance = max(max_distance, source_weight + neighbours[j][1])
+            self._witness_search(source_id, vertex_id, max_distance)
+            for j in range(i + 1, neighbours.size):
+                target_id, target_weight = neighbours[j]
+                via = source_weight + target_weight
+                if not (self.witness_stamp[target_id] == self.search_number
+                        and self.witness_distances[target_id] <= via):
+                    shortcuts.insert_last((source_id, target_id, via))
+        return shortcuts
+
+    def _witness_search(self, source_id: int, excluded_id: int, max_distance: float) -> None:
+        """Run a limited Dijkstra search from a vertex in the remaining graph, avoiding one vertex.
+
+        Distances found are left in witness_distances, valid where witness_stamp equals the search number.
+
+        Args:
+            source_id: Id of the vertex to search from.
+            excluded_id: Id of the vertex being contracted, which the search must not pass through.
+            max_distance: The search stops once the closest unsettled vertex is further than this.
+        """
+        self.search_number += 1
+        search_number = self.search_number
+        distances = self.witness_distances
+        stamp = self.witness_stamp
+
+        distances[source_id] = 0.0
+        stamp[source_id] = search_number
+        pq = MinHeap(64)
+        pq.add(0.0, source_id)
+        settled = 0
+
+        while pq.get_count() > 0 and settled < self.settle_limit:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            if current_distance > max_distance:
+                break
+            if current_distance > distances[vertex_id]:
+                continue
+            settled += 1
+
+            for entry in self.adjacency[vertex_id]:
+                neighbour_id = entry.get_key()
+                if neighbour_id == excluded_id:
+                    continue
+                alt = current_distance + entry.get_value()[0]
+                # Paths longer than the path through the excluded vertex can't be witnesses
+                if alt > max_distance:
+                    continue
+                if stamp[neighbour_id] != search_number or alt < distances[neighbour_id]:
+                    distances[neighbour_id] = alt
+                    stamp[neighbour_id] = search_number
+                    # The heap is only a small scratch queue, give up on the search rather than overflow it
+                    if pq.get_count() == pq.size:
+                        return
+                    pq.add(alt, neighbour_id)
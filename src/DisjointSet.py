@@ -0,0 +1,127 @@
+"""
+DisjointSet.py
+
+This file contains the DisjointSet class, a union-find structure used by the Graph to answer connectivity queries.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import numpy as np
+
+from GraphCSR import GraphCSR
+
+
+class DisjointSet:
+    """A class to represent a partition of vertex ids into connected components (union-find).
+
+    Each set is a tree of parent pointers rooted at its representative. Union by rank and path halving keep the trees
+    shallow, so find and union run in amortised O(α(V)), effectively constant.
+
+    Attributes:
+        parent: An int64 array of the parent id of each element (an element is its own parent at the root).
+        rank: An int8 array giving an upper bound on the height of the tree under each root.
+    """
+
+    def __init__(self, size: int = 16):
+        """Initialize a DisjointSet object with every element in its own set.
+
+        Args:
+            size: The number of elements to make room for.
+        """
+        self.parent = np.arange(size, dtype=np.int64)
+        self.rank = np.zeros(size, dtype=np.int8)
+
+    @classmethod
+    def from_csr(cls, csr: GraphCSR) -> "DisjointSet":
+        """Build the connected components of a snapshot in O(V + E α(V)).
+
+        Args:
+            csr: The CSR snapshot of the graph.
+
+        Returns:
+            The DisjointSet of the snapshot's connected components.
+        """
+        components = cls(max(csr.get_size(), 1))
+        offsets = csr.offsets
+        targets = csr.targets
+        for vertex_id in range(csr.get_size()):
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                # Each undirected edge is listed in both directions, so only union it from the lower id
+                if vertex_id < targets[i]:
+                    components.union(vertex_id, targets[i])
+        return components
+
+    def get_size(self) -> int:
+        """Get the number of elements covered.
+
+        Returns:
+            The size of the parent array.
+        """
+        return self.parent.size
+
+    def add(self, element_id: int) -> None:
+        """Make room for a new element in its own set, doubling the arrays when full so growth is amortised O(1).
+
+        Args:
+            element_id: The id of the new element.
+        """
+        size = self.get_size()
+        if element_id >= size:
+            new_size = max(element_id + 1, size * 2)
+            parent = np.arange(new_size, dtype=np.int64)
+            rank = np.zeros(new_size, dtype=np.int8)
+            parent[:size] = self.parent
+            rank[:size] = self.rank
+            self.parent = parent
+            self.rank = rank
+        else:
+            self.parent[element_id] = element_id
+            self.rank[element_id] = 0
+
+    def find(self, element_id: int) -> int:
+        """Find the representative of the set containing an element.
+
+        Args:
+            element_id: The id of the element.
+
+        Returns:
+            The id of the set's representative.
+        """
+        parent = self.parent
+        # Path halving: point every other element on the way up at its grandparent
+        while parent[element_id] != element_id:
+            parent[element_id] = parent[parent[element_id]]
+            element_id = parent[element_id]
+        return int(element_id)
+
+    def union(self, id1: int, id2: int) -> None:
+        """Merge the sets containing two elements.
+
+        Args:
+            id1: The id of the first element.
+            id2: The id of the second element.
+        """
+        root1 = self.find(id1)
+        root2 = self.find(id2)
+        if root1 == root2:
+            return
+        # Hang the shallower tree under the deeper one
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+
+    def connected(self, id1: int, id2: int) -> bool:
+        """Check if two elements are in the same set.
+
+        Args:
+            id1: The id of the first element.
+            id2: The id of the second element.
+
+        Returns:
+            True if the elements are in the same set, False otherwise.
+        """
+        return self.find(id1) == self.find(id2)
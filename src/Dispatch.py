@@ -0,0 +1,207 @@
+"""
+Dispatch.py
+
+This file contains the road-distance queries used to dispatch vehicles, such as finding the nearest vehicles to a pickup
+and re-routing the whole fleet.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Graph import Graph, GraphVertex, VertexNotFoundError
+from GraphCSR import GraphCSR
+from Sorting import VehiclesEmptyException
+
+# The snapshot each re-routing worker process searches, set once per process by _init_reroute_worker
+_worker_csr = None
+
+
+def find_nearest_vehicles(graph: Graph, vehicles: np.ndarray, pickup_label: str, k: int = 1) -> np.ndarray:
+    """Find the k vehicles closest to a pickup location by road, with a single search out from the pickup.
+
+    The graph is undirected, so the distance from the pickup to a vehicle is the distance from the vehicle to the
+    pickup. Vehicles without a location, or at a location that has since been deleted, are skipped.
+
+    Args:
+        graph: Graph of the simulation.
+        vehicles: An array of the vehicles to choose from (e.g. exported from the VehicleHashTable).
+        pickup_label: Label of the pickup location.
+        k: The number of vehicles to find. Defaults to 1.
+
+    Returns:
+        An array of (vehicle, distance) tuples, closest first. Holds fewer than k vehicles if not enough can reach the
+        pickup.
+
+    Raises:
+        VehiclesEmptyException: If there are no vehicles.
+        VertexNotFoundError: If the pickup location is not found.
+        ValueError: If k is less than 1.
+    """
+    if len(vehicles) == 0:
+        raise VehiclesEmptyException("No vehicles are in the AVMS.")
+    if k < 1:
+        raise ValueError("Number of vehicles to find must be at least 1.")
+    with graph.lock:
+        pickup = graph.find_vertex(pickup_label)
+        if pickup is None:
+            raise VertexNotFoundError("Cannot find pickup location.")
+        csr = graph.get_csr()
+        vertex_array = graph.vertex_array
+
+    # Find the location id of each vehicle (-1 if it has none, or it is no longer in the graph), and count the
+    # vehicles at each location
+    location_ids = np.full(len(vehicles), -1, dtype=np.int64)
+    vehicle_counts = np.zeros(csr.get_size(), dtype=np.int64)
+    for i, vehicle in enumerate(vehicles):
+        location_ids[i] = _current_id(vehicle.get_location(), csr, vertex_array)
+        if location_ids[i] != -1:
+            vehicle_counts[location_ids[i]] += 1
+
+    found_ids, found_distances = csr.nearest(pickup.get_id(), vehicle_counts, k)
+
+    # Rank each vehicle by how soon its location was reached (vehicles that weren't reached rank last), then keep
+    # the first k in that order
+    order = np.full(csr.get_size(), found_ids.size, dtype=np.int64)
+    order[found_ids] = np.arange(found_ids.size)
+    ranks = np.where(location_ids != -1, order[location_ids], found_ids.size)
+    reached = int(np.count_nonzero(ranks < found_ids.size))
+    chosen = np.argsort(ranks, kind="stable")[:min(k, reached)]
+
+    nearest = np.empty(chosen.size, dtype=object)
+    for i, vehicle_index in enumerate(chosen):
+        nearest[i] = (vehicles[vehicle_index], float(found_distances[ranks[vehicle_index]]))
+    return nearest
+
+
+def reroute_vehicles(graph: Graph, vehicles: np.ndarray, workers: int = None) -> np.ndarray:
+    """Recompute the distance to destination of every vehicle, e.g. after the road network changes.
+
+    Vehicles are grouped by location, so one search per distinct location covers every vehicle there, and each search
+    stops once it has reached all of its vehicles' destinations. The searches are spread over a pool of processes,
+    each sent the graph's CSR arrays once when it starts.
+
+    Args:
+        graph: Graph of the simulation.
+        vehicles: An array of the vehicles to re-route (e.g. exported from the VehicleHashTable).
+        workers: The number of worker processes. Defaults to None, one per CPU. With 1 (or a single location to
+            search from) the searches run in this process.
+
+    Returns:
+        An array of the vehicles that can no longer reach their destination, or whose location or destination has
+        been deleted. Their distance to destination is set to infinity. Vehicles without a destination are skipped.
+        A vehicle with a route tree (see Graph.track_source) keeps one, swapped for a tree from its current location
+        if it has moved, so its distance stays up to date as roads change. The tree is dropped if the location has
+        been deleted.
+    """
+    with graph.lock:
+        csr = graph.get_csr()
+        vertex_array = graph.vertex_array
+
+    # Find each vehicle's location and destination ids (-1 if deleted), skipping vehicles with nowhere to go
+    routed = np.zeros(len(vehicles), dtype=bool)
+    source_ids = np.full(len(vehicles), -1, dtype=np.int64)
+    destination_ids = np.full(len(vehicles), -1, dtype=np.int64)
+    for i, vehicle in enumerate(vehicles):
+        if vehicle.get_location() is None or vehicle.get_destination() is None:
+            continue
+        routed[i] = True
+        source_ids[i] = _current_id(vehicle.get_location(), csr, vertex_array)
+        destination_ids[i] = _current_id(vehicle.get_destination(), csr, vertex_array)
+
+    # Group the vehicles by location, then destination, and find the destinations needed from each location
+    valid = np.flatnonzero(routed & (source_ids != -1) & (destination_ids != -1))
+    valid = valid[np.lexsort((destination_ids[valid], source_ids[valid]))]
+    sources, group_starts = np.unique(source_ids[valid], return_index=True)
+    group_ends = np.append(group_starts[1:], valid.size)
+    destination_groups = np.empty(sources.size, dtype=object)
+    for i in range(sources.size):
+        destination_groups[i] = np.unique(destination_ids[valid[group_starts[i]:group_ends[i]]])
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or sources.size <= 1:
+        distance_groups = [_destination_distances(source_id, destination_groups[i], csr)
+                           for i, source_id in enumerate(sources)]
+    else:
+        # Hand each process a few batches of locations, so there are few round trips but work stays balanced
+        chunk_size = max(1, sources.size // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_reroute_worker,
+                                 initargs=(csr.offsets, csr.targets, csr.weights)) as executor:
+            distance_groups = list(executor.map(_destination_distances, sources, destination_groups,
+                                                chunksize=chunk_size))
+
+    distances = np.full(len(vehicles), np.inf, dtype=np.float64)
+    for i in range(sources.size):
+        group = valid[group_starts[i]:group_ends[i]]
+        distances[group] = distance_groups[i][np.searchsorted(destination_groups[i], destination_ids[group])]
+
+    unreachable = np.flatnonzero(routed & (distances == np.inf))
+    for i in np.flatnonzero(routed):
+        vehicle = vehicles[i]
+        vehicle.set_distance_to_destination(float(distances[i]))
+        # A vehicle with a route tree reads its distance from the tree, so the tree must be from where it is now
+        tree = vehicle.get_route_tree()
+        if tree is not None and tree.source_id != source_ids[i]:
+            try:
+                vehicle.set_route_tree(graph.track_source(vehicle.get_location().get_label()) if source_ids[i] != -1
+                                       else None)
+            except VertexNotFoundError:
+                # The location was deleted after the snapshot was taken
+                vehicle.set_route_tree(None)
+            graph.untrack_source(tree)
+    return vehicles[unreachable]
+
+
+def _init_reroute_worker(offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> None:
+    """Set up the snapshot searched by a re-routing worker process.
+
+    Args:
+        offsets: The CSR offsets of the graph.
+        targets: The CSR targets of the graph.
+        weights: The CSR weights of the graph.
+    """
+    global _worker_csr
+    _worker_csr = GraphCSR(0, offsets, targets, weights, None)
+
+
+def _destination_distances(source_id: int, destination_ids: np.ndarray, csr: GraphCSR = None) -> np.ndarray:
+    """Find the distances from one location to each destination of the vehicles there.
+
+    Args:
+        source_id: The id of the location.
+        destination_ids: A sorted int64 array of the destination ids.
+        csr: The snapshot to search. Defaults to None, the worker process's snapshot.
+
+    Returns:
+        A float64 array of the distance to each destination (inf if unreachable).
+    """
+    if csr is None:
+        csr = _worker_csr
+    destination_counts = np.zeros(csr.get_size(), dtype=np.int64)
+    destination_counts[destination_ids] = 1
+    found_ids, found_distances = csr.nearest(source_id, destination_counts, destination_ids.size)
+    distances = np.full(destination_ids.size, np.inf, dtype=np.float64)
+    distances[np.searchsorted(destination_ids, found_ids)] = found_distances
+    return distances
+
+
+def _current_id(vertex: GraphVertex | None, csr: GraphCSR, vertex_array: np.ndarray) -> int:
+    """Get the id of a vehicle's location or destination, if it is still in the graph.
+
+    Args:
+        vertex: The vertex, or None.
+        csr: The CSR snapshot of the graph.
+        vertex_array: The graph's array of vertices indexed by id.
+
+    Returns:
+        The id of the vertex, or -1 if it is None or has been deleted.
+    """
+    if vertex is None or vertex.get_id() >= csr.get_size() or vertex_array[vertex.get_id()] is not vertex:
+        return -1
+    return vertex.get_id()
@@ -7,11 +7,63 @@ DSA [COMP1002] Assignment
 Author: Jai Dutta
 Student ID: 22073372
 """
+import csv
 import numpy
-
+import os
+import threading
+import time
+from functools import wraps
+
+from ContractionHierarchy import ContractionHierarchy
+from DisjointSet import DisjointSet
+from DistanceMatrix import DistanceMatrix
+from GraphCSR import GraphCSR, reconstruct_path_ids
+from Landmarks import Landmarks
 from LinkedList import LinkedList
+from LRUCache import LRUCache
 from MinHeap import *
 from Queue import Queue
+from VertexHashTable import VertexHashTable
+
+# The searches that can be selected with the algorithm argument of Graph.dijkstra
+DIJKSTRA_ALGORITHMS = ("dijkstra", "bidirectional", "astar", "ch", "alt")
+
+# The number of landmarks picked for the "alt" dijkstra algorithm, unless build_landmarks is given another count
+LANDMARK_COUNT = 8
+
+# The matrix layouts that can be selected with the matrix_format argument of Graph.export_adjacency
+EXPORT_FORMATS = ("dense", "coo", "csr")
+
+# Batches of more road weight updates than this rebuild each tracked shortest path tree with one search, rather than
+# repairing it after every road
+TREE_REBUILD_BATCH = 64
+
+
+def synchronised(method):
+    """Decorator that runs a Graph method while holding the graph's lock, so it can't interleave with a change."""
+    @wraps(method)
+    def locked_method(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return locked_method
+
+
+def grown(array: np.ndarray, needed: int) -> np.ndarray:
+    """Return the array, or a copy with its length doubled if it has fewer than needed elements (rows, for a 2D array).
+
+    Args:
+        array: The array to grow.
+        needed: The number of elements (or rows) that must fit.
+
+    Returns:
+        An array with room for at least needed elements, holding the original elements at the front.
+    """
+    length = array.shape[0]
+    if needed <= length:
+        return array
+    new_array = np.empty((max(needed, length * 2),) + array.shape[1:], dtype=array.dtype)
+    new_array[:length] = array
+    return new_array
 
 
 class GraphVertex:
@@ -20,21 +72,34 @@ class GraphVertex:
     Attributes:
         label: A string representing the label of the vertex.
         value: The value associated with the vertex. (not necessary for the assignment - left over from Practical)
-        visited: A boolean indicating if the vertex has been visited.
         links: A LinkedList of adjacent vertices and their edge weights.
+        neighbours: A VertexHashTable mapping each adjacent vertex's id to its node in links, so an edge can be found
+            or removed in O(1) without walking the list.
+        id: A stable integer id assigned by the graph, used to index per-vertex arrays. None until added to a graph.
+        coordinates: An (x, y) tuple giving the position of the vertex, used by A* routing. None if unknown.
+        deleted: True once the vertex has been deleted from its graph, so anything still holding it (such as a
+            vehicle's location) can tell.
+        profiles: A VertexHashTable mapping each adjacent vertex's id to the time-of-day weights of the edge to it,
+            for the edges that have them. None until the first is set.
     """
 
-    def __init__(self, label: str, value: any = None):
+    def __init__(self, label: str, value: any = None, vertex_id: int = None, coordinates: tuple = None):
         """Initialize a GraphVertex object.
 
         Args:
             label: A string representing the label of the vertex.
             value: The value associated with the vertex.
+            vertex_id: The integer id of the vertex within its graph.
+            coordinates: The (x, y) position of the vertex.
         """
         self.label = label
         self.value = value
-        self.visited = False
         self.links = LinkedList()
+        self.neighbours = VertexHashTable()
+        self.id = vertex_id
+        self.coordinates = coordinates
+        self.deleted = False
+        self.profiles = None
 
     def __str__(self) -> str:
         """Return a string representation of the vertex.
@@ -60,6 +125,30 @@ class GraphVertex:
         """
         return self.value
 
+    def get_id(self) -> int:
+        """Get the integer id of the vertex.
+
+        Returns:
+            The id of the vertex within its graph.
+        """
+        return self.id
+
+    def get_coordinates(self) -> tuple | None:
+        """Get the coordinates of the vertex.
+
+        Returns:
+            The (x, y) position of the vertex, or None if unknown.
+        """
+        return self.coordinates
+
+    def is_deleted(self) -> bool:
+        """Check if the vertex has been deleted from its graph.
+
+        Returns:
+            True if the vertex has been deleted, False otherwise.
+        """
+        return self.deleted
+
     def get_adjacent(self) -> np.ndarray:
         """Get the adjacent vertices and their edge weights.
 
@@ -68,12 +157,74 @@ class GraphVertex:
         """
         # Create an array to store the adjacent vertices and their weights
         adjacent_vertices = np.empty(len(self.links), dtype=object)
-        # Iterate through the linked list and add the adjacent vertices and their weights to the new array
-        for i in range(len(self.links)):
-            adjacent_vertices[i] = self.links[i].get_value()
+        # Walk the linked list nodes and add the adjacent vertices and their weights to the new array
+        for i, node in enumerate(self.links):
+            adjacent_vertices[i] = node.get_value()
         # Return the new array
         return adjacent_vertices
 
+    def is_adjacent_to(self, vertex: "GraphVertex") -> bool:
+        """Check if a vertex is adjacent to this one, in O(1) on average.
+
+        Args:
+            vertex: The GraphVertex object to check.
+
+        Returns:
+            True if the vertices are adjacent, False otherwise.
+        """
+        node = self.neighbours.get(vertex.get_id())
+        # The id must map to this exact vertex, as ids are only unique within one graph
+        return node is not None and node.get_value()[0] is vertex
+
+    def get_weight(self, vertex: "GraphVertex") -> float | None:
+        """Get the weight of the edge to an adjacent vertex, in O(1) on average.
+
+        Args:
+            vertex: The adjacent GraphVertex object.
+
+        Returns:
+            The edge weight, or None if the vertices are not adjacent.
+        """
+        if not self.is_adjacent_to(vertex):
+            return None
+        return self.neighbours.get(vertex.get_id()).get_value()[1]
+
+    def set_weight(self, vertex: "GraphVertex", weight: float) -> None:
+        """Change the weight of the edge to an adjacent vertex, in O(1) on average.
+
+        Args:
+            vertex: The adjacent GraphVertex object.
+            weight: The new weight of the edge.
+        """
+        self.neighbours.get(vertex.get_id()).set_value((vertex, weight))
+
+    def get_profile(self, vertex: "GraphVertex") -> np.ndarray | None:
+        """Get the time-of-day weights of the edge to an adjacent vertex.
+
+        Args:
+            vertex: The adjacent GraphVertex object.
+
+        Returns:
+            A float32 array of the edge's weight in each time slot of the day, or None if it has no profile.
+        """
+        if self.profiles is None:
+            return None
+        return self.profiles.get(vertex.get_id())
+
+    def set_profile(self, vertex: "GraphVertex", profile: np.ndarray | None) -> None:
+        """Set or remove the time-of-day weights of the edge to an adjacent vertex.
+
+        Args:
+            vertex: The adjacent GraphVertex object.
+            profile: A float32 array of the edge's weight in each time slot of the day, or None to remove it.
+        """
+        if profile is not None:
+            if self.profiles is None:
+                self.profiles = VertexHashTable()
+            self.profiles.put(vertex.get_id(), profile)
+        elif self.get_profile(vertex) is not None:
+            self.profiles.remove(vertex.get_id())
+
     def set_adjacent(self, vertex: "GraphVertex", weight: float) -> None:
         """Set an adjacent vertex with its edge weight.
 
@@ -81,7 +232,7 @@ class GraphVertex:
             vertex: The adjacent GraphVertex object.
             weight: The weight of the edge connecting to the adjacent vertex.
         """
-        self.links.insert_last((vertex, weight))
+        self.neighbours.put(vertex.get_id(), self.links.insert_last((vertex, weight)))
 
     def remove_adjacent(self, vertex: "GraphVertex") -> None:
         """Remove an adjacent vertex.
@@ -89,49 +240,364 @@ class GraphVertex:
         Args:
             vertex: The GraphVertex object to be removed from adjacency list.
         """
-        # Iterate through linked list of adjacent vertices and remove the specified adjacent vertex from the list.
-        for i in range(len(self.links)):
-            if self.links[i].get_value()[0] == vertex:
-                self.links.remove_at(i)
-                break
+        # Unlink the vertex's node from the linked list directly, rather than searching the list for it
+        if self.is_adjacent_to(vertex):
+            self.links.remove_node(self.neighbours.get(vertex.get_id()))
+            self.neighbours.remove(vertex.get_id())
+            self.set_profile(vertex, None)
+
+
+
+class ShortestPathTree:
+    """A class to represent the shortest paths from one source vertex to every other vertex in a graph.
+
+    The tree is a snapshot of the graph at the version it was built from, and should not be used after the graph changes.
+
+    Attributes:
+        graph: The graph the tree was built from.
+        source_id: The id of the source vertex.
+        distances: An array of shortest distances from the source, indexed by vertex id (inf if unreachable).
+        prev: An array of the previous vertex id on each shortest path, indexed by vertex id (-1 for none).
+        version: The graph version the tree was built from.
+        vertices: The vertices of the snapshot the tree was built from, indexed by vertex id, or None to use the
+            graph's current vertices.
+    """
+
+    def __init__(self, graph: "Graph", source_id: int, distances: np.ndarray, prev: np.ndarray,
+                 vertices: np.ndarray = None):
+        """Initialize a ShortestPathTree object.
+
+        Args:
+            graph: The graph the tree was built from.
+            source_id: The id of the source vertex.
+            distances: Shortest distances from the source, indexed by vertex id.
+            prev: Previous vertex ids on each shortest path, indexed by vertex id.
+            vertices: The vertices of the snapshot the tree was built from, indexed by vertex id. Defaults to None,
+                using the graph's current vertices.
+        """
+        self.graph = graph
+        self.source_id = source_id
+        self.distances = distances
+        self.prev = prev
+        self.version = graph.version
+        self.vertices = vertices
+
+    def get_source(self) -> GraphVertex:
+        """Get the source vertex of the tree.
+
+        Returns:
+            The source vertex.
+        """
+        return self.graph.vertex_array[self.source_id]
+
+    def get_distances(self) -> np.ndarray:
+        """Get the shortest distances from the source to every vertex.
+
+        Returns:
+            An array of distances indexed by vertex id (inf where unreachable).
+        """
+        return self.distances
+
+    def get_predecessors(self) -> np.ndarray:
+        """Get the previous vertex on the shortest path to every vertex.
+
+        Returns:
+            An array of previous vertex ids indexed by vertex id (-1 for the source and unreachable vertices).
+        """
+        return self.prev
+
+    def distance_to(self, label: str) -> float:
+        """Get the shortest distance from the source to a vertex.
+
+        Args:
+            label: Label of the destination vertex.
+
+        Returns:
+            The shortest distance.
+
+        Raises:
+            VertexNotFoundError: If the vertex is not found.
+            PathNotFound: If the vertex cannot be reached from the source.
+        """
+        distance = self.distances[self._find_id(label)]
+        if distance == float("inf"):
+            raise PathNotFound("Path not found between provided locations.")
+        return distance
+
+    def path_to(self, label: str) -> list:
+        """Get the shortest path from the source to a vertex.
+
+        Args:
+            label: Label of the destination vertex.
+
+        Returns:
+            The path (of vertices) from the source to the destination.
+
+        Raises:
+            VertexNotFoundError: If the vertex is not found.
+            PathNotFound: If the vertex cannot be reached from the source.
+        """
+        self.distance_to(label)
+        return self.graph._reconstruct_path(self.prev, self._find_id(label), self.vertices)
+
+    def _find_id(self, label: str) -> int:
+        """Find the id of a vertex using its label.
+
+        Args:
+            label: Label of the vertex to find.
+
+        Returns:
+            The id of the vertex.
+
+        Raises:
+            VertexNotFoundError: If the vertex is not found.
+        """
+        vertex = self.graph.find_vertex(label)
+        if not vertex:
+            raise VertexNotFoundError("Location not found.")
+        return vertex.get_id()
+
+
+class DynamicShortestPathTree(ShortestPathTree):
+    """A class to represent a shortest path tree that the graph keeps up to date as it changes, see Graph.track_source.
+
+    Rather than searching the whole graph again after each change, only the distances the change affects are
+    repaired. A new or shorter road can only shorten paths, so the shorter distances are spread out from it with a
+    Dijkstra search that stops where they no longer improve. A deleted road or location can only lengthen the paths
+    that went through it, which are exactly the subtree of the tree under it, so only that subtree is searched again.
+
+    Attributes:
+        users: The number of times the source has been tracked, so the tree is only dropped once nothing uses it.
+    """
+
+    def __init__(self, graph: "Graph", source_id: int, distances: np.ndarray, prev: np.ndarray):
+        """Initialize a DynamicShortestPathTree object.
+
+        Args:
+            graph: The graph the tree was built from.
+            source_id: The id of the source vertex.
+            distances: Shortest distances from the source, indexed by vertex id.
+            prev: Previous vertex ids on each shortest path, indexed by vertex id.
+        """
+        super().__init__(graph, source_id, distances, prev)
+        self.users = 0
 
-    def set_visited(self) -> None:
-        """Mark the vertex as visited."""
-        self.visited = True
+    def add_vertex(self, vertex_id: int) -> None:
+        """Make room for a new, unreachable vertex.
 
-    def clear_visited(self) -> None:
-        """Clear the visited status of the vertex."""
-        self.visited = False
+        Args:
+            vertex_id: The id of the new vertex.
+        """
+        self.distances = grown(self.distances, vertex_id + 1)
+        self.prev = grown(self.prev, vertex_id + 1)
+        self.distances[vertex_id] = np.inf
+        self.prev[vertex_id] = -1
+        self.version = self.graph.version
 
-    def get_visited(self) -> bool:
-        """Get the visited status of the vertex.
+    def add_edge(self, id1: int, id2: int, weight: float) -> int:
+        """Update the tree for a new road, or a road whose weight has dropped.
+
+        Args:
+            id1: The id of the first vertex of the road.
+            id2: The id of the second vertex of the road.
+            weight: The (new) weight of the road.
+
+        Returns:
+            The number of vertices whose distance changed.
+        """
+        pq = MinHeap(16, growable=True)
+        for start_id, end_id in ((id1, id2), (id2, id1)):
+            alt = self.distances[start_id] + weight
+            if alt < self.distances[end_id]:
+                self.distances[end_id] = alt
+                self.prev[end_id] = start_id
+                pq.add(alt, end_id)
+        settled = self._propagate(pq)
+        self.version = self.graph.version
+        return settled
+
+    def delete_edge(self, id1: int, id2: int) -> int:
+        """Update the tree for a road that has been deleted, or whose weight has risen (after it has changed).
+
+        Args:
+            id1: The id of the first vertex of the road.
+            id2: The id of the second vertex of the road.
+
+        Returns:
+            The number of vertices whose distance was repaired.
+        """
+        # Only the vertices under the road in the tree used it, if it is in the tree at all
+        self.version = self.graph.version
+        if self.prev[id2] == id1:
+            return self._repair(np.array([id2], dtype=np.int64))
+        if self.prev[id1] == id2:
+            return self._repair(np.array([id1], dtype=np.int64))
+        return 0
+
+    def delete_vertex(self, vertex_id: int, neighbour_ids: np.ndarray) -> int:
+        """Update the tree for a vertex that has been deleted (after its edges have been removed).
+
+        Args:
+            vertex_id: The id of the deleted vertex.
+            neighbour_ids: An int64 array of the ids of the vertex's former neighbours.
 
         Returns:
-            A boolean indicating whether the vertex has been visited.
+            The number of vertices whose distance was repaired.
         """
-        return self.visited
+        self.distances[vertex_id] = np.inf
+        self.prev[vertex_id] = -1
+        self.version = self.graph.version
+        return self._repair(neighbour_ids[self.prev[neighbour_ids] == vertex_id])
 
+    def _repair(self, roots: np.ndarray) -> int:
+        """Search again for the shortest paths to every vertex in the subtrees under some vertices.
+
+        Args:
+            roots: An int64 array of the ids of the vertices at the top of the subtrees.
+
+        Returns:
+            The number of vertices in the subtrees.
+        """
+        vertex_array = self.graph.vertex_array
+        # Collect the subtrees by following the tree's edges (which are still roads) down from the roots
+        subtree = Queue()
+        for root_id in roots:
+            subtree.enqueue(int(root_id))
+        members = []
+        while not subtree.is_empty():
+            vertex_id = subtree.dequeue()
+            members.append(vertex_id)
+            for neighbour, _ in vertex_array[vertex_id].get_adjacent():
+                if self.prev[neighbour.get_id()] == vertex_id:
+                    subtree.enqueue(neighbour.get_id())
+        members = np.array(members, dtype=np.int64)
+        self.distances[members] = np.inf
+        self.prev[members] = -1
+
+        # Paths outside the subtrees are unaffected, so start each subtree vertex from its best neighbour outside them
+        pq = MinHeap(max(16, members.size), growable=True)
+        for vertex_id in members:
+            for neighbour, weight in vertex_array[vertex_id].get_adjacent():
+                alt = self.distances[neighbour.get_id()] + weight
+                if alt < self.distances[vertex_id]:
+                    self.distances[vertex_id] = alt
+                    self.prev[vertex_id] = neighbour.get_id()
+            if self.distances[vertex_id] < np.inf:
+                pq.add(self.distances[vertex_id], vertex_id)
+        self._propagate(pq)
+        return members.size
+
+    def _propagate(self, pq: MinHeap) -> int:
+        """Spread shortened distances out from the vertices in a priority queue, with Dijkstra's algorithm.
+
+        Args:
+            pq: A MinHeap of (distance, vertex id) entries for vertices whose distance has just dropped.
+
+        Returns:
+            The number of vertices settled.
+        """
+        vertex_array = self.graph.vertex_array
+        settled = 0
+        while pq.get_count() > 0:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            # Skip stale entries for vertices that have since dropped further
+            if current_distance > self.distances[vertex_id]:
+                continue
+            settled += 1
+            for neighbour, weight in vertex_array[vertex_id].get_adjacent():
+                alt = current_distance + weight
+                if alt < self.distances[neighbour.get_id()]:
+                    self.distances[neighbour.get_id()] = alt
+                    self.prev[neighbour.get_id()] = vertex_id
+                    pq.add(alt, neighbour.get_id())
+        return settled
 
 
 class Graph:
     """A class to represent an undirected, weighted simple graph.
 
+    The graph can be shared between threads. Changes, cache lookups and lazy rebuilds happen under the graph's lock,
+    while searches run outside it on immutable snapshots (GraphCSR, ContractionHierarchy), keeping their traversal
+    state in per-search arrays rather than on the vertices.
+
     Attributes:
         vertices: A LinkedList containing each vertex of the graph.
         count: An integer count of vertices in the graph.
+        label_index: A VertexHashTable mapping each case-folded label to its vertex, for O(1) lookup.
+        vertex_array: An array of vertices indexed by vertex id. Ids are never reused, so deleted vertices leave None.
+        vertex_nodes: An array of each vertex's node in vertices, indexed by vertex id, so a vertex can be unlinked
+            from the list in O(1).
+        next_id: The id that will be given to the next vertex added.
+        edge_count: An integer count of edges in the graph.
+        version: An integer bumped on every change to the vertices or edges.
+        csr: The most recently built GraphCSR snapshot (rebuilt lazily once the version moves past it).
+        csr_vertices: A copy of vertex_array as it was when csr was built, so searches of the snapshot can turn ids
+            back into vertices while other threads delete them.
+        tree_cache: An LRUCache of ShortestPathTrees keyed by source vertex id, cleared whenever the graph changes.
+        tree_cache_version: The graph version the cached trees were built from.
+        route_cache: An LRUCache of (distance, path, path positions) routes found by dijkstra, keyed by the
+            case-folded label pair in sorted order (so that a route and its reverse share an entry) and the algorithm.
+        components: A DisjointSet of the connected components, indexed by vertex id, used by is_path.
+        components_current: False when a deletion may have split a component, so components must be rebuilt.
+        all_pairs: The DistanceMatrix used for O(1) distance lookups when all-pairs mode is enabled, otherwise None.
+        hierarchy: The ContractionHierarchy used by the "ch" dijkstra algorithm, or None if not built yet.
+        landmarks: The Landmarks used by the "alt" dijkstra algorithm, or None if not built yet.
+        tracked_trees: A VertexHashTable of the DynamicShortestPathTrees kept up to date by every change, keyed by
+            source vertex id.
+        profile_slots: The number of time slots in each road's time-of-day profile, or None if none has been set.
+        profile_count: The number of roads with a time-of-day profile.
+        patch_ids: An int64 array of the (vertex id, vertex id) pairs of edges whose weights changed since the snapshot
+            was built, so it can be patched rather than rebuilt.
+        patch_weights: A float64 array of the new weights, parallel to patch_ids.
+        patch_count: The number of patches recorded.
+        patched_version: The graph version that the snapshot matches once patched.
+        lock: A re-entrant lock guarding the vertices, edges and every cache.
     """
 
-    def __init__(self):
-        """Initialize a Graph object."""
+    def __init__(self, tree_cache_size: int = 16, route_cache_size: int = 256):
+        """Initialize a Graph object.
+
+        Args:
+            tree_cache_size: The maximum number of shortest path trees to keep cached.
+            route_cache_size: The maximum number of routes to keep cached.
+        """
         self.vertices = LinkedList()
         self.count = 0
-
-    def add_vertex(self, label: str, value: any = None) -> None:
+        self.label_index = VertexHashTable()
+        self.vertex_array = np.empty(16, dtype=object)
+        self.vertex_nodes = np.empty(16, dtype=object)
+        self.next_id = 0
+        self.edge_count = 0
+        self.version = 0
+        self.csr = None
+        self.csr_vertices = None
+        self.tree_cache = LRUCache(tree_cache_size)
+        self.tree_cache_version = 0
+        self.route_cache = LRUCache(route_cache_size)
+        self.components = DisjointSet()
+        self.components_current = True
+        self.all_pairs = None
+        self.hierarchy = None
+        self.landmarks = None
+        self.tracked_trees = VertexHashTable()
+        self.profile_slots = None
+        self.profile_count = 0
+        self.patch_ids = np.empty((16, 2), dtype=np.int64)
+        self.patch_weights = np.empty(16, dtype=np.float64)
+        self.patch_count = 0
+        self.patched_version = -1
+        self.lock = threading.RLock()
+
+    @synchronised
+    def add_vertex(self, label: str, value: any = None, coordinates: tuple = None) -> None:
         """Add a vertex to the graph. Maintains sorted order.
 
         Args:
             label: Label of the vertex.
             value: Value of the vertex. Defaults to 0.
+            coordinates: The (x, y) position of the vertex, used by A* routing. Defaults to None.
 
         Raises:
             VertexExistsError: If a vertex with the given label already exists.
@@ -140,28 +606,43 @@ class Graph:
         if self.find_vertex(label):
             raise VertexExistsError("Duplicate location found.")
 
-        # Create new vertex object with the given label and value
-        new_vertex = GraphVertex(label, value)
-
-        # If the graph is empty, insert the new vertex at the end (as it's the only vertex)
-        if self.vertices.is_empty():
-            self.vertices.insert_last(new_vertex)
+        # Create new vertex object with the given label and value, and the next free id
+        new_vertex = GraphVertex(label, value, self.next_id, coordinates)
+        # Double the id arrays when full, so assigning ids stays amortised O(1)
+        self.vertex_array = grown(self.vertex_array, self.next_id + 1)
+        self.vertex_nodes = grown(self.vertex_nodes, self.next_id + 1)
+        self.vertex_array[self.next_id] = new_vertex
+        self.next_id += 1
+
+        # If the graph is empty, or the label sorts after the last vertex, insert the new vertex at the end
+        if self.vertices.is_empty() or not label < self.vertices.peek_last().get_label():
+            self.vertex_nodes[new_vertex.get_id()] = self.vertices.insert_last(new_vertex)
         # Otherwise, insert the new vertex in the correct position (alphabetically (again, remnant from the Practical, not needed for the assignment as using weighted edges with Dijkstra's, instead of BFS/DFS))
         else:
-            inserted = False
-            for i in range(len(self.vertices)):
-                if label < self.vertices[i].get_value().get_label():
-                    self.vertices.insert_before(new_vertex, i)
-                    inserted = True
+            # Walk the nodes directly rather than indexing, as each index into the linked list is itself O(N)
+            for i, node in enumerate(self.vertices):
+                if label < node.get_value().get_label():
+                    self.vertex_nodes[new_vertex.get_id()] = self.vertices.insert_before(new_vertex, i)
                     break
 
-            if not inserted:
-                self.vertices.insert_last(new_vertex)
-
+        self.label_index.put(label.casefold(), new_vertex)
         self.count += 1
-
+        self.version += 1
+        if self.components_current:
+            self.components.add(new_vertex.get_id())
+
+        # A new vertex has no edges, so the all-pairs matrix only needs to grow
+        if self._all_pairs_current(self.version - 1):
+            self.all_pairs.add_vertex(new_vertex.get_id())
+            self.all_pairs.version = self.version
+        for entry in self.tracked_trees:
+            entry.get_value().add_vertex(new_vertex.get_id())
+
+    @synchronised
     def delete_vertex(self, label: str) -> None:
-        """Delete a vertex from the graph.
+        """Delete a vertex from the graph, along with every edge to it, in O(degree) on average.
+
+        The vertex is marked as deleted, so vehicles still using it as their location or destination can be found.
 
         Args:
             label: Label of the vertex to delete.
@@ -169,15 +650,42 @@ class Graph:
         Raises:
             VertexNotFoundError: If the vertex to delete is not found.
         """
-        # Find the index of the vertex to delete
-        index = self._find_vertex_index(label)
+        # Find the vertex to delete
+        vertex = self.find_vertex(label)
         # If the vertex is not found, raise a VertexNotFoundError
-        if index is None:
+        if vertex is None:
             raise VertexNotFoundError("Vertex to delete not found!")
-        # Remove the vertex from the linked list
-        self.vertices.remove_at(index)
+        # Remove the edges from each neighbour back to the vertex, through the neighbours' adjacency indexes
+        if vertex.profiles is not None:
+            self.profile_count -= len(vertex.profiles)
+        neighbour_ids = np.empty(len(vertex.links), dtype=np.int64)
+        for i, (neighbour, _) in enumerate(vertex.get_adjacent()):
+            neighbour.remove_adjacent(vertex)
+            neighbour_ids[i] = neighbour.get_id()
+        self.edge_count -= len(vertex.links)
+        vertex.links = LinkedList()
+        vertex.neighbours = VertexHashTable()
+        vertex.deleted = True
+        # Remove the vertex from the linked list (directly through its node) and the label index
+        self.vertices.remove_node(self.vertex_nodes[vertex.get_id()])
+        self.vertex_nodes[vertex.get_id()] = None
+        self.label_index.remove(label.casefold())
+        self.vertex_array[vertex.get_id()] = None
         self.count -= 1
-
+        self.version += 1
+        self._invalidate_routes(vertex.get_id())
+        # Removing a vertex may split its component, which union-find can't undo, so rebuild on the next is_path
+        self.components_current = False
+
+        # A tree from the deleted vertex can't be repaired, so it is no longer tracked and reaches nowhere
+        deleted_tree = self.tracked_trees.get(vertex.get_id())
+        if deleted_tree is not None:
+            self.tracked_trees.remove(vertex.get_id())
+            deleted_tree.distances[:] = np.inf
+        for entry in self.tracked_trees:
+            entry.get_value().delete_vertex(vertex.get_id(), neighbour_ids)
+
+    @synchronised
     def add_edge(self, label1: str, label2: str, weight: float) -> None:
         """Add an edge between two vertices.
 
@@ -204,11 +712,25 @@ class Graph:
             if vertex1 != vertex2:
                 vertex1.set_adjacent(vertex2, weight)
                 vertex2.set_adjacent(vertex1, weight)
+                self.edge_count += 1
+                self.version += 1
+                # A new edge may shorten any cached route, so expire them all in O(1)
+                self.route_cache.invalidate()
+                if self.components_current:
+                    self.components.union(vertex1.get_id(), vertex2.get_id())
+
+                # Relax every pair through the new edge rather than recomputing the all-pairs matrix
+                if self._all_pairs_current(self.version - 1):
+                    self.all_pairs.add_edge(vertex1.get_id(), vertex2.get_id(), weight)
+                    self.all_pairs.version = self.version
+                for entry in self.tracked_trees:
+                    entry.get_value().add_edge(vertex1.get_id(), vertex2.get_id(), weight)
             else:
                 raise EdgeToSameVertex("Cannot add road from location to itself.")
         else:
             raise VertexNotFoundError("Cannot find one or both locations to add road.")
 
+    @synchronised
     def delete_edge(self, label1: str, label2: str) -> None:
         """Delete an edge between two vertices.
         
@@ -230,11 +752,383 @@ class Graph:
         # If both vertices have been found, remove the edge (but check if they are the same vertex first)
         if vertex1 and vertex2:
             if vertex1 != vertex2:
+                if vertex1.get_profile(vertex2) is not None:
+                    self.profile_count -= 1
                 vertex1.remove_adjacent(vertex2)
                 vertex2.remove_adjacent(vertex1)
+                self.edge_count -= 1
+                self.version += 1
+                self._invalidate_routes(vertex1.get_id(), vertex2.get_id())
+                self.components_current = False
+                for entry in self.tracked_trees:
+                    entry.get_value().delete_edge(vertex1.get_id(), vertex2.get_id())
             else:
                 raise EdgeToSameVertex("Cannot remove road from location to itself.")
 
+    @synchronised
+    def update_edge_weight(self, label1: str, label2: str, weight: float) -> None:
+        """Change the weight of an edge in O(1) on average, through the vertices' adjacency indexes.
+
+        Args:
+            label1: Label of the first vertex.
+            label2: Label of the second vertex.
+            weight: The new weight of the edge.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found.
+            EdgeExistsError: If the edge does not exist.
+        """
+        self.update_edge_weights(((label1, label2, weight),))
+
+    @synchronised
+    def update_edge_weights(self, updates) -> int:
+        """Change the weights of a batch of edges, e.g. from a traffic feed, as one change to the graph.
+
+        Each edge costs O(1) on average. The CSR snapshot is patched with the new weights on the next query rather
+        than rebuilt, and cached routes are only dropped if they use an edge that got longer (or all of them if any
+        edge got shorter). Tracked shortest path trees are repaired edge by edge, or rebuilt once for large batches.
+
+        Args:
+            updates: An iterable of (label1, label2, weight) rows.
+
+        Returns:
+            The number of edges updated.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices of a row are not found.
+            EdgeExistsError: If the edge of a row does not exist.
+        """
+        # Find the adjacency list nodes of every edge (in both directions) before changing any, so a bad row leaves
+        # the graph unchanged
+        nodes = np.empty((16, 2), dtype=object)
+        weights = np.empty(16, dtype=np.float64)
+        count = 0
+        for label1, label2, weight in updates:
+            vertex1 = self.find_vertex(label1)
+            vertex2 = self.find_vertex(label2)
+            if not vertex1 or not vertex2:
+                raise VertexNotFoundError("Cannot find one or both locations to update road.")
+            node1 = vertex1.neighbours.get(vertex2.get_id())
+            if node1 is None or node1.get_value()[0] is not vertex2:
+                raise EdgeExistsError("Road to update does not exist.")
+            if count == weights.size:
+                nodes = grown(nodes, count + 1)
+                weights = grown(weights, count + 1)
+            nodes[count, 0] = node1
+            nodes[count, 1] = vertex2.neighbours.get(vertex1.get_id())
+            weights[count] = weight
+            count += 1
+
+        # The snapshot can be patched if it matched the graph (possibly after earlier patches) before this batch
+        csr = self.csr
+        patchable = csr is not None and (csr.version == self.version or self.patched_version == self.version)
+        all_pairs_current = self._all_pairs_current(self.version)
+        repair_trees = count <= TREE_REBUILD_BATCH and len(self.tracked_trees) > 0
+        shortened = False
+        self.version += 1
+        if patchable:
+            self.patch_ids = grown(self.patch_ids, self.patch_count + count)
+            self.patch_weights = grown(self.patch_weights, self.patch_count + count)
+
+        for i in range(count):
+            node1 = nodes[i, 0]
+            node2 = nodes[i, 1]
+            vertex2, old_weight = node1.get_value()
+            vertex1 = node2.get_value()[0]
+            weight = weights[i]
+            node1.set_value((vertex2, weight))
+            node2.set_value((vertex1, weight))
+            id1 = vertex1.get_id()
+            id2 = vertex2.get_id()
+            if patchable:
+                self.patch_ids[self.patch_count, 0] = id1
+                self.patch_ids[self.patch_count, 1] = id2
+                self.patch_weights[self.patch_count] = weight
+                self.patch_count += 1
+
+            if weight < old_weight:
+                shortened = True
+                # A shorter edge can only shorten paths, so the all-pairs matrix and trees relax through it
+                if all_pairs_current:
+                    self.all_pairs.add_edge(id1, id2, weight)
+                if repair_trees:
+                    for entry in self.tracked_trees:
+                        entry.get_value().add_edge(id1, id2, weight)
+            elif weight > old_weight:
+                all_pairs_current = False
+                if not shortened:
+                    self._invalidate_routes(id1, id2)
+                if repair_trees:
+                    for entry in self.tracked_trees:
+                        entry.get_value().delete_edge(id1, id2)
+
+        if shortened:
+            self.route_cache.invalidate()
+        if all_pairs_current:
+            self.all_pairs.version = self.version
+        if patchable:
+            self.patched_version = self.version
+        if count > TREE_REBUILD_BATCH:
+            for entry in self.tracked_trees:
+                tree = entry.get_value()
+                tree.distances, tree.prev = self.get_csr().dijkstra(tree.source_id)
+                tree.version = self.version
+        return count
+
+    @synchronised
+    def set_edge_profile(self, label1: str, label2: str, weights) -> None:
+        """Set the time-of-day weights of an edge, used by dijkstra when given a departure time.
+
+        The day is split into equal time slots, one per weight (e.g. 24 for hourly weights), and every profile in the
+        graph must have the same number of slots. Profiles are stored as float32 arrays, and are not saved by save.
+        The fixed weights don't change, so only the CSR snapshot (which holds the profiles) is rebuilt, while the
+        all-pairs matrix, contraction hierarchy, landmarks and cached routes and trees are kept.
+
+        Args:
+            label1: Label of the first vertex.
+            label2: Label of the second vertex.
+            weights: The weight of the edge in each time slot, or None to remove its profile.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found.
+            EdgeExistsError: If the edge does not exist.
+            ValueError: If the number of weights doesn't match the other profiles.
+        """
+        vertex1 = self.find_vertex(label1)
+        vertex2 = self.find_vertex(label2)
+        if not vertex1 or not vertex2:
+            raise VertexNotFoundError("Cannot find one or both locations to set road profile.")
+        if not vertex1.is_adjacent_to(vertex2):
+            raise EdgeExistsError("Road to set profile of does not exist.")
+
+        profile = None
+        if weights is not None:
+            profile = np.asarray(weights, dtype=np.float32)
+            if profile.ndim != 1 or profile.size == 0:
+                raise ValueError("A time-of-day profile must be a list of weights.")
+            if self.profile_count > 0 and profile.size != self.profile_slots:
+                raise ValueError(f"Time-of-day profiles must have {self.profile_slots} weights.")
+            self.profile_slots = profile.size
+
+        had_profile = vertex1.get_profile(vertex2) is not None
+        vertex1.set_profile(vertex2, profile)
+        vertex2.set_profile(vertex1, profile)
+        self.profile_count += (profile is not None) - had_profile
+        # Routes at a departure time are never cached, so the snapshot is all that reads the profiles
+        self.csr = None
+        self.patched_version = -1
+
+    @classmethod
+    def from_edge_list(cls, path: str, delimiter: str = ",", verbose: bool = False) -> "Graph":
+        """Build a graph from an edge list file. See load_csv for the file format.
+
+        Args:
+            path: Path of the edge list file.
+            delimiter: The character separating the fields of each row. Defaults to ",".
+            verbose: Print the number of rows loaded and the rows loaded per second. Defaults to False.
+
+        Returns:
+            The loaded Graph.
+        """
+        graph = cls()
+        stats = graph.load_csv(path, delimiter)
+        if verbose:
+            print(f"Loaded {stats['rows']} rows ({stats['vertices']} locations, {stats['edges']} roads) in "
+                  f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
+        return graph
+
+    @synchronised
+    def load_csv(self, path: str, delimiter: str = ",") -> dict:
+        """Bulk load vertices and edges from an edge list file into an empty graph, in O((V + E) log V).
+
+        Each row is either "label1,label2,weight" for an edge, or a single label for a vertex with no edges. A first
+        row whose weight isn't a number is treated as a header and skipped. The file is streamed row by row, the
+        labels are sorted once, and the vertex list is then built in order without per-vertex searches.
+
+        Args:
+            path: Path of the edge list file.
+            delimiter: The character separating the fields of each row. Defaults to ",".
+
+        Returns:
+            A dictionary of the number of "rows", "vertices" and "edges" loaded, the "seconds" taken, and the
+            "rows_per_sec" loaded.
+
+        Raises:
+            ValueError: If the graph is not empty, or a row is malformed.
+            EdgeExistsError: If the file lists the same edge twice.
+            EdgeToSameVertex: If the file lists an edge from a vertex to itself.
+        """
+        if self.count != 0:
+            raise ValueError("Can only bulk load into an empty graph.")
+        start_time = time.perf_counter()
+
+        # Stream the rows into growable arrays: every label read (names), and each edge as positions in names
+        names = np.empty(1024, dtype=object)
+        name_count = 0
+        edge_starts = np.empty(1024, dtype=np.int64)
+        edge_weights = np.empty(1024, dtype=np.float64)
+        edge_total = 0
+        rows = 0
+        with open(path, newline="") as file:
+            for row_number, row in enumerate(csv.reader(file, delimiter=delimiter), start=1):
+                if not row:
+                    continue
+                if len(row) == 3:
+                    try:
+                        weight = float(row[2])
+                    except ValueError:
+                        if row_number == 1:
+                            continue # Header row
+                        raise ValueError(f"Row {row_number}: weight '{row[2]}' is not a number.")
+                elif len(row) != 1:
+                    raise ValueError(f"Row {row_number}: expected 'label1{delimiter}label2{delimiter}weight' or a "
+                                     "single label.")
+                rows += 1
+
+                names = grown(names, name_count + 2)
+                names[name_count] = row[0].strip()
+                if len(row) == 3:
+                    edge_starts = grown(edge_starts, edge_total + 1)
+                    edge_weights = grown(edge_weights, edge_total + 1)
+                    names[name_count + 1] = row[1].strip()
+                    edge_starts[edge_total] = name_count
+                    edge_weights[edge_total] = weight
+                    edge_total += 1
+                    name_count += 2
+                else:
+                    name_count += 1
+
+        # Sort the labels once to find the distinct (case-insensitive) labels, keeping the first spelling of each.
+        # Then give each vertex its position in label order as its id, the order add_vertex keeps the list in.
+        names = names[:name_count]
+        _, first, distinct_of_name = np.unique(np.frompyfunc(str.casefold, 1, 1)(names).astype(str),
+                                               return_index=True, return_inverse=True)
+        labels = names[first]
+        label_count = labels.size
+        order = np.argsort(labels, kind="stable")
+        rank = np.empty(label_count, dtype=np.int64)
+        rank[order] = np.arange(label_count)
+        vertex_of_name = rank[distinct_of_name.reshape(-1)]
+
+        # Check the whole edge list before changing the graph, so a bad file leaves the graph empty
+        ids1 = vertex_of_name[edge_starts[:edge_total]]
+        ids2 = vertex_of_name[edge_starts[:edge_total] + 1]
+        loops = np.flatnonzero(ids1 == ids2)
+        if loops.size > 0:
+            raise EdgeToSameVertex(f"Road from {labels[order[ids1[loops[0]]]]} to itself in edge list.")
+        # Number each undirected edge by its (lower id, higher id) pair; after sorting, duplicates sit side by side
+        pairs = np.sort(np.minimum(ids1, ids2) * label_count + np.maximum(ids1, ids2))
+        duplicates = np.flatnonzero(pairs[1:] == pairs[:-1])
+        if duplicates.size > 0:
+            id1, id2 = divmod(int(pairs[duplicates[0]]), label_count)
+            raise EdgeExistsError(f"Road between {labels[order[id1]]} and {labels[order[id2]]} listed twice.")
+
+        # Lay the edges out as a CSR snapshot, each edge once from each end, grouped by vertex id
+        sources = np.concatenate((ids1, ids2))
+        offsets = np.zeros(label_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=label_count), out=offsets[1:])
+        by_source = np.argsort(sources, kind="stable")
+        csr = GraphCSR(self.version, offsets, np.concatenate((ids2, ids1))[by_source],
+                       np.concatenate((edge_weights[:edge_total], edge_weights[:edge_total]))[by_source],
+                       labels[order])
+        self._build_from_csr(csr)
+
+        seconds = time.perf_counter() - start_time
+        return {"rows": rows, "vertices": label_count, "edges": edge_total, "seconds": seconds,
+                "rows_per_sec": rows / seconds if seconds > 0 else float("inf")}
+
+    @synchronised
+    def save(self, path: str) -> None:
+        """Save the vertices, edges and coordinates as a binary snapshot (see GraphCSR.save), for a fast restart.
+
+        Vertex ids are renumbered in label order, leaving no gaps for deleted vertices. Vertex values are not saved.
+        The connected component of each vertex is saved too, for is_path on a MappedGraph, and the landmarks if they
+        have been built for the current graph, so "alt" routing works as soon as the graph is loaded.
+
+        Args:
+            path: Path of the directory to write.
+        """
+        order, labels = self._list_order()
+        _, (offsets, targets, weights) = self.export_adjacency("csr")
+        disjoint_set = self._get_components()
+        components = np.empty(self.count, dtype=np.int64)
+        for i in range(self.count):
+            components[i] = disjoint_set.find(order[i])
+        GraphCSR(self.version, offsets, targets, weights, labels,
+                 self.get_csr().coordinates[order]).save(path, components)
+        if self.landmarks is not None and self.landmarks.version == self.version:
+            self.landmarks.save(path, order)
+        else:
+            # Don't leave the landmarks of an earlier save of a different graph in the directory
+            for name in ("landmark_ids.npy", "landmark_distances.npy"):
+                if os.path.exists(os.path.join(path, name)):
+                    os.remove(os.path.join(path, name))
+
+    @classmethod
+    def load(cls, path: str) -> "Graph":
+        """Load a graph saved with save.
+
+        The saved arrays become the graph's CSR snapshot as they are, so queries don't need to rebuild it. Saved
+        landmarks are loaded too.
+
+        Args:
+            path: Path of the directory to read.
+
+        Returns:
+            The loaded Graph.
+        """
+        graph = cls()
+        with graph.lock:
+            graph._build_from_csr(GraphCSR.load(path))
+            graph.landmarks = Landmarks.load(path, graph.version)
+        return graph
+
+    def _build_from_csr(self, csr: GraphCSR) -> None:
+        """Fill an empty graph with the vertices and edges of a CSR snapshot with no deleted vertices, whose labels
+        are in sorted order, and keep the snapshot as the graph's own.
+
+        Args:
+            csr: The CSR snapshot to build from.
+        """
+        size = csr.get_size()
+        coordinates = csr.coordinates
+        known = ~np.isnan(coordinates).any(axis=1)
+
+        # Size the label index up front so it never resizes while loading
+        self.label_index = VertexHashTable(2 * size)
+        self.vertex_array = np.empty(max(size, 16), dtype=object)
+        self.vertex_nodes = np.empty(max(size, 16), dtype=object)
+        for vertex_id in range(size):
+            label = csr.labels[vertex_id]
+            vertex = GraphVertex(label, vertex_id=vertex_id,
+                                 coordinates=tuple(coordinates[vertex_id].tolist()) if known[vertex_id] else None)
+            self.vertex_array[vertex_id] = vertex
+            # Labels arrive sorted, so every vertex goes on the end of the list
+            self.vertex_nodes[vertex_id] = self.vertices.insert_last(vertex)
+            self.label_index.put(label.casefold(), vertex)
+        self.next_id = size
+        self.count = size
+
+        # Link each vertex to its neighbours in the snapshot's order. Plain Python numbers are much faster to index
+        # and pass around one at a time than numpy scalars.
+        vertex_array = self.vertex_array
+        offsets = csr.offsets.tolist()
+        targets = csr.targets.tolist()
+        weights = csr.weights.tolist()
+        for vertex_id in range(size):
+            vertex = vertex_array[vertex_id]
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                vertex.set_adjacent(vertex_array[targets[i]], weights[i])
+        self.edge_count = len(targets) // 2
+
+        # The snapshot is current, while everything else derived from the graph is rebuilt lazily on next use
+        self.version += 1
+        csr.version = self.version
+        self.csr = csr
+        self.csr_vertices = vertex_array[:size].copy()
+        self.components_current = False
+
+    @synchronised
     def has_vertex(self, label: str) -> bool:
         """Check if a vertex exists.
 
@@ -254,6 +1148,43 @@ class Graph:
         """
         return self.count
 
+    @synchronised
+    def get_csr(self) -> GraphCSR:
+        """Get a CSR snapshot of the graph, rebuilding it only if the graph has changed since the last one.
+
+        Returns:
+            A GraphCSR snapshot matching the current graph.
+        """
+        if self.csr is None or self.csr.version != self.version:
+            if self.patched_version == self.version:
+                # Only weights have changed, so copy the snapshot's weights with the changes rather than rebuilding.
+                # Each edge is stored in both directions, and later changes to the same edge win.
+                ids = self.patch_ids[:self.patch_count][::-1]
+                weights = np.tile(self.patch_weights[:self.patch_count][::-1], 2)
+                positions = self.csr.find_edges(np.concatenate((ids[:, 0], ids[:, 1])),
+                                                np.concatenate((ids[:, 1], ids[:, 0])))
+                positions, latest = np.unique(positions, return_index=True)
+                self.csr = self.csr.with_weights(self.version, positions, weights[latest])
+            else:
+                self.csr = GraphCSR.from_graph(self)
+                self.csr_vertices = self.vertex_array[:self.csr.get_size()].copy()
+            self.patch_count = 0
+        return self.csr
+
+    @synchronised
+    def _get_snapshot(self) -> tuple[GraphCSR, np.ndarray]:
+        """Get a CSR snapshot of the graph together with the vertices it was built from.
+
+        Searches run outside the lock, so paths are turned back into vertices with this copy rather than vertex_array,
+        which a concurrent delete_vertex may have cleared.
+
+        Returns:
+            A tuple of the GraphCSR snapshot and an object array of its vertices, indexed by vertex id.
+        """
+        csr = self.get_csr()
+        return csr, self.csr_vertices
+
+    @synchronised
     def get_adjacent(self, label: str) -> numpy.ndarray:
         """Get adjacent vertices to specified vertex.
 
@@ -272,6 +1203,7 @@ class Graph:
         else:
             raise VertexNotFoundError("Location not found.")
 
+    @synchronised
     def is_adjacent(self, label1: str, label2: str) -> bool:
         """Check if two vertices are adjacent.
 
@@ -285,11 +1217,10 @@ class Graph:
         vertex1 = self.find_vertex(label1)
         vertex2 = self.find_vertex(label2)
         if vertex1 and vertex2:
-            for vertex, _ in vertex1.get_adjacent():
-                if vertex2 == vertex:
-                    return True
+            return vertex1.is_adjacent_to(vertex2)
         return False
 
+    @synchronised
     def display_as_list(self) -> None:
         """Display the graph as an adjacency list."""
         for vertex in self.vertices: # Iterate through each vertex in the linked list
@@ -301,30 +1232,107 @@ class Graph:
                     print(f"{f'- {weight} > {adjacent_vertex} ' if count + 1 < len(vertex.get_value().get_adjacent()) else f'- {weight} > {adjacent_vertex} '} ", end="")
             print() # Print newline
 
-    def display_as_matrix(self) -> None:
-        """Display the graph as an adjacency matrix."""
-        matrix = np.zeros((self.count, self.count), dtype=int) # Create a 2d array of zeros with the size of the number of vertices
-
-        for row in range(len(matrix)):
-            for col in range(len(matrix)):
-                if self.is_adjacent(self.vertices[row].get_value().get_label(), # For each element in the 2d array, check if the vertices the element corresponds to are adjacent, if so, set the element to 1 to represent the edge
-                                    self.vertices[col].get_value().get_label()):
-                    matrix[row][col] = 1
-
-        print()
-        print("\t", end="")
-        # Print the horizontal labels of the vertices
-        for i in self.vertices:
-            print(i.get_value().get_label(), end="\t")
-        print()
-
-        # Print the 2d array and the verticalk labels
-        for row in range(len(matrix)):
-            print(self.vertices[row].get_value().get_label(), end="\t") # Print the vertical label of the vertex
-            for col in range(len(matrix)):
-                print(matrix[row][col], end="\t") # Print the element in the 2d array
-            print()
+    @synchronised
+    def export_adjacency(self, matrix_format: str = "dense") -> tuple[np.ndarray, any]:
+        """Export the weighted adjacency matrix, with rows and columns in the order of the vertex list (by label).
+
+        Built from the CSR snapshot in one pass over the edges, O(V + E) for the sparse formats (plus O(V^2) to
+        allocate the dense matrix).
+
+        Args:
+            matrix_format: "dense" for a V x V float64 array (0 where there is no edge), "coo" for a (rows, cols,
+                weights) triple with one entry per direction of each edge, or "csr" for an (offsets, targets, weights)
+                triple, where the neighbours of row i are targets[offsets[i]:offsets[i + 1]].
+
+        Returns:
+            A tuple of the object array of vertex labels (the row/column order) and the matrix in the chosen format.
+
+        Raises:
+            ValueError: If the format is not recognised.
+        """
+        if matrix_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown matrix format '{matrix_format}'.")
+        csr = self.get_csr()
+
+        # Order the rows/columns the same as the vertex linked list (sorted by label), and map ids to positions
+        order, labels = self._list_order()
+        position = np.full(csr.get_size(), -1, dtype=np.int64)
+        position[order] = np.arange(self.count)
+
+        # Gather each vertex's slice of the CSR arrays in display order: entry j of the output comes from
+        # (start of its row in the snapshot) + (its offset within the row)
+        degrees = np.diff(csr.offsets)[order]
+        offsets = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        source = np.repeat(csr.offsets[order] - offsets[:-1], degrees) + np.arange(offsets[-1])
+        targets = position[csr.targets[source]]
+        weights = csr.weights[source]
+
+        if matrix_format == "csr":
+            return labels, (offsets, targets, weights)
+        rows = np.repeat(np.arange(self.count), degrees)
+        if matrix_format == "coo":
+            return labels, (rows, targets, weights)
+        matrix = np.zeros((self.count, self.count), dtype=np.float64)
+        matrix[rows, targets] = weights
+        return labels, matrix
+
+    def _list_order(self) -> tuple[np.ndarray, np.ndarray]:
+        """Get the ids and labels of the vertices in the order of the vertex list (by label).
+
+        Returns:
+            A tuple of an int64 array of vertex ids and an object array of their labels.
+        """
+        order = np.empty(self.count, dtype=np.int64)
+        labels = np.empty(self.count, dtype=object)
+        for i, node in enumerate(self.vertices):
+            order[i] = node.get_value().get_id()
+            labels[i] = node.get_value().get_label()
+        return order, labels
+
+    @synchronised
+    def display_as_matrix(self, page_size: int = None, weighted: bool = False) -> None:
+        """Display the graph as an adjacency matrix.
 
+        Args:
+            page_size: If given, print the matrix in pages of at most page_size rows by page_size columns, so that
+                large graphs are readable and never built as a full dense matrix. Defaults to one page.
+            weighted: Print edge weights rather than 1 for each edge. Defaults to False.
+        """
+        labels, (offsets, targets, weights) = self.export_adjacency("csr")
+        size = labels.size
+        if page_size is None:
+            page_size = max(size, 1)
+
+        for row_start in range(0, size, page_size):
+            row_end = min(row_start + page_size, size)
+            for col_start in range(0, size, page_size):
+                col_end = min(col_start + page_size, size)
+                # Fill in just this page of the matrix from the exported rows
+                page = np.zeros((row_end - row_start, col_end - col_start), dtype=np.float64)
+                for row in range(row_start, row_end):
+                    cols = targets[offsets[row]:offsets[row + 1]]
+                    in_page = (cols >= col_start) & (cols < col_end)
+                    page[row - row_start, cols[in_page] - col_start] = weights[offsets[row]:offsets[row + 1]][in_page]
+
+                print()
+                if page_size < size:
+                    print(f"Rows {row_start + 1}-{row_end}, columns {col_start + 1}-{col_end} of {size}")
+                print("\t", end="")
+                # Print the horizontal labels of the vertices
+                for label in labels[col_start:col_end]:
+                    print(label, end="\t")
+                print()
+
+                # Print the 2d array and the vertical labels
+                for row in range(row_end - row_start):
+                    print(labels[row_start + row], end="\t") # Print the vertical label of the vertex
+                    for col in range(col_end - col_start):
+                        # Print the element in the 2d array
+                        print(f"{page[row, col]:g}" if weighted else int(page[row, col] != 0), end="\t")
+                    print()
+
+    @synchronised
     def find_vertex(self, label: str) -> GraphVertex | None:
         """Find a vertex given a label within the graph.
 
@@ -334,118 +1342,502 @@ class Graph:
         Returns:
             The vertex if found, None otherwise.
         """
-        for vertex in self.vertices:
-            if vertex.get_value().get_label().casefold() == label.casefold():
-                return vertex.get_value()
-        return None
+        # Labels are matched case-insensitively, so the index is keyed by the case-folded label
+        return self.label_index.get(label.casefold())
+
+    def dijkstra(self, start_label: str, end_label: str, algorithm: str = "dijkstra",
+                 departure_time: float = None) -> tuple[float, list]:
+        """Find the shortest path between two vertices using Dijkstra's algorithm.
 
-    def _find_vertex_index(self, label: str) -> int | None:
-        """Find the index of a vertex using its label.
+        Routes are cached (least recently used are evicted first), and a cached route also answers the reverse query.
+        Adding an edge expires every cached route, while deleting an edge or vertex only drops the routes using it.
 
         Args:
-            label: Label of the vertex to find.
+            start_label: Label of the start vertex.
+            end_label: Label of the end vertex.
+            algorithm: The search to run: "dijkstra" (forward search from the start), "bidirectional" (searches from
+                both ends, settling roughly half as many vertices on large road networks) or "astar" (A* search guided
+                by the straight-line distance between vertex coordinates) or "ch" (query the contraction hierarchy,
+                which is built first if the graph has changed since it was last built or loaded) or "alt" (A* search
+                guided by the distances to landmarks, which needs no coordinates; the landmarks are picked first if the
+                graph has changed since they were last built or loaded).
+            departure_time: The hour of the day (0 to 24) to route at, using the weight of each road with a
+                time-of-day profile at that time. Defaults to None, using the fixed weights. Routes at a departure time
+                are not cached, and can't use the "ch" or "alt" algorithms.
+
+        Returns:
+            A tuple containing the distance and the path between the two vertices.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found.
+            PathNotFound: If no path exists between the provided locations.
+            ValueError: If the algorithm is not recognised.
+        """
+        if algorithm not in DIJKSTRA_ALGORITHMS:
+            raise ValueError(f"Unknown shortest path algorithm '{algorithm}'.")
+
+        if departure_time is not None:
+            if algorithm == "ch":
+                raise ValueError("The contraction hierarchy can't route at a departure time.")
+            if algorithm == "alt":
+                # A road's weight at some times of day may be below the weight the landmark distances were found with
+                raise ValueError("Landmark routing can't route at a departure time.")
+            with self.lock:
+                start = self.find_vertex(start_label)
+                end = self.find_vertex(end_label)
+                if not start or not end:
+                    raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+                csr, vertices = self._get_snapshot()
+            return self._search_snapshot(csr.at_time(departure_time), vertices, start.get_id(), end.get_id(), algorithm)
+
+        # The graph is undirected, so a route and its reverse share one cache entry, stored in sorted label order. Each
+        # algorithm has its own entries, since they can pick different paths of the same length.
+        start_key = start_label.casefold()
+        end_key = end_label.casefold()
+        reverse = end_key < start_key
+        key = (end_key, start_key, algorithm) if reverse else (start_key, end_key, algorithm)
+        with self.lock:
+            start = self.find_vertex(start_label)
+            end = self.find_vertex(end_label)
+            if not start or not end:
+                raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+            route = self.route_cache.get(key)
+            version = self.version
+
+        if route is None:
+            final_distance, path = self._find_route(start.get_id(), end.get_id(), algorithm)
+            if reverse:
+                path.reverse()
+            # Record the position of each vertex on the path, so deletions can check if it uses a vertex or edge
+            positions = VertexHashTable()
+            for i, vertex in enumerate(path):
+                positions.put(vertex.get_id(), i)
+            route = (final_distance, path, positions)
+            with self.lock:
+                # A route found while another thread changed the graph may already be out of date, so isn't cached
+                if self.version == version:
+                    self.route_cache.put(key, route)
+
+        final_distance, path, _ = route
+        return final_distance, path[::-1] if reverse else list(path)
+
+    @synchronised
+    def get_route_cache_stats(self) -> dict:
+        """Get the counters of the route cache used by dijkstra.
 
         Returns:
-            The index of the vertex if found, None otherwise.
+            A dictionary of the "hits", "misses" and "evictions" counts, and the "size" of the cache.
         """
-        for i in range(len(self.vertices)):
-            if self.vertices[i].get_value().get_label() == label:
-                return i
+        return self.route_cache.get_stats()
 
-    def dijkstra(self, start_label: str, end_label: str) -> tuple[float, list]:
-        """Find the shortest path between two vertices using Dijkstra's algorithm.
+    def _invalidate_routes(self, id1: int, id2: int = None) -> None:
+        """Drop the cached routes that use a deleted vertex, or a deleted edge if two vertex ids are given.
+
+        Args:
+            id1: Id of the deleted vertex, or of the first vertex of the deleted edge.
+            id2: Id of the second vertex of the deleted edge. Defaults to None.
+        """
+        for key, (_, _, positions) in self.route_cache.items():
+            position1 = positions.get(id1)
+            if position1 is None:
+                continue
+            if id2 is None:
+                self.route_cache.remove(key)
+            else:
+                # A path visits each vertex once, so it uses the edge only if the two vertices are consecutive on it
+                position2 = positions.get(id2)
+                if position2 is not None and abs(position1 - position2) == 1:
+                    self.route_cache.remove(key)
+
+    def _find_route(self, start_id: int, end_id: int, algorithm: str) -> tuple[float, list]:
+        """Find the shortest path between two existing vertices, without using the route cache.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+            algorithm: The search to run, as for dijkstra.
+
+        Returns:
+            A tuple containing the distance and the path between the two vertices.
+
+        Raises:
+            VertexNotFoundError: If another thread has deleted one or both vertices since they were found.
+            PathNotFound: If no path exists between the provided locations.
+        """
+        # In all-pairs mode, the distance is a single lookup in the precomputed matrix. The matrix is updated in place
+        # by add_edge, so it is read under the lock.
+        with self.lock:
+            if self.vertex_array[start_id] is None or self.vertex_array[end_id] is None:
+                raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+            if self.all_pairs is not None:
+                all_pairs = self.get_all_pairs()
+                final_distance = all_pairs.get_distance(start_id, end_id)
+                if final_distance == float("inf"):
+                    raise PathNotFound("Path not found between provided locations.")
+                return final_distance, list(self.vertex_array[all_pairs.get_path_ids(start_id, end_id)])
+
+            # Everything the search reads is taken from the same version of the graph, including the vertices its
+            # path ids are turned back into
+            tree = self._get_cached_tree(start_id)
+            csr, vertices = self._get_snapshot()
+            if tree is None and algorithm == "ch":
+                hierarchy = self.get_hierarchy()
+            elif tree is None and algorithm == "alt":
+                landmarks = self.get_landmarks()
+
+        # If a full shortest path tree from the start is already cached, read the answer from it
+        if tree is not None:
+            final_distance = tree.get_distances()[end_id]
+            if final_distance == float("inf"):
+                raise PathNotFound("Path not found between provided locations.")
+            return final_distance, self._reconstruct_path(tree.get_predecessors(), end_id, vertices)
+
+        if algorithm == "ch":
+            final_distance, path_ids, _ = hierarchy.query(start_id, end_id)
+            if final_distance == float("inf"):
+                raise PathNotFound("Path not found between provided locations.")
+            return final_distance, list(vertices[path_ids])
+        if algorithm == "alt":
+            final_distance, path_ids, _ = csr.astar(start_id, end_id, landmarks.lower_bounds(end_id))
+            if final_distance == float("inf"):
+                raise PathNotFound("Path not found between provided locations.")
+            return final_distance, list(vertices[path_ids])
+        return self._search_snapshot(csr, vertices, start_id, end_id, algorithm)
+
+    def _search_snapshot(self, csr: GraphCSR, vertices: np.ndarray, start_id: int, end_id: int,
+                         algorithm: str) -> tuple[float, list]:
+        """Find the shortest path between two existing vertices by searching a CSR snapshot.
+
+        Args:
+            csr: The snapshot to search.
+            vertices: The vertices of the snapshot, indexed by vertex id (see _get_snapshot).
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+            algorithm: The search to run: "dijkstra", "bidirectional" or "astar".
+
+        Returns:
+            A tuple containing the distance and the path between the two vertices.
+
+        Raises:
+            PathNotFound: If no path exists between the provided locations.
+        """
+        if algorithm == "bidirectional":
+            final_distance, path_ids, _ = csr.bidirectional_dijkstra(start_id, end_id)
+        elif algorithm == "astar":
+            final_distance, path_ids, _ = csr.astar(start_id, end_id)
+        else:
+            # Distances and previous vertex ids are held in arrays indexed by id
+            distances, prev = csr.dijkstra(start_id, end_id)
+            final_distance = distances[end_id]
+            path_ids = reconstruct_path_ids(prev, end_id) if final_distance != float("inf") else None
+        if final_distance == float("inf"):
+            raise PathNotFound("Path not found between provided locations.")
+        return final_distance, list(vertices[path_ids])
+
+    @synchronised
+    def enable_all_pairs(self) -> None:
+        """Enable all-pairs mode: precompute the shortest distance between every pair of vertices.
+
+        Afterwards dijkstra answers distances with an O(1) lookup. Adding vertices or edges updates the matrix in
+        O(V^2), while deleting them causes a full recomputation on the next query. Intended for graphs of up to a few
+        thousand vertices, as the matrix takes O(V^2) memory.
+        """
+        self.all_pairs = DistanceMatrix.from_csr(self.get_csr())
+
+    @synchronised
+    def disable_all_pairs(self) -> None:
+        """Disable all-pairs mode and free the distance matrix."""
+        self.all_pairs = None
+
+    @synchronised
+    def get_all_pairs(self) -> DistanceMatrix:
+        """Get the all-pairs distance matrix, recomputing it if the graph has changed in a way it couldn't follow.
+
+        Returns:
+            The DistanceMatrix matching the current graph.
+
+        Raises:
+            ValueError: If all-pairs mode is not enabled.
+        """
+        if self.all_pairs is None:
+            raise ValueError("All-pairs mode is not enabled.")
+        if self.all_pairs.version != self.version:
+            self.all_pairs = DistanceMatrix.from_csr(self.get_csr())
+        return self.all_pairs
+
+    def _all_pairs_current(self, version: int) -> bool:
+        """Check if all-pairs mode is enabled and the matrix matches the given graph version.
+
+        Args:
+            version: The graph version to check against.
+
+        Returns:
+            True if the matrix can be updated incrementally from that version, False otherwise.
+        """
+        return self.all_pairs is not None and self.all_pairs.version == version
+
+    @synchronised
+    def build_contraction_hierarchy(self, settle_limit: int = 50) -> ContractionHierarchy:
+        """Preprocess the graph into a contraction hierarchy, for fast "ch" dijkstra queries on large networks.
+
+        Args:
+            settle_limit: The most vertices each witness search settles during preprocessing.
+
+        Returns:
+            The new ContractionHierarchy.
+        """
+        self.hierarchy = ContractionHierarchy.from_csr(self.get_csr(), settle_limit)
+        return self.hierarchy
+
+    @synchronised
+    def get_hierarchy(self) -> ContractionHierarchy:
+        """Get the contraction hierarchy, rebuilding it if the graph has changed since it was built or loaded.
+
+        Returns:
+            The ContractionHierarchy matching the current graph.
+        """
+        if self.hierarchy is None or self.hierarchy.version != self.version:
+            self.build_contraction_hierarchy()
+        return self.hierarchy
+
+    @synchronised
+    def save_contraction_hierarchy(self, path: str) -> None:
+        """Save the contraction hierarchy (building it first if needed) to a .npz file.
+
+        Args:
+            path: Path of the file to write.
+        """
+        self.get_hierarchy().save(path)
+
+    @synchronised
+    def load_contraction_hierarchy(self, path: str) -> None:
+        """Load a contraction hierarchy saved for this graph, so it doesn't need to be rebuilt.
+
+        The graph must have been built the same way (same locations added in the same order, same roads with the same
+        weights) as the graph the hierarchy was saved from, which is checked against a fingerprint saved with it.
+
+        Args:
+            path: Path of the file to read.
+
+        Raises:
+            ValueError: If the hierarchy was saved for different locations or roads.
+        """
+        hierarchy = ContractionHierarchy.load(path)
+        if not hierarchy.matches(self.get_csr()):
+            raise ValueError("Contraction hierarchy was saved for a different set of locations or roads.")
+        hierarchy.version = self.version
+        self.hierarchy = hierarchy
+
+    @synchronised
+    def build_landmarks(self, count: int = LANDMARK_COUNT) -> Landmarks:
+        """Pick landmarks and find every vertex's distance to them, for "alt" dijkstra queries.
+
+        Takes one full search per landmark. The V x count distance table is float32, and is saved with the graph.
+
+        Args:
+            count: The number of landmarks. More give tighter bounds (fewer vertices settled per query) but cost more
+                memory and per-query setup.
+
+        Returns:
+            The new Landmarks.
+
+        Raises:
+            ValueError: If count is less than 1.
+        """
+        self.landmarks = Landmarks.from_csr(self.get_csr(), count)
+        return self.landmarks
+
+    @synchronised
+    def get_landmarks(self) -> Landmarks:
+        """Get the landmarks, picking them again (as many as before) if the graph has changed since they were built.
+
+        Returns:
+            The Landmarks matching the current graph.
+        """
+        if self.landmarks is None or self.landmarks.version != self.version:
+            self.build_landmarks(max(self.landmarks.get_count(), 1) if self.landmarks is not None else LANDMARK_COUNT)
+        return self.landmarks
+
+    def k_shortest_paths(self, start_label: str, end_label: str, k: int) -> np.ndarray:
+        """Find the k shortest loopless paths between two vertices (Yen's algorithm), e.g. for alternative routes.
+
+        The spur searches all share one shortest path tree from the end vertex, taken from the tree cache if routes
+        have already been built out of it.
 
         Args:
             start_label: Label of the start vertex.
             end_label: Label of the end vertex.
+            k: The number of paths to find.
 
         Returns:
-            A tuple containing the distance and the path between the two vertices.
+            An array of (distance, path) tuples, shortest first, each path a list of vertices. Holds fewer than k paths
+            if not enough exist.
 
         Raises:
             VertexNotFoundError: If one or both vertices are not found.
             PathNotFound: If no path exists between the provided locations.
+            ValueError: If k is less than 1.
         """
-        if not self.has_vertex(start_label) or not self.has_vertex(end_label):
-            raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+        if k < 1:
+            raise ValueError("Number of paths to find must be at least 1.")
+        with self.lock:
+            start = self.find_vertex(start_label)
+            end = self.find_vertex(end_label)
+            if not start or not end:
+                raise VertexNotFoundError("Cannot find one or both locations to find paths between.")
+            csr, vertices = self._get_snapshot()
+
+        tree = self.shortest_path_tree(end_label)
+        # The tree can only be shared if it was built from the same snapshot
+        tree_arrays = (tree.get_distances(), tree.get_predecessors()) if tree.version == csr.version else None
+        distances, paths = csr.k_shortest_paths(start.get_id(), end.get_id(), k, tree_arrays)
+        if distances.size == 0:
+            raise PathNotFound("Path not found between provided locations.")
 
-        # Get the vertex objects from the labels
-        start = self.find_vertex(start_label)
-        end = self.find_vertex(end_label)
+        routes = np.empty(distances.size, dtype=object)
+        for i in range(distances.size):
+            routes[i] = (float(distances[i]), list(vertices[paths[i]]))
+        return routes
 
-        # convert the linked list of vertices to a numpy array to use indexing
-        vertices_list = np.empty(self.count, dtype=object)
-        for i in range(self.count):
-            vertices_list[i] = self.vertices[i].get_value()
+    @synchronised
+    def track_source(self, source_label: str) -> DynamicShortestPathTree:
+        """Get a shortest path tree from a source vertex that stays correct as the graph changes, e.g. for the
+        distances of vehicles leaving it.
 
-        # Converting the numpy array to a list to use indexing - I know we're not meant to use in built ADTS, but need to use .index() from Python lists.
-        # Java has .indexOf() for arrays, but numpy lacks this. The list is used the same way as an array.
-        vertices_list = list(vertices_list)
+        The tree is built once, then each change to the graph repairs only the distances it affects. Trees are shared
+        by source, so call untrack_source once for each call to this when the tree is no longer needed.
 
-        # Create a priority queue using MinHeap
-        pq = MinHeap(self.count)
+        Args:
+            source_label: Label of the source vertex.
 
-        # Create arrays to store the previous vertices and distances
-        prev = np.empty(self.count, dtype=object)
-        distances = np.empty(self.count, dtype=float)
-        distances[:] = float("inf")
-        distances[vertices_list.index(start)] = 0
+        Returns:
+            The DynamicShortestPathTree rooted at the source vertex.
 
-        # Add start vertex to the priority queue with priority 0 (distance 0)
-        pq.add(0, start)
+        Raises:
+            VertexNotFoundError: If the source vertex is not found.
+        """
+        source = self.find_vertex(source_label)
+        if not source:
+            raise VertexNotFoundError("Cannot find location to build shortest path tree.")
+        tree = self.tracked_trees.get(source.get_id())
+        if tree is None:
+            distances, prev = self.get_csr().dijkstra(source.get_id())
+            tree = DynamicShortestPathTree(self, source.get_id(), distances, prev)
+            self.tracked_trees.put(source.get_id(), tree)
+        tree.users += 1
+        return tree
+
+    @synchronised
+    def untrack_source(self, tree: DynamicShortestPathTree) -> None:
+        """Stop keeping a tree from track_source up to date, once nothing else is using it.
 
-        # While the priority queue is not empty
-        while pq.get_count() > 0:
-            # Remove the vertex with the highest priority (lowest distance)
-            current_entry = pq.remove()
-            # Unpack the current entry (tuple) into distance and vertex
-            current_distance = current_entry.get_priority()
-            vertex = current_entry.get_value()
+        Args:
+            tree: The tree returned by track_source.
+        """
+        tree.users -= 1
+        if tree.users <= 0 and self.tracked_trees.get(tree.source_id) is tree:
+            self.tracked_trees.remove(tree.source_id)
 
-            # If the vertex is the end vertex, break as the shortest path has been found
-            if vertex == end:
-                break
+    def shortest_path_tree(self, source_label: str) -> ShortestPathTree:
+        """Find the shortest distance and path from a source vertex to every vertex, using Dijkstra's algorithm.
 
-            # If the current distance is greater than the distance stored in the distances array, continue to the next iteration
-            if current_distance > distances[vertices_list.index(vertex)]:
-                continue
+        Trees are cached per source (least recently used are evicted first) until the graph next changes, so routing
+        many vehicles out of the same location costs one search.
 
-            # Iterate through the adjacent vertices of the current vertex
-            for neighbour, weight in vertex.get_adjacent():
-                alt = current_distance + weight
+        Args:
+            source_label: Label of the source vertex.
 
-                if alt < distances[vertices_list.index(neighbour)]:
-                    prev[vertices_list.index(neighbour)] = vertex
-                    distances[vertices_list.index(neighbour)] = alt
-                    pq.add(alt, neighbour)
+        Returns:
+            The ShortestPathTree rooted at the source vertex.
 
-        final_distance = distances[vertices_list.index(end)]
-        if final_distance == float("inf"):
-            raise PathNotFound("Path not found between provided locations.")
-        return final_distance, self._reconstruct_path(prev, start, end, vertices_list)
+        Raises:
+            VertexNotFoundError: If the source vertex is not found.
+        """
+        with self.lock:
+            source = self.find_vertex(source_label)
+            if not source:
+                raise VertexNotFoundError("Cannot find location to build shortest path tree.")
+            tree = self._get_cached_tree(source.get_id())
+            csr, vertices = self._get_snapshot()
+
+        if tree is None:
+            # Search outside the lock, so other threads can query the graph meanwhile
+            distances, prev = csr.dijkstra(source.get_id())
+            with self.lock:
+                tree = ShortestPathTree(self, source.get_id(), distances, prev, vertices)
+                tree.version = csr.version
+                # Only cache the tree if the graph hasn't changed since the snapshot was taken
+                if csr.version == self.version:
+                    self.tree_cache.put(source.get_id(), tree)
+        return tree
+
+    def within_distance(self, source_label: str, max_distance: float) -> tuple[np.ndarray, np.ndarray]:
+        """Find every vertex within a distance of a source vertex by road, e.g. the locations a vehicle can reach.
+
+        One Dijkstra search stops expanding past the distance, so the cost depends on how many vertices are found,
+        not the size of the graph.
 
-    def _reconstruct_path(self, prev, start, end, vertices_list) -> list:
+        Args:
+            source_label: Label of the source vertex.
+            max_distance: The furthest distance to include.
+
+        Returns:
+            A tuple of an object array of the labels of the vertices found (including the source), closest first, and
+            a float64 array of their distances.
+
+        Raises:
+            VertexNotFoundError: If the source vertex is not found.
+            ValueError: If max_distance is negative.
+        """
+        if max_distance < 0:
+            raise ValueError("Distance to search must not be negative.")
+        with self.lock:
+            source = self.find_vertex(source_label)
+            if not source:
+                raise VertexNotFoundError("Cannot find location to search from.")
+            csr = self.get_csr()
+
+        found_ids, distances = csr.within_distance(source.get_id(), max_distance)
+        return csr.labels[found_ids], distances
+
+    @synchronised
+    def _get_cached_tree(self, source_id: int) -> ShortestPathTree | None:
+        """Get the cached shortest path tree for a source vertex, clearing the cache first if the graph has changed.
+
+        Args:
+            source_id: Id of the source vertex.
+
+        Returns:
+            The cached ShortestPathTree, or None if there isn't one.
+        """
+        if self.tree_cache_version != self.version:
+            self.tree_cache.clear()
+            self.tree_cache_version = self.version
+        return self.tree_cache.get(source_id)
+
+    def _reconstruct_path(self, prev: np.ndarray, end_id: int, vertices: np.ndarray = None) -> list:
         """Reconstruct the path from the start to the end vertex.
 
         Args:
-            prev: List of previous vertices in the path.
-            start: The start vertex.
-            end: The end vertex.
-            vertices_list: List of all vertices in the graph.
+            prev: Array of previous vertex ids in the path, indexed by vertex id (-1 for the start vertex).
+            end_id: The id of the end vertex.
+            vertices: The vertices of the snapshot prev was found in, indexed by vertex id. Defaults to None, reading
+                the graph's current vertices under the lock (for trees the graph keeps up to date).
 
         Returns:
-            The reconstructed path from start to end.
+            The reconstructed path (of vertices) from start to end.
         """
-        path = []
-        current = end
-        while current:
-            path.append(current)
-            current = prev[vertices_list.index(current)]
-        path.reverse()
-        return path
+        if vertices is not None:
+            return list(vertices[reconstruct_path_ids(prev, end_id)])
+        with self.lock:
+            return list(self.vertex_array[reconstruct_path_ids(prev, end_id)])
 
+    @synchronised
     def is_path(self, start_label, end_label) -> bool:
-        """Perform a breadth-first search of the graph and check if a path exists between two nodes.
+        """Check if a path exists between two nodes, by checking if they are in the same connected component.
+
+        The components are kept up to date as vertices and edges are added, so this is amortised O(α(V)). After a
+        deletion they are rebuilt once in O(V + E) on the next call.
 
         Args:
             start_label: Label of the start vertex.
@@ -456,29 +1848,28 @@ class Graph:
 
         Raises:
             GraphEmptyError: If the graph is empty.
+            VertexNotFoundError: If one or both vertices are not found.
         """
         if self.count == 0:
-            raise GraphEmptyError("Cannot perform BFS on empty graph.")
-        q = Queue()  # The main queue for BFS
+            raise GraphEmptyError("Cannot check for a path in an empty graph.")
 
-        # Clear the visited status of all vertices
-        for vertex in self.vertices:
-            vertex.get_value().clear_visited()
-
-        v = self.find_vertex(start_label)  # Start from the first vertex
+        start = self.find_vertex(start_label)
         end = self.find_vertex(end_label)
-        v.set_visited()  # Mark it as visited
-        q.enqueue(v)  # Enqueue the start vertex
-
-        while not q.is_empty():
-            v = q.dequeue()
-            for w, _ in v.get_adjacent():
-                if w == end:
-                    return True
-                if not w.get_visited():  # Only consider unvisited adjacent vertices
-                    w.set_visited()  # Mark as visited before enqueueing
-                    q.enqueue(w)
-        return False
+        if not start or not end:
+            raise VertexNotFoundError("Cannot find one or both locations to check for a path.")
+
+        return self._get_components().connected(start.get_id(), end.get_id())
+
+    def _get_components(self) -> DisjointSet:
+        """Get the connected components, rebuilding them first if a deletion may have split one.
+
+        Returns:
+            The DisjointSet of the connected components, indexed by vertex id.
+        """
+        if not self.components_current:
+            self.components = DisjointSet.from_csr(self.get_csr())
+            self.components_current = True
+        return self.components
 
 
 class VertexNotFoundError(Exception):
@@ -0,0 +1,889 @@
+"""
+GraphCSR.py
+
+This file contains the GraphCSR class, a frozen compressed sparse row (CSR) snapshot of a Graph used for read-heavy queries.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+import threading
+
+import numpy as np
+
+from MinHeap import MinHeap
+from Queue import Queue
+
+
+class GraphCSR:
+    """A class to represent a read-only compressed sparse row snapshot of a graph.
+
+    The neighbours of the vertex with id v are targets[offsets[v]:offsets[v + 1]], with the matching edge weights in
+    weights[offsets[v]:offsets[v + 1]]. Ids of deleted vertices have no neighbours and a label of None.
+
+    Attributes:
+        version: The graph version the snapshot was built from.
+        offsets: An int64 array of size V + 1 giving where each vertex's neighbours start in targets.
+        targets: An int64 array of neighbour vertex ids (each undirected edge appears once in each direction).
+        weights: A float64 array of edge weights, parallel to targets.
+        labels: An object array of vertex labels indexed by vertex id (None where a vertex has been deleted). None for
+            a snapshot mapped from disk by a MappedGraph, which reads its labels from the string table instead.
+        coordinates: A V x 2 float64 array of vertex (x, y) positions indexed by vertex id (NaN where unknown).
+        heuristic_scale: The factor converting straight-line distance into a lower bound on road distance, worked
+            out on first use by A*.
+        profile_index: An int64 array giving the row of profiles used by each edge, parallel to targets (-1 for edges
+            without a time-of-day profile), or None if no edge has one.
+        profiles: A float32 array with a row of weights for each time slot of the day per profiled edge direction,
+            or None if no edge has one.
+        timed_snapshots: An object array of the snapshots built by at_time, one per time slot.
+        edge_keys: A sorted int64 array of (source id * V + target id) for every edge, built on first use by
+            find_edges, or None.
+        edge_order: The position in targets of each edge in edge_keys, or None.
+        search_state: Thread-local storage for each thread's epoch-stamped visited and distance arrays, so searches from different
+            threads never share traversal state.
+    """
+
+    def __init__(self, version: int, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                 labels: np.ndarray, coordinates: np.ndarray = None, profile_index: np.ndarray = None,
+                 profiles: np.ndarray = None):
+        """Initialize a GraphCSR object.
+
+        Args:
+            version: The graph version the snapshot was built from.
+            offsets: Offsets of each vertex's neighbours in targets.
+            targets: Neighbour vertex ids.
+            weights: Edge weights, parallel to targets.
+            labels: Vertex labels indexed by vertex id.
+            coordinates: Vertex (x, y) positions indexed by vertex id. Defaults to all unknown.
+            profile_index: The row of profiles used by each edge (-1 for none). Defaults to no profiles.
+            profiles: The time-of-day weights of each profiled edge direction. Defaults to no profiles.
+        """
+        self.version = version
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.labels = labels
+        if coordinates is None:
+            coordinates = np.full((offsets.size - 1, 2), np.nan, dtype=np.float64)
+        self.coordinates = coordinates
+        self.heuristic_scale = None
+        self.profile_index = profile_index
+        self.profiles = profiles
+        self.timed_snapshots = np.empty(profiles.shape[1] if profiles is not None else 0, dtype=object)
+        self.edge_keys = None
+        self.edge_order = None
+        self.search_state = threading.local()
+
+    @classmethod
+    def from_graph(cls, graph) -> "GraphCSR":
+        """Build a CSR snapshot of a graph in O(V + E).
+
+        Args:
+            graph: The Graph to take a snapshot of.
+
+        Returns:
+            The GraphCSR snapshot.
+        """
+        size = graph.next_id
+        vertex_array = graph.vertex_array
+        labels = np.empty(size, dtype=object)
+        coordinates = np.full((size, 2), np.nan, dtype=np.float64)
+
+        # First pass: record the degree of each vertex
+        offsets = np.zeros(size + 1, dtype=np.int64)
+        for vertex_id in range(size):
+            vertex = vertex_array[vertex_id]
+            if vertex is not None:
+                labels[vertex_id] = vertex.get_label()
+                if vertex.get_coordinates() is not None:
+                    coordinates[vertex_id] = vertex.get_coordinates()
+                offsets[vertex_id + 1] = len(vertex.links)
+        np.cumsum(offsets, out=offsets)
+
+        # Second pass: fill in the neighbour ids and weights, and the time-of-day profile of each edge that has one
+        targets = np.empty(offsets[size], dtype=np.int64)
+        weights = np.empty(offsets[size], dtype=np.float64)
+        profile_index = None
+        profiles = None
+        if graph.profile_count > 0:
+            profile_index = np.full(offsets[size], -1, dtype=np.int64)
+            profiles = np.empty((2 * graph.profile_count, graph.profile_slots), dtype=np.float32)
+        profile_count = 0
+        for vertex_id in range(size):
+            vertex = vertex_array[vertex_id]
+            if vertex is not None:
+                position = offsets[vertex_id]
+                for node in vertex.links:
+                    neighbour, weight = node.get_value()
+                    targets[position] = neighbour.get_id()
+                    weights[position] = weight
+                    if profiles is not None and vertex.profiles is not None:
+                        profile = vertex.profiles.get(neighbour.get_id())
+                        if profile is not None:
+                            profiles[profile_count] = profile
+                            profile_index[position] = profile_count
+                            profile_count += 1
+                    position += 1
+
+        return cls(graph.version, offsets, targets, weights, labels, coordinates, profile_index, profiles)
+
+    def save(self, path: str, components: np.ndarray = None) -> None:
+        """Save the snapshot as a directory of raw .npy files, which can be read straight into memory or mapped.
+
+        The labels are stored as a string table: label_text holds every label's UTF-8 bytes back to back, and the
+        bytes of label i are label_text[label_offsets[i]:label_offsets[i + 1]]. search_order lists the vertex ids
+        sorted by case-folded label, so a label can be found by binary search without reading every label.
+
+        Args:
+            path: Path of the directory to write (created if it doesn't exist).
+            components: An int64 array of the connected component of each vertex, saved so that a mapped snapshot
+                can check for a path with a single comparison. Defaults to not saving components.
+
+        Raises:
+            ValueError: If the snapshot has ids of deleted vertices, which can't be stored in the string table.
+        """
+        if np.equal(self.labels, None).any():
+            raise ValueError("Only snapshots without deleted vertices can be saved.")
+        encoded = np.frompyfunc(lambda label: label.encode("utf-8"), 1, 1)(self.labels)
+        label_offsets = np.zeros(self.labels.size + 1, dtype=np.int64)
+        label_offsets[1:] = np.cumsum(np.frompyfunc(len, 1, 1)(encoded).astype(np.int64))
+        label_text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        folded = np.frompyfunc(str.casefold, 1, 1)(self.labels).astype(str)
+        search_order = np.argsort(folded, kind="stable").astype(np.int64)
+
+        os.makedirs(path, exist_ok=True)
+        arrays = (("label_text", label_text), ("label_offsets", label_offsets), ("search_order", search_order),
+                  ("offsets", self.offsets), ("targets", self.targets), ("weights", self.weights),
+                  ("coordinates", self.coordinates))
+        if components is not None:
+            arrays += (("components", components),)
+        for name, array in arrays:
+            np.save(os.path.join(path, name + ".npy"), array)
+
+    @classmethod
+    def load(cls, path: str, version: int = 0) -> "GraphCSR":
+        """Load a snapshot saved with save.
+
+        Args:
+            path: Path of the directory to read.
+            version: The graph version to give the snapshot. Defaults to 0.
+
+        Returns:
+            The loaded GraphCSR.
+        """
+        def read(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, name + ".npy"))
+
+        label_bytes = read("label_text").tobytes()
+        label_offsets = read("label_offsets")
+        labels = np.empty(label_offsets.size - 1, dtype=object)
+        starts = label_offsets[:-1].tolist()
+        ends = label_offsets[1:].tolist()
+        # When every label is ASCII, byte offsets are character offsets, so the table can be decoded in one go
+        text = label_bytes.decode("utf-8")
+        if len(text) == len(label_bytes):
+            for i in range(labels.size):
+                labels[i] = text[starts[i]:ends[i]]
+        else:
+            for i in range(labels.size):
+                labels[i] = label_bytes[starts[i]:ends[i]].decode("utf-8")
+        return cls(version, read("offsets"), read("targets"), read("weights"), labels, read("coordinates"))
+
+    def get_size(self) -> int:
+        """Get the number of vertex ids in the snapshot (including ids of deleted vertices).
+
+        Returns:
+            The size of the per-vertex arrays.
+        """
+        return self.offsets.size - 1
+
+    def find_edge(self, id1: int, id2: int) -> int:
+        """Find where the edge from one vertex to another is stored, in O(degree).
+
+        Args:
+            id1: The id of the vertex the edge leaves.
+            id2: The id of the vertex the edge goes to.
+
+        Returns:
+            The position of the edge in targets and weights, or -1 if the vertices are not adjacent.
+        """
+        start = self.offsets[id1]
+        found = np.flatnonzero(self.targets[start:self.offsets[id1 + 1]] == id2)
+        return int(start + found[0]) if found.size else -1
+
+    def find_edges(self, ids1: np.ndarray, ids2: np.ndarray) -> np.ndarray:
+        """Find where many edges are stored at once, by binary search over the sorted edge keys.
+
+        Args:
+            ids1: An int64 array of the ids of the vertices the edges leave.
+            ids2: An int64 array of the ids of the vertices the edges go to, parallel to ids1.
+
+        Returns:
+            An int64 array of the positions of the edges in targets and weights (-1 where the vertices are not
+            adjacent).
+        """
+        size = self.get_size()
+        if self.edge_keys is None:
+            rows = np.repeat(np.arange(size, dtype=np.int64), np.diff(self.offsets))
+            keys = rows * size + self.targets
+            self.edge_order = np.argsort(keys, kind="stable")
+            self.edge_keys = keys[self.edge_order]
+        keys = ids1 * size + ids2
+        found = np.minimum(np.searchsorted(self.edge_keys, keys), max(self.edge_keys.size - 1, 0))
+        if self.edge_keys.size == 0:
+            return np.full(keys.size, -1, dtype=np.int64)
+        return np.where(self.edge_keys[found] == keys, self.edge_order[found], -1)
+
+    def with_weights(self, version: int, positions: np.ndarray, weights: np.ndarray) -> "GraphCSR":
+        """Build a snapshot with some edge weights changed, sharing every other array with this one.
+
+        Args:
+            version: The graph version the new snapshot matches.
+            positions: An int64 array of the positions of the changed edges in targets.
+            weights: A float64 array of the new weights, parallel to positions.
+
+        Returns:
+            The new GraphCSR snapshot.
+        """
+        new_weights = self.weights.copy()
+        new_weights[positions] = weights
+        snapshot = GraphCSR(version, self.offsets, self.targets, new_weights, self.labels, self.coordinates,
+                            self.profile_index, self.profiles)
+        # The edges haven't moved, so the edge keys still hold
+        snapshot.edge_keys = self.edge_keys
+        snapshot.edge_order = self.edge_order
+        return snapshot
+
+    def at_time(self, departure_time: float) -> "GraphCSR":
+        """Get the snapshot with each edge's weight at a time of day, from its time-of-day profile if it has one.
+
+        The day is split into as many equal slots as the profiles have weights, and the snapshot for each slot is
+        built once and kept.
+
+        Args:
+            departure_time: The hour of the day (0 to 24).
+
+        Returns:
+            The GraphCSR snapshot for the time slot, or this snapshot if no edge has a profile.
+        """
+        if self.profiles is None:
+            return self
+        slots = self.profiles.shape[1]
+        slot = int(departure_time % 24 / 24 * slots) % slots
+        if self.timed_snapshots[slot] is None:
+            profiled = self.profile_index != -1
+            weights = self.weights.copy()
+            weights[profiled] = self.profiles[self.profile_index[profiled], slot]
+            self.timed_snapshots[slot] = GraphCSR(self.version, self.offsets, self.targets, weights, self.labels,
+                                                  self.coordinates)
+        return self.timed_snapshots[slot]
+
+    def get_degree(self, vertex_id: int) -> int:
+        """Get the number of neighbours of a vertex.
+
+        Args:
+            vertex_id: The id of the vertex.
+
+        Returns:
+            The degree of the vertex.
+        """
+        return int(self.offsets[vertex_id + 1] - self.offsets[vertex_id])
+
+    def dijkstra(self, start_id: int, end_id: int = -1) -> tuple[np.ndarray, np.ndarray]:
+        """Run Dijkstra's algorithm from a start vertex.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex. The search stops once it is settled. -1 searches the whole graph.
+
+        Returns:
+            A tuple of the distances array and previous vertex id array (-1 for none), both indexed by vertex id.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+
+        pq = MinHeap(targets.size + 1)
+        prev = np.full(self.get_size(), -1, dtype=np.int64)
+        distances = np.full(self.get_size(), np.inf, dtype=np.float64)
+        distances[start_id] = 0
+        pq.add(0, start_id)
+
+        while pq.get_count() > 0:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+
+            if vertex_id == end_id:
+                break
+            # Skip stale entries for vertices already settled at a shorter distance
+            if current_distance > distances[vertex_id]:
+                continue
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                alt = current_distance + weights[i]
+                if alt < distances[neighbour_id]:
+                    prev[neighbour_id] = vertex_id
+                    distances[neighbour_id] = alt
+                    pq.add(alt, neighbour_id)
+
+        return distances, prev
+
+    def nearest(self, start_id: int, target_counts: np.ndarray, k: int,
+                prev: np.ndarray = None) -> tuple[np.ndarray, np.ndarray]:
+        """Find the closest vertices holding targets (e.g. vehicles) with one Dijkstra search from a start vertex.
+
+        Vertices are settled in order of distance, so the search stops as soon as the vertices settled so far hold k
+        targets, rather than searching the whole graph or running one search per target.
+
+        Args:
+            start_id: Id of the start vertex.
+            target_counts: An int array of the number of targets at each vertex, indexed by vertex id.
+            k: The number of targets to find.
+            prev: An int array to fill with the previous vertex id of each vertex reached (left unchanged for the
+                others), so the paths to the targets found can be rebuilt. Defaults to None, not recorded.
+
+        Returns:
+            A tuple of an int64 array of the vertex ids holding the nearest targets, closest first, and a float64 array
+            of their distances. Fewer than k targets are covered if not enough can be reached.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+
+        pq = MinHeap(targets.size + 1)
+        distances = np.full(self.get_size(), np.inf, dtype=np.float64)
+        settled = np.zeros(self.get_size(), dtype=bool)
+        found_ids = np.empty(min(k, self.get_size()), dtype=np.int64)
+        found_count = 0
+        targets_found = 0
+        distances[start_id] = 0
+        pq.add(0, start_id)
+
+        while pq.get_count() > 0 and targets_found < k:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            if settled[vertex_id]:
+                continue
+            settled[vertex_id] = True
+
+            if target_counts[vertex_id] > 0:
+                found_ids[found_count] = vertex_id
+                found_count += 1
+                targets_found += target_counts[vertex_id]
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                alt = current_distance + weights[i]
+                if alt < distances[neighbour_id]:
+                    distances[neighbour_id] = alt
+                    pq.add(alt, neighbour_id)
+                    if prev is not None:
+                        prev[neighbour_id] = vertex_id
+
+        found_ids = found_ids[:found_count]
+        return found_ids, distances[found_ids]
+
+    def within_distance(self, start_id: int, max_distance: float) -> tuple[np.ndarray, np.ndarray]:
+        """Find every vertex within a distance of a start vertex, with one Dijkstra search that stops at the limit.
+
+        Distances are kept in the calling thread's search arrays, only trusted where stamped with this search's epoch,
+        so nothing of size V is allocated or cleared. The search costs O(E' log E') for the E' edges leaving the
+        vertices found, however large the rest of the graph is.
+
+        Args:
+            start_id: Id of the start vertex.
+            max_distance: The furthest distance to search.
+
+        Returns:
+            A tuple of an int64 array of the ids of the vertices found, closest first, and a float64 array of their
+            distances.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        stamps, epoch = self._begin_search()
+        distances = self.search_state.distances
+
+        pq = MinHeap(16, growable=True)
+        found_ids = np.empty(16, dtype=np.int64)
+        found_count = 0
+        stamps[start_id] = epoch
+        distances[start_id] = 0
+        pq.add(0, start_id)
+
+        while pq.get_count() > 0:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            # Skip stale entries for vertices already settled at a shorter distance
+            if current_distance > distances[vertex_id]:
+                continue
+            if found_count == found_ids.size:
+                found_ids = np.concatenate((found_ids, np.empty(found_ids.size, dtype=np.int64)))
+            found_ids[found_count] = vertex_id
+            found_count += 1
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                alt = current_distance + weights[i]
+                if alt <= max_distance and (stamps[neighbour_id] != epoch or alt < distances[neighbour_id]):
+                    stamps[neighbour_id] = epoch
+                    distances[neighbour_id] = alt
+                    pq.add(alt, neighbour_id)
+
+        found_ids = found_ids[:found_count]
+        return found_ids, distances[found_ids]
+
+    def k_shortest_paths(self, start_id: int, end_id: int, k: int,
+                         tree: tuple[np.ndarray, np.ndarray] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Find the k shortest loopless paths between two vertices with Yen's algorithm.
+
+        Each path after the first is the cheapest deviation from an earlier one: for every vertex on the last path
+        found, a spur search finds the shortest way to the end that leaves the path there, avoids the vertices before
+        it and doesn't take the next edge of any path already found with the same start.
+
+        One shortest path tree towards the end is built first and shared by every spur search. Its distances are exact
+        lower bounds once vertices and edges are removed, so each spur search is an A* search guided by them, and it
+        stops at the first vertex whose path in the tree avoids the removed vertices, as that path is already the
+        shortest from there. Most spur searches therefore settle only a few vertices.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+            k: The number of paths to find.
+            tree: The (distances, previous vertex ids) of a Dijkstra search from the end over this snapshot, if one
+                has already been run. Defaults to None, running the search.
+
+        Returns:
+            A tuple of a float64 array of the path distances, shortest first, and an array of the paths, each an int64
+            array of vertex ids. Fewer than k paths are returned if not enough exist, and none if the end can't be
+            reached.
+        """
+        size = self.get_size()
+        # The graph is undirected, so a search from the end gives each vertex's distance to the end, and its previous
+        # vertex in that search is its next hop towards the end
+        to_end, next_hop = tree if tree is not None else self.dijkstra(end_id)
+        if to_end[start_id] == np.inf:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=object)
+
+        distances = np.empty(k, dtype=np.float64)
+        paths = np.empty(k, dtype=object)
+        distances[0] = to_end[start_id]
+        paths[0] = reconstruct_path_ids(next_hop, start_id)[::-1]
+        found = 1
+
+        candidate_distances = np.empty(16, dtype=np.float64)
+        candidate_paths = np.empty(16, dtype=object)
+        candidate_count = 0
+        # Per spur search state, stamped with the search number so it never needs clearing
+        search = {
+            "stamp": np.zeros(size, dtype=np.int64),
+            "blocked": np.zeros(size, dtype=np.int64),
+            "settled": np.zeros(size, dtype=np.int64),
+            "distances": np.empty(size, dtype=np.float64),
+            "prev": np.empty(size, dtype=np.int64),
+            "checked": np.zeros(size, dtype=np.int64),
+            "free": np.zeros(size, dtype=bool),
+            "walk": np.empty(size, dtype=np.int64),
+        }
+        search_number = 0
+        shared = np.empty(k, dtype=np.int64)
+
+        while found < k:
+            last_path = paths[found - 1]
+            last_costs = self._path_costs(last_path)
+            # The length of the start each path found shares with the last path
+            for j in range(found):
+                common = min(paths[j].size, last_path.size)
+                differs = np.flatnonzero(paths[j][:common] != last_path[:common])
+                shared[j] = differs[0] if differs.size else common
+
+            for i in range(last_path.size - 1):
+                search_number += 1
+                # Remove the vertices up to the spur vertex, and the next edge of each path sharing them
+                search["blocked"][last_path[:i + 1]] = search_number
+                excluded = np.array([paths[j][i + 1] for j in range(found) if shared[j] > i], dtype=np.int64)
+                spur_distance, spur_path = self._spur_path(last_path[i], end_id, excluded, to_end, next_hop, search,
+                                                           search_number)
+                if spur_path is None:
+                    continue
+
+                distance = last_costs[i] + spur_distance
+                path = np.concatenate((last_path[:i], spur_path))
+                # The same deviation can be found from more than one earlier path, so skip it if already a candidate
+                tolerance = 1e-9 * max(1.0, distance)
+                same = np.flatnonzero(np.abs(candidate_distances[:candidate_count] - distance) <= tolerance)
+                if any(np.array_equal(candidate_paths[j], path) for j in same):
+                    continue
+                if candidate_count == candidate_distances.size:
+                    candidate_distances = np.concatenate((candidate_distances, np.empty(candidate_count)))
+                    candidate_paths = np.concatenate((candidate_paths, np.empty(candidate_count, dtype=object)))
+                candidate_distances[candidate_count] = distance
+                candidate_paths[candidate_count] = path
+                candidate_count += 1
+
+            if candidate_count == 0:
+                break
+            best = int(np.argmin(candidate_distances[:candidate_count]))
+            if candidate_distances[best] == np.inf:
+                break
+            distances[found] = candidate_distances[best]
+            paths[found] = candidate_paths[best]
+            found += 1
+            # Taken candidates are kept at infinity rather than removed, so indexes stay stable
+            candidate_distances[best] = np.inf
+
+        return distances[:found], paths[:found]
+
+    def _spur_path(self, spur_id: int, end_id: int, excluded: np.ndarray, to_end: np.ndarray, next_hop: np.ndarray,
+                   search: dict, search_number: int) -> tuple[float, np.ndarray | None]:
+        """Find the shortest path from a spur vertex to the end avoiding blocked vertices, for k_shortest_paths.
+
+        Args:
+            spur_id: Id of the spur vertex.
+            end_id: Id of the end vertex.
+            excluded: An int64 array of the neighbours the path can't go to first.
+            to_end: The distance of each vertex to the end, with nothing removed.
+            next_hop: The next vertex id on each vertex's shortest path to the end (-1 for the end).
+            search: The stamped search arrays of k_shortest_paths. Vertices stamped in "blocked" can't be used.
+            search_number: The stamp of this search.
+
+        Returns:
+            A tuple of the distance and vertex ids of the path, or (inf, None) if the end can't be reached.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        stamp = search["stamp"]
+        blocked = search["blocked"]
+        settled = search["settled"]
+        distances = search["distances"]
+        prev = search["prev"]
+
+        pq = MinHeap(targets.size + 1)
+        stamp[spur_id] = search_number
+        distances[spur_id] = 0
+        prev[spur_id] = -1
+        pq.add(to_end[spur_id], spur_id)
+
+        while pq.get_count() > 0:
+            vertex_id = pq.remove().get_value()
+            if settled[vertex_id] == search_number:
+                continue
+            settled[vertex_id] = search_number
+            current_distance = distances[vertex_id]
+
+            # Stop if the rest of the vertex's shortest path to the end is still open. Its distance is a lower bound
+            # for every path through the vertices left to search, so no other path can be shorter.
+            if vertex_id == end_id or ((vertex_id != spur_id or next_hop[vertex_id] not in excluded)
+                                       and self._tree_path_free(next_hop[vertex_id], end_id, next_hop, search,
+                                                                search_number)):
+                path = np.concatenate((reconstruct_path_ids(prev, vertex_id)[:-1],
+                                       reconstruct_path_ids(next_hop, vertex_id)[::-1]))
+                # With roads of length 0 the two halves can meet, which would leave a loop, so keep searching
+                if np.unique(path).size == path.size:
+                    return current_distance + to_end[vertex_id], path
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                if blocked[neighbour_id] == search_number or to_end[neighbour_id] == np.inf:
+                    continue
+                if vertex_id == spur_id and neighbour_id in excluded:
+                    continue
+                alt = current_distance + weights[i]
+                if stamp[neighbour_id] != search_number or alt < distances[neighbour_id]:
+                    stamp[neighbour_id] = search_number
+                    distances[neighbour_id] = alt
+                    prev[neighbour_id] = vertex_id
+                    pq.add(alt + to_end[neighbour_id], neighbour_id)
+
+        return np.inf, None
+
+    def _tree_path_free(self, vertex_id: int, end_id: int, next_hop: np.ndarray, search: dict,
+                        search_number: int) -> bool:
+        """Check if a vertex's shortest path to the end avoids every blocked vertex, for _spur_path.
+
+        The answer is recorded for each vertex walked, so later checks in the same search stop where they join a path
+        already checked.
+
+        Args:
+            vertex_id: Id of the vertex.
+            end_id: Id of the end vertex.
+            next_hop: The next vertex id on each vertex's shortest path to the end (-1 for the end).
+            search: The stamped search arrays of k_shortest_paths.
+            search_number: The stamp of this search.
+
+        Returns:
+            True if no vertex on the path is blocked, False otherwise.
+        """
+        blocked = search["blocked"]
+        checked = search["checked"]
+        free = search["free"]
+        walk = search["walk"]
+        walked = 0
+        while True:
+            if vertex_id == end_id:
+                is_free = True
+                break
+            if blocked[vertex_id] == search_number:
+                is_free = False
+                break
+            if checked[vertex_id] == search_number:
+                is_free = bool(free[vertex_id])
+                break
+            walk[walked] = vertex_id
+            walked += 1
+            vertex_id = next_hop[vertex_id]
+        checked[walk[:walked]] = search_number
+        free[walk[:walked]] = is_free
+        return is_free
+
+    def _path_costs(self, path_ids: np.ndarray) -> np.ndarray:
+        """Get the distance along a path to each of its vertices.
+
+        Args:
+            path_ids: An int64 array of the vertex ids on the path.
+
+        Returns:
+            A float64 array of the distance from the start of the path to each vertex on it.
+        """
+        costs = np.zeros(path_ids.size, dtype=np.float64)
+        for i in range(1, path_ids.size):
+            costs[i] = costs[i - 1] + self.weights[self.find_edge(path_ids[i - 1], path_ids[i])]
+        return costs
+
+    def bidirectional_dijkstra(self, start_id: int, end_id: int) -> tuple[float, np.ndarray, int]:
+        """Run Dijkstra's algorithm from both ends at once, stopping once the two searches have met on a shortest path.
+
+        Each step expands whichever search has the closer frontier. Every edge scanned that reaches a vertex already
+        labelled by the other search gives a candidate path length mu; the search stops once the two frontier
+        distances add up to at least mu, as no path found later could be shorter.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+
+        Returns:
+            A tuple of the shortest distance (inf if there is no path), the path vertex ids (empty if there is no
+            path) and the number of vertices settled by both searches together.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        size = self.get_size()
+
+        # Index 0 holds the forward search (from the start), index 1 the backward search (from the end)
+        distances = (np.full(size, np.inf, dtype=np.float64), np.full(size, np.inf, dtype=np.float64))
+        prev = (np.full(size, -1, dtype=np.int64), np.full(size, -1, dtype=np.int64))
+        queues = (MinHeap(targets.size + 1), MinHeap(targets.size + 1))
+        distances[0][start_id] = 0
+        distances[1][end_id] = 0
+        queues[0].add(0, start_id)
+        queues[1].add(0, end_id)
+
+        best = np.inf if start_id != end_id else 0.0
+        meet_forward = meet_backward = start_id
+        settled = 0
+
+        while queues[0].get_count() > 0 and queues[1].get_count() > 0:
+            forward_top = queues[0].peek().get_priority()
+            backward_top = queues[1].peek().get_priority()
+            if forward_top + backward_top >= best:
+                break
+
+            side = 0 if forward_top <= backward_top else 1
+            own_distances = distances[side]
+            other_distances = distances[1 - side]
+            current_entry = queues[side].remove()
+            current_distance = current_entry.get_priority()
+            vertex_id = current_entry.get_value()
+            if current_distance > own_distances[vertex_id]:
+                continue
+            settled += 1
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                alt = current_distance + weights[i]
+                if alt < own_distances[neighbour_id]:
+                    prev[side][neighbour_id] = vertex_id
+                    own_distances[neighbour_id] = alt
+                    queues[side].add(alt, neighbour_id)
+                # The edge joins the two searches, check if it gives a shorter start-end path
+                through = alt + other_distances[neighbour_id]
+                if through < best:
+                    best = through
+                    if side == 0:
+                        meet_forward, meet_backward = vertex_id, neighbour_id
+                    else:
+                        meet_forward, meet_backward = neighbour_id, vertex_id
+
+        if best == np.inf:
+            return best, np.empty(0, dtype=np.int64), settled
+
+        # Splice the forward path to the meeting edge with the reversed backward path from it
+        forward_path = reconstruct_path_ids(prev[0], meet_forward)
+        backward_path = reconstruct_path_ids(prev[1], meet_backward)[::-1]
+        if meet_forward == meet_backward:
+            backward_path = backward_path[1:]
+        return float(best), np.concatenate((forward_path, backward_path)), settled
+
+    def get_heuristic_scale(self) -> float:
+        """Get the largest factor that keeps straight-line distance a lower bound on road distance.
+
+        This is the smallest weight / straight-line length over all edges. Scaling by it keeps the A* heuristic
+        admissible and consistent, whatever units the edge weights are in.
+
+        Returns:
+            The heuristic scale. 0 if any vertex is missing coordinates (a path through it could beat the straight-line
+            bound), which makes A* behave like Dijkstra's algorithm.
+        """
+        if self.heuristic_scale is None:
+            # A mapped snapshot has no deleted vertices
+            live = np.not_equal(self.labels, None) if self.labels is not None else slice(None)
+            rows = np.repeat(np.arange(self.get_size()), np.diff(self.offsets))
+            lengths = np.hypot(*(self.coordinates[rows] - self.coordinates[self.targets]).T)
+            apart = lengths > 0
+            if np.any(np.isnan(self.coordinates[live])) or not np.any(apart):
+                self.heuristic_scale = 0.0
+            else:
+                self.heuristic_scale = float(np.min(self.weights[apart] / lengths[apart]))
+        return self.heuristic_scale
+
+    def astar(self, start_id: int, end_id: int, heuristic: np.ndarray = None) -> tuple[float, np.ndarray, int]:
+        """Run an A* search from the start to the end vertex, guided by the scaled straight-line distance to the end.
+
+        If any vertex is missing coordinates the heuristic is 0 throughout, and the search is Dijkstra's algorithm.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+            heuristic: A float64 array of a consistent lower bound on each vertex's distance to the end, indexed by
+                vertex id, e.g. from Landmarks.lower_bounds. Defaults to None, the straight-line distance.
+
+        Returns:
+            A tuple of the shortest distance (inf if there is no path), the path vertex ids (empty if there is no
+            path) and the number of vertices settled.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+
+        if heuristic is None:
+            # Heuristic for every vertex, computed in one vectorised step
+            heuristic = self.get_heuristic_scale() * np.hypot(*(self.coordinates - self.coordinates[end_id]).T)
+            # Deleted vertex ids have no coordinates
+            heuristic[np.isnan(heuristic)] = 0
+
+        pq = MinHeap(targets.size + 1)
+        prev = np.full(self.get_size(), -1, dtype=np.int64)
+        distances = np.full(self.get_size(), np.inf, dtype=np.float64)
+        distances[start_id] = 0
+        pq.add(heuristic[start_id], start_id)
+        settled = 0
+
+        while pq.get_count() > 0:
+            current_entry = pq.remove()
+            vertex_id = current_entry.get_value()
+            current_distance = distances[vertex_id]
+            # Skip stale entries, queued before a shorter distance to the vertex was found
+            if current_entry.get_priority() > current_distance + heuristic[vertex_id]:
+                continue
+            settled += 1
+            if vertex_id == end_id:
+                return float(current_distance), reconstruct_path_ids(prev, end_id), settled
+
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                alt = current_distance + weights[i]
+                if alt < distances[neighbour_id]:
+                    prev[neighbour_id] = vertex_id
+                    distances[neighbour_id] = alt
+                    pq.add(alt + heuristic[neighbour_id], neighbour_id)
+
+        return np.inf, np.empty(0, dtype=np.int64), settled
+
+    def is_path(self, start_id: int, end_id: int) -> bool:
+        """Perform a breadth-first search and check if a path exists between two vertices.
+
+        Args:
+            start_id: Id of the start vertex.
+            end_id: Id of the end vertex.
+
+        Returns:
+            True if a path exists, False otherwise.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        # A vertex is visited in this search if its stamp equals this search's epoch, so nothing needs clearing
+        stamps, epoch = self._begin_search()
+        q = Queue()
+
+        stamps[start_id] = epoch
+        q.enqueue(start_id)
+        while not q.is_empty():
+            vertex_id = q.dequeue()
+            for i in range(offsets[vertex_id], offsets[vertex_id + 1]):
+                neighbour_id = targets[i]
+                if neighbour_id == end_id:
+                    return True
+                if stamps[neighbour_id] != epoch:
+                    stamps[neighbour_id] = epoch
+                    q.enqueue(neighbour_id)
+        return False
+
+    def _begin_search(self) -> tuple[np.ndarray, int]:
+        """Start a search with the calling thread's visited array, in O(1) rather than O(V) to clear it.
+
+        Returns:
+            A tuple of the thread's int64 stamp array (indexed by vertex id) and the epoch of the new search. The
+            thread's distance array (search_state.distances) is only meaningful where stamped with the epoch.
+        """
+        state = self.search_state
+        if not hasattr(state, "stamps"):
+            state.stamps = np.zeros(self.get_size(), dtype=np.int64)
+            state.distances = np.empty(self.get_size(), dtype=np.float64)
+            state.epoch = 0
+        state.epoch += 1
+        return state.stamps, state.epoch
+
+    def to_dense(self) -> np.ndarray:
+        """Build the weighted adjacency matrix of the snapshot in O(V^2 + E).
+
+        Returns:
+            A V x V float64 array indexed by vertex id, holding edge weights and 0 where there is no edge.
+        """
+        size = self.get_size()
+        matrix = np.zeros((size, size), dtype=np.float64)
+        # Row of each CSR entry is the vertex whose neighbour list it falls in
+        rows = np.repeat(np.arange(size), np.diff(self.offsets))
+        matrix[rows, self.targets] = self.weights
+        return matrix
+
+
+def reconstruct_path_ids(prev: np.ndarray, end_id: int) -> np.ndarray:
+    """Reconstruct the vertex ids on a path by following previous vertex ids back from the end vertex.
+
+    Args:
+        prev: Array of previous vertex ids, indexed by vertex id (-1 for the start vertex).
+        end_id: The id of the end vertex.
+
+    Returns:
+        An int64 array of vertex ids from the start to the end vertex.
+    """
+    length = 0
+    current = end_id
+    while current != -1:
+        length += 1
+        current = prev[current]
+
+    path = np.empty(length, dtype=np.int64)
+    current = end_id
+    for i in range(length - 1, -1, -1):
+        path[i] = current
+        current = prev[current]
+    return path
@@ -0,0 +1,114 @@
+"""
+LRUCache.py
+
+This file contains the LRUCache class, a bounded cache that evicts the least recently used entry when full.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+from LinkedList import LinkedList
+from VertexHashTable import VertexHashTable
+
+
+class LRUCache:
+    """
+    A class to represent a least recently used (LRU) cache.
+    The recency order is kept in a linked list (least recent at the head), and a hash table maps each key to its
+    linked list node, so get, put and remove are all O(1).
+    Every entry is tagged with the generation it was cached in, so invalidate() can expire all entries in O(1); stale
+    entries are dropped when they are next looked up.
+    Attributes:
+        capacity: The maximum number of entries held.
+        entries: A VertexHashTable mapping each key to its node in the recency list.
+        recency: A LinkedList of (key, value, generation) tuples, least recently used first.
+        generation: The current generation. Entries from earlier generations are treated as missing.
+        hits: The number of lookups that found a current entry.
+        misses: The number of lookups that found no entry, or only a stale one.
+        evictions: The number of entries evicted to make room for new ones.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1")
+        self.capacity = capacity
+        self.entries = VertexHashTable()
+        self.recency = LinkedList()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.recency)
+
+    def get(self, key):
+        """
+        Return the value cached against the key (marking it as most recently used), or None if it is not cached.
+        """
+        node = self.entries.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        # An entry cached before the last invalidate() is dropped rather than returned
+        if node.get_value()[2] != self.generation:
+            self.recency.remove_node(node)
+            self.entries.remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Move the node to the tail (most recently used)
+        self.recency.remove_node(node)
+        self.recency.insert_node_last(node)
+        return node.get_value()[1]
+
+    def put(self, key, value):
+        """
+        Cache the value against the key, evicting the least recently used entry if the cache is full.
+        """
+        node = self.entries.get(key)
+        if node is not None:
+            self.recency.remove_node(node)
+        elif len(self.recency) == self.capacity:
+            evicted_key, _, evicted_generation = self.recency.remove_first()
+            self.entries.remove(evicted_key)
+            # Dropping an already stale entry is not counted as an eviction
+            if evicted_generation == self.generation:
+                self.evictions += 1
+        self.entries.put(key, self.recency.insert_last((key, value, self.generation)))
+
+    def remove(self, key):
+        """
+        Remove the key from the cache if present.
+        """
+        node = self.entries.get(key)
+        if node is not None:
+            self.recency.remove_node(node)
+            self.entries.remove(key)
+
+    def items(self) -> list:
+        """
+        Return a list of the current (key, value) pairs, least recently used first, without affecting their recency.
+        """
+        generation = self.generation
+        return [node.get_value()[:2] for node in self.recency if node.get_value()[2] == generation]
+
+    def invalidate(self):
+        """
+        Expire every entry in O(1) by starting a new generation.
+        """
+        self.generation += 1
+
+    def get_stats(self) -> dict:
+        """
+        Return the hit, miss and eviction counters and the number of entries held.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self)}
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        self.entries = VertexHashTable()
+        self.recency = LinkedList()
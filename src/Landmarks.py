@@ -0,0 +1,162 @@
+"""
+Landmarks.py
+
+This file contains the Landmarks class, the precomputed distances to a few landmark vertices used by the ALT search to
+bound how far every vertex is from the end of a route.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+
+import numpy as np
+
+from GraphCSR import GraphCSR
+
+
+class Landmarks:
+    """A class to represent the shortest distances from every vertex to a set of landmark vertices.
+
+    By the triangle inequality, for any landmark L the distance between vertices v and t is at least
+    |d(v, L) - d(t, L)|. The largest of these bounds over all landmarks is an admissible and consistent A* heuristic
+    (ALT: A*, landmarks and the triangle inequality) that needs no coordinates. Landmarks on the far edges of the graph
+    give the tightest bounds, so they are picked by farthest-point selection.
+
+    Attributes:
+        version: The graph version the landmarks were built from.
+        landmark_ids: An int64 array of the vertex id of each landmark.
+        distances: A V x k float32 array of the distance from each vertex (by id) to each landmark (inf if it can't
+            reach the landmark).
+    """
+
+    def __init__(self, version: int, landmark_ids: np.ndarray, distances: np.ndarray):
+        """Initialize a Landmarks object.
+
+        Args:
+            version: The graph version the landmarks were built from.
+            landmark_ids: The vertex id of each landmark.
+            distances: The distance from each vertex to each landmark.
+        """
+        self.version = version
+        self.landmark_ids = landmark_ids
+        self.distances = distances
+
+    @classmethod
+    def from_csr(cls, csr: GraphCSR, count: int) -> "Landmarks":
+        """Pick landmarks by farthest-point selection and find every vertex's distance to them, with one Dijkstra
+        search per landmark.
+
+        The first landmark is the vertex farthest from an arbitrary vertex, and each next one is the vertex farthest
+        from all the landmarks picked so far. A vertex that can't reach any landmark yet counts as farthest, so every
+        connected component gets a landmark while there are landmarks left.
+
+        Args:
+            csr: The CSR snapshot of the graph.
+            count: The number of landmarks to pick (fewer if the graph has fewer vertices).
+
+        Returns:
+            The Landmarks of the snapshot.
+
+        Raises:
+            ValueError: If count is less than 1.
+        """
+        if count < 1:
+            raise ValueError("Number of landmarks must be at least 1.")
+        # Deleted vertex ids can't be landmarks
+        live = np.not_equal(csr.labels, None) if csr.labels is not None else np.ones(csr.get_size(), dtype=bool)
+        count = min(count, int(np.count_nonzero(live)))
+        landmark_ids = np.empty(count, dtype=np.int64)
+        distances = np.empty((csr.get_size(), count), dtype=np.float32)
+        if count == 0:
+            return cls(csr.version, landmark_ids, distances)
+
+        # The distance from each vertex to its nearest landmark so far
+        nearest = np.where(live, np.inf, -np.inf)
+        farthest_id = int(np.argmax(live))
+        first_distances = csr.dijkstra(farthest_id)[0]
+        reached = live & np.isfinite(first_distances)
+        farthest_id = int(np.argmax(np.where(reached, first_distances, -np.inf)))
+        for i in range(count):
+            landmark_ids[i] = farthest_id
+            landmark_distances = csr.dijkstra(farthest_id)[0]
+            distances[:, i] = landmark_distances
+            np.minimum(nearest, landmark_distances, out=nearest, where=live)
+            farthest_id = int(np.argmax(nearest))
+        return cls(csr.version, landmark_ids, distances)
+
+    def get_count(self) -> int:
+        """Get the number of landmarks.
+
+        Returns:
+            The number of landmarks.
+        """
+        return self.landmark_ids.size
+
+    def lower_bounds(self, end_id: int) -> np.ndarray:
+        """Find a lower bound on the distance from every vertex to an end vertex, one vectorised step per landmark.
+
+        Args:
+            end_id: Id of the end vertex.
+
+        Returns:
+            A float64 array of the bound for each vertex, indexed by vertex id (inf where the vertex can't reach the
+            end).
+        """
+        bounds = np.zeros(self.distances.shape[0], dtype=np.float64)
+        for i in range(self.get_count()):
+            to_landmark = self.distances[:, i].astype(np.float64)
+            end_to_landmark = float(self.distances[end_id, i])
+            if end_to_landmark == np.inf:
+                # The end can't reach this landmark, so every vertex that can reach it can't reach the end either.
+                # Vertices that can't reach it are told nothing.
+                bound = np.where(np.isfinite(to_landmark), np.inf, 0)
+            else:
+                # The distances are rounded to float32, so take off their largest rounding error to keep the bound
+                # admissible
+                rounding = (to_landmark + end_to_landmark) * np.finfo(np.float32).eps
+                # A vertex that can't reach the landmark when the end can is in another component, so is infinitely far
+                rounding[np.isinf(rounding)] = 0
+                bound = np.abs(to_landmark - end_to_landmark) - rounding
+            np.maximum(bounds, bound, out=bounds)
+        return bounds
+
+    def save(self, path: str, order: np.ndarray = None) -> None:
+        """Save the landmarks as .npy files in a snapshot directory, so they can be loaded or mapped with it.
+
+        Args:
+            path: Path of the snapshot directory (created if it doesn't exist).
+            order: The id of the vertex saved in each position, when the snapshot renumbers the vertices (see
+                Graph.save). Defaults to None, keeping the ids.
+        """
+        landmark_ids = self.landmark_ids
+        distances = self.distances
+        if order is not None:
+            saved_ids = np.full(max(int(np.max(order, initial=-1)) + 1, 1), -1, dtype=np.int64)
+            saved_ids[order] = np.arange(order.size)
+            landmark_ids = saved_ids[landmark_ids]
+            distances = distances[order]
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "landmark_ids.npy"), landmark_ids)
+        np.save(os.path.join(path, "landmark_distances.npy"), distances)
+
+    @classmethod
+    def load(cls, path: str, version: int = 0, mmap_mode: str = None) -> "Landmarks | None":
+        """Load landmarks saved with save.
+
+        Args:
+            path: Path of the snapshot directory.
+            version: The graph version to give the landmarks. Defaults to 0.
+            mmap_mode: Passed to numpy.load, e.g. "r" to map the distances rather than read them. Defaults to None.
+
+        Returns:
+            The loaded Landmarks, or None if the snapshot has none.
+        """
+        distances_path = os.path.join(path, "landmark_distances.npy")
+        if not os.path.exists(distances_path):
+            return None
+        distances = np.load(distances_path, mmap_mode=mmap_mode)
+        if mmap_mode is not None:
+            distances = distances.view(np.ndarray)
+        return cls(version, np.load(os.path.join(path, "landmark_ids.npy")), distances)
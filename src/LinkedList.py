@@ -179,6 +179,8 @@ class LinkedList:
         Insert a new node at the beginning of the linked list
         Args:
             value: The value of the new node.
+        Returns:
+            The new node, so callers can keep it for O(1) removal with remove_node.
         """
         new_node = ListNode(value)
 
@@ -192,6 +194,7 @@ class LinkedList:
             self.head.set_prev(new_node)
             self.head = new_node
         self.count += 1
+        return new_node
 
     def insert_before(self, value: any, find_index: int):
         """
@@ -199,12 +202,13 @@ class LinkedList:
         Args:
             value: The value of the new node.
             find_index: The index of the node to insert the new node before.
+        Returns:
+            The new node, so callers can keep it for O(1) removal with remove_node.
         """
         new_node = ListNode(value)
         if self.is_empty():
             print("List is empty.")
-            self.insert_first(value)
-            return
+            return self.insert_first(value)
 
         else:
             cn = self.head
@@ -227,6 +231,7 @@ class LinkedList:
                         prev_node.set_next(new_node)
                     cn.set_prev(new_node)
             self.count += 1
+            return new_node
 
 
     def insert_last(self, value: any):
@@ -234,6 +239,8 @@ class LinkedList:
         Insert a new node at the end of the linked list.
         Args:
             value: The value of the new node.
+        Returns:
+            The new node, so callers can keep it for O(1) removal with remove_node.
         """
         new_node = ListNode(value)
 
@@ -246,6 +253,7 @@ class LinkedList:
             new_node.set_prev(self.tail)
             self.tail = new_node
         self.count += 1
+        return new_node
 
     def is_empty(self) -> bool:
         """
@@ -339,6 +347,39 @@ class LinkedList:
                 print("Index not found.")
             self.count -= 1
 
+    def remove_node(self, node: ListNode):
+        """
+        Remove the given node from the linked list in O(1), using its prev/next pointers.
+        Args:
+            node: The node to remove. Must belong to this linked list.
+        """
+        if node is self.head:
+            self.remove_first()
+        elif node is self.tail:
+            self.remove_last()
+        else:
+            node.get_prev().set_next(node.get_next())
+            node.get_next().set_prev(node.get_prev())
+            self.count -= 1
+        node.set_next(None)
+        node.set_prev(None)
+        return node.get_value()
+
+    def insert_node_last(self, node: ListNode):
+        """
+        Insert an existing (unlinked) node at the end of the linked list, so it can be moved without reallocating.
+        Args:
+            node: The node to insert.
+        """
+        node.set_next(None)
+        node.set_prev(self.tail)
+        if self.is_empty():
+            self.head = node
+        else:
+            self.tail.set_next(node)
+        self.tail = node
+        self.count += 1
+
 
 class ListEmpty(Exception):
     """
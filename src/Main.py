@@ -8,6 +8,8 @@ Author: Jai Dutta
 Student ID: 22073372
 """
 
+import sys
+
 from Graph import *
 from Menu import main_menu
 from VehicleHashTable import *
@@ -15,7 +17,8 @@ from VehicleHashTable import *
 
 def main():
     vehicle_hash_table = VehicleHashTable(50)
-    vehicle_graph = Graph()
+    # Start from a saved graph snapshot if one is given (python Main.py <snapshot directory>)
+    vehicle_graph = Graph.load(sys.argv[1]) if len(sys.argv) > 1 else Graph()
     main_menu(vehicle_graph, vehicle_hash_table)
 
 
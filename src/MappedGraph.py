@@ -0,0 +1,227 @@
+"""
+MappedGraph.py
+
+This file contains the MappedGraph class, a read-only graph that answers queries straight from a snapshot on disk.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import os
+
+import numpy as np
+
+from Graph import GraphVertex, PathNotFound, VertexNotFoundError
+from GraphCSR import GraphCSR, reconstruct_path_ids
+from Landmarks import Landmarks
+
+# The searches that can be selected with the algorithm argument of MappedGraph.dijkstra
+MAPPED_ALGORITHMS = ("dijkstra", "bidirectional", "astar", "alt")
+
+
+class MappedGraph:
+    """A class to represent a read-only graph backed by a snapshot saved with Graph.save.
+
+    Every array is opened with numpy.memmap, so pages are only read from disk as queries touch them, and processes
+    mapping the same snapshot share one copy in the operating system's page cache. No per-vertex objects are kept:
+    the vertices returned by queries are created on demand and have no adjacency lists of their own.
+
+    Attributes:
+        path: Path of the snapshot directory.
+        label_text: A mapped uint8 array of every label's UTF-8 bytes back to back.
+        label_offsets: A mapped int64 array of where each label starts in label_text, indexed by vertex id.
+        search_order: A mapped int64 array of the vertex ids sorted by case-folded label.
+        components: A mapped int64 array of the connected component of each vertex, or None if not saved.
+        csr: A GraphCSR over the mapped offsets, targets, weights and coordinates, used for searches.
+        landmarks: The mapped Landmarks used by the "alt" search, or None if the snapshot has none.
+    """
+
+    def __init__(self, path: str):
+        """Initialize a MappedGraph object by mapping a snapshot.
+
+        Args:
+            path: Path of the snapshot directory.
+        """
+        def open_array(name: str) -> np.ndarray:
+            # View the memmap as a plain array: it still reads the mapped pages, but indexing one element at a time
+            # skips the memmap subclass overhead, which is most of the cost of a search
+            return np.load(os.path.join(path, name + ".npy"), mmap_mode="r").view(np.ndarray)
+
+        self.path = path
+        self.label_text = open_array("label_text")
+        self.label_offsets = open_array("label_offsets")
+        self.search_order = open_array("search_order")
+        components_path = os.path.join(path, "components.npy")
+        self.components = open_array("components") if os.path.exists(components_path) else None
+        self.csr = GraphCSR(0, open_array("offsets"), open_array("targets"), open_array("weights"), None,
+                            open_array("coordinates"))
+        self.landmarks = Landmarks.load(path, mmap_mode="r")
+
+    def get_vertex_count(self) -> int:
+        """Get the vertex count.
+
+        Returns:
+            The number of vertices in the graph.
+        """
+        return self.csr.get_size()
+
+    def get_label(self, vertex_id: int) -> str:
+        """Get the label of a vertex by reading it from the string table.
+
+        Args:
+            vertex_id: The id of the vertex.
+
+        Returns:
+            The label of the vertex.
+        """
+        start = self.label_offsets[vertex_id]
+        end = self.label_offsets[vertex_id + 1]
+        return self.label_text[start:end].tobytes().decode("utf-8")
+
+    def find_vertex(self, label: str) -> GraphVertex | None:
+        """Find a vertex by its label (ignoring case), by binary search over the vertex ids in label order.
+
+        Only O(log V) labels are read, so this is fast even when most of the string table is not in memory.
+
+        Args:
+            label: Label of the vertex to find.
+
+        Returns:
+            A GraphVertex for the found vertex, or None if not found.
+        """
+        vertex_id = self._find_id(label)
+        return self._make_vertex(vertex_id) if vertex_id != -1 else None
+
+    def has_vertex(self, label: str) -> bool:
+        """Check if a vertex exists.
+
+        Args:
+            label: Label of vertex to check.
+
+        Returns:
+            True if the vertex exists, False otherwise.
+        """
+        return self._find_id(label) != -1
+
+    def get_adjacent(self, label: str) -> np.ndarray:
+        """Get adjacent vertices to specified vertex.
+
+        Args:
+            label: Label for the vertex whose adjacent vertices are to be retrieved.
+
+        Returns:
+            An array of tuples, each containing an adjacent vertex and its edge weight.
+
+        Raises:
+            VertexNotFoundError: If the specified vertex is not found.
+        """
+        vertex_id = self._find_id(label)
+        if vertex_id == -1:
+            raise VertexNotFoundError("Location not found.")
+        start = self.csr.offsets[vertex_id]
+        end = self.csr.offsets[vertex_id + 1]
+        adjacent_vertices = np.empty(end - start, dtype=object)
+        for i in range(start, end):
+            adjacent_vertices[i - start] = (self._make_vertex(int(self.csr.targets[i])), float(self.csr.weights[i]))
+        return adjacent_vertices
+
+    def dijkstra(self, start_label: str, end_label: str, algorithm: str = "dijkstra") -> tuple[float, list]:
+        """Find the shortest path between two vertices.
+
+        Args:
+            start_label: Label of the start vertex.
+            end_label: Label of the end vertex.
+            algorithm: The search to run: "dijkstra", "bidirectional", "astar" or "alt", as for Graph.dijkstra. "alt"
+                needs landmarks saved with the snapshot.
+
+        Returns:
+            A tuple containing the distance and the path between the two vertices.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found.
+            PathNotFound: If no path exists between the provided locations.
+            ValueError: If the algorithm is not recognised, or is "alt" and the snapshot has no landmarks.
+        """
+        if algorithm not in MAPPED_ALGORITHMS:
+            raise ValueError(f"Unknown shortest path algorithm '{algorithm}'.")
+        if algorithm == "alt" and self.landmarks is None:
+            raise ValueError("Snapshot was saved without landmarks.")
+        start_id = self._find_id(start_label)
+        end_id = self._find_id(end_label)
+        if start_id == -1 or end_id == -1:
+            raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+
+        if algorithm == "bidirectional":
+            final_distance, path_ids, _ = self.csr.bidirectional_dijkstra(start_id, end_id)
+        elif algorithm == "astar":
+            final_distance, path_ids, _ = self.csr.astar(start_id, end_id)
+        elif algorithm == "alt":
+            final_distance, path_ids, _ = self.csr.astar(start_id, end_id, self.landmarks.lower_bounds(end_id))
+        else:
+            distances, prev = self.csr.dijkstra(start_id, end_id)
+            final_distance = distances[end_id]
+            path_ids = reconstruct_path_ids(prev, end_id) if final_distance != float("inf") else None
+        if final_distance == float("inf"):
+            raise PathNotFound("Path not found between provided locations.")
+        return float(final_distance), [self._make_vertex(int(vertex_id)) for vertex_id in path_ids]
+
+    def is_path(self, start_label: str, end_label: str) -> bool:
+        """Check if a path exists between two vertices.
+
+        Uses the saved connected components (a single comparison) if the snapshot has them, otherwise a breadth-first
+        search.
+
+        Args:
+            start_label: Label of the start vertex.
+            end_label: Label of the end vertex.
+
+        Returns:
+            True if a path exists, False otherwise.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found.
+        """
+        start_id = self._find_id(start_label)
+        end_id = self._find_id(end_label)
+        if start_id == -1 or end_id == -1:
+            raise VertexNotFoundError("Cannot find one or both locations to check for a path.")
+        if self.components is not None:
+            return bool(self.components[start_id] == self.components[end_id])
+        return start_id == end_id or self.csr.is_path(start_id, end_id)
+
+    def _find_id(self, label: str) -> int:
+        """Find the id of a vertex by its label (ignoring case).
+
+        Args:
+            label: Label of the vertex to find.
+
+        Returns:
+            The id of the vertex, or -1 if not found.
+        """
+        key = label.casefold()
+        low = 0
+        high = self.search_order.size
+        # Find the first id in search order whose case-folded label is not less than the key
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_label(self.search_order[middle]).casefold() < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.search_order.size and self.get_label(self.search_order[low]).casefold() == key:
+            return int(self.search_order[low])
+        return -1
+
+    def _make_vertex(self, vertex_id: int) -> GraphVertex:
+        """Create a detached GraphVertex for a vertex of the snapshot.
+
+        Args:
+            vertex_id: The id of the vertex.
+
+        Returns:
+            A GraphVertex with the vertex's label, id and coordinates (and no adjacency list).
+        """
+        coordinates = self.csr.coordinates[vertex_id]
+        return GraphVertex(self.get_label(vertex_id), vertex_id=vertex_id,
+                           coordinates=None if np.isnan(coordinates).any() else tuple(coordinates.tolist()))
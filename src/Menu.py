@@ -11,6 +11,7 @@ import os
 
 import numpy
 from Graph import PathNotFound, VertexExistsError, EdgeExistsError, VertexNotFoundError, EdgeToSameVertex, Graph
+from Dispatch import find_nearest_vehicles
 from Sorting import *
 from Vehicle import *
 from VehicleHashTable import *
@@ -129,7 +130,7 @@ def main_menu(graph, vehicle_hash_table):
 
             # Remove vehicle    
             case 2:
-                remove_vehicle(vehicle_hash_table)
+                remove_vehicle(graph, vehicle_hash_table)
 
             # Update vehicle
             case 3:
@@ -141,11 +142,7 @@ def main_menu(graph, vehicle_hash_table):
 
             # Find nearest vehicle
             case 5:
-                try:
-                    display_vehicles_array(np.array([sort_heap.find_nearest_vehicle(vehicles)]), True)
-                    input("Press Enter to continue..")
-                except VehiclesEmptyException as e:
-                    handle_error(e)
+                find_nearest_vehicle(graph, vehicles, sort_heap)
 
             # Find the highest battery level
             case 6:
@@ -201,16 +198,21 @@ def add_vehicle(vehicle_hash_table: VehicleHashTable):
     input("Press Enter to continue...")
 
 
-def remove_vehicle(vehicle_hash_table: VehicleHashTable):
+def remove_vehicle(graph: Graph, vehicle_hash_table: VehicleHashTable):
     """Removes a vehicle from the hash table.
 
     Args:
+        graph: Graph of the simulation.
         vehicle_hash_table: Hash table of the vehicles in the simulation.
     """
     vehicle_id = input("Enter vehicle ID: ")
 
     try:
+        vehicle = vehicle_hash_table.get(vehicle_id)
         vehicle_hash_table.remove(vehicle_id)
+        # The graph no longer needs to keep the vehicle's route up to date
+        if vehicle.get_route_tree() is not None:
+            graph.untrack_source(vehicle.get_route_tree())
         print(f"{green}{bold}Vehicle removed successfully{end}")
 
     except VehicleNotFoundError as e:
@@ -240,7 +242,6 @@ def update_vehicle(graph: Graph, vehicle_hash_table: VehicleHashTable):
     location_node = graph.find_vertex(location_id)
     if location_node:
         print(f"{green}{bold}Location found{end}")
-        vehicle.set_location(location_node)
     else:
         return handle_error(f"{red}{bold}Location not found{end}")
 
@@ -256,18 +257,23 @@ def update_vehicle(graph: Graph, vehicle_hash_table: VehicleHashTable):
     else:
         return handle_error(f"{red}{bold}Destination not found{end}")
 
-    # Check for path and calculate distance between location
+    # Check for path and calculate distance between location. The shortest path tree from the location is tracked by
+    # the graph, so vehicles leaving the same location share one search and their distances stay correct as roads
+    # are added or removed.
+    route_tree = graph.track_source(location_id)
     try:
-        distance_to_dest, _ = graph.dijkstra(location_id, destination_id)
+        distance_to_dest = route_tree.distance_to(destination_id)
         print(f"{green}{bold}Path from {location_node.get_label()} to {destination_node.get_label()} found with a "
               f"distance of {distance_to_dest}{end}")
     except PathNotFound as e:
+        graph.untrack_source(route_tree)
         return handle_error(e)
 
     # Get new battery level for the vehicle.
     try:
         new_battery_lvl = int(input("Enter battery level (0-100): "))
     except ValueError:
+        graph.untrack_source(route_tree)
         return handle_error(f"{red}{bold}Please enter a valid input.{end}")
 
     try:
@@ -276,8 +282,14 @@ def update_vehicle(graph: Graph, vehicle_hash_table: VehicleHashTable):
         vehicle.set_destination(destination_node)
         vehicle.set_distance_to_destination(distance_to_dest)
     except InvalidBatteryException as e:
+        graph.untrack_source(route_tree)
         return handle_error(e)
 
+    # Swap the vehicle over to the tree from its new location
+    if vehicle.get_route_tree() is not None:
+        graph.untrack_source(vehicle.get_route_tree())
+    vehicle.set_route_tree(route_tree)
+
     print(f"{green}{bold}Vehicle updated successfully{end}")
     input("Press Enter to continue...")
 
@@ -319,6 +331,44 @@ def display_sorted_vehicles(vehicles: numpy.ndarray, sort_heap: VehicleSortHeap)
         return handle_error(f"{red}{bold}No vehicles are in the AVMS.{end}")
 
 
+def find_nearest_vehicle(graph: Graph, vehicles: numpy.ndarray, sort_heap: VehicleSortHeap):
+    """Finds the nearest vehicles, either by road to a pickup location or to their destination.
+
+    Args:
+        graph: Graph of the simulation.
+        vehicles: Array of vehicles to search.
+        sort_heap: Heap to find the vehicle nearest its destination.
+    """
+    try:
+        choice = int(input("Find nearest:"
+                           "\n[1]. Vehicles to a pickup location [By road]"
+                           "\n[2]. Vehicle to its destination"
+                           "\nInput: "))
+    except ValueError:
+        return handle_error(f"{red}{bold}Please enter a valid input.{end}")
+
+    try:
+        if choice == 1:
+            pickup_id = input("Enter pickup location ID: ")
+            k = int(input("Enter number of vehicles to find: "))
+            nearest = find_nearest_vehicles(graph, vehicles, pickup_id, k)
+            if len(nearest) == 0:
+                return handle_error(f"{red}{bold}No vehicles can reach the pickup location.{end}")
+            for vehicle, distance in nearest:
+                display_vehicles_array(np.array([vehicle]), True)
+                print(f"    Distance to Pickup: {distance}")
+            input("Press Enter to continue...")
+
+        elif choice == 2:
+            display_vehicles_array(np.array([sort_heap.find_nearest_vehicle(vehicles)]), True)
+            input("Press Enter to continue..")
+
+        else:
+            return handle_error(f"{red}{bold}Please enter a valid input.{end}")
+    except (VehiclesEmptyException, VertexNotFoundError, ValueError) as e:
+        handle_error(e)
+
+
 def sort_by_distance(vehicles: numpy.ndarray, vehicle_sort_heap: VehicleSortHeap) -> numpy.ndarray:
     """Sorts vehicles by distance to destination.
 
@@ -362,10 +412,18 @@ def add_location(graph: Graph):
     """
     try:
         location_id = input("Enter location ID: ")
-        graph.add_vertex(location_id)
+        # Coordinates are optional, they let routing use A* search
+        coordinates_input = input("Enter coordinates as x,y (leave blank to skip): ").strip()
+        coordinates = None
+        if coordinates_input:
+            x, y = coordinates_input.split(",")
+            coordinates = (float(x), float(y))
+        graph.add_vertex(location_id, coordinates=coordinates)
         print(f"{green}{bold}Location added successfully{end}")
     except VertexExistsError as e:
         return handle_error(e)
+    except ValueError:
+        return handle_error(f"{red}{bold}Please enter coordinates as two numbers separated by a comma.{end}")
     input("Press Enter to continue...")
 
 
@@ -420,10 +478,12 @@ def display_vehicles_array(vehicle_arr: numpy.ndarray, full_info: bool):
         full_info: Boolean indicating whether to print comprehensive info or not.
     """
     for vehicle in vehicle_arr:
+        # Flag vehicles whose location or destination has been deleted, as they need updating
+        stranded = f" {red}[Location deleted]{end}" if vehicle.is_stranded() else ""
         if full_info:
             print(f"{bold}{vehicle}{end} | Battery Level: {vehicle.get_battery_level()}"
                   f" | Location: {vehicle.get_location()}"
                   f" | Destination: {vehicle.get_destination()}"
-                  f" | Distance to Destination: {vehicle.get_distance_to_destination()}")
+                  f" | Distance to Destination: {vehicle.get_distance_to_destination()}{stranded}")
         else:
-            print(f"{bold}{vehicle}{end}")
+            print(f"{bold}{vehicle}{end}{stranded}")
@@ -45,11 +45,13 @@ class MinHeap:
         size: The size of the heap.
         heap: The heap.
         count: The number of elements in the heap.
+        growable: Whether the heap doubles its size when full, rather than raising a HeapFullException.
     """
-    def __init__(self, size: int):
+    def __init__(self, size: int, growable: bool = False):
         self.size = size
         self.heap = np.empty(size, dtype=object)
         self.count = 0
+        self.growable = growable
 
     def add(self, priority: int, value: object):
         """
@@ -59,7 +61,12 @@ class MinHeap:
             value: The value of the entry.
         """
         if self.size == self.count:
-            raise HeapFullException()
+            if not self.growable:
+                raise HeapFullException()
+            heap = np.empty(max(1, self.size * 2), dtype=object)
+            heap[:self.count] = self.heap
+            self.heap = heap
+            self.size = heap.size
 
         new_entry = PriorityQueueEntry(priority, value)
         self.heap[self.count] = new_entry
@@ -105,19 +112,31 @@ class MinHeap:
         """
         Trickle down the heap.
         """
+        heap = self.heap
+        current_entry = heap[current_index]
+        current_priority = current_entry.get_priority()
         left_child_index = current_index * 2 + 1
-        right_child_index = left_child_index + 1
 
-        if left_child_index < num_items:
-            large_index = left_child_index
+        # Move the smaller child up into the hole until the current entry is no larger than both children
+        while left_child_index < num_items:
+            small_index = left_child_index
+            small_priority = heap[left_child_index].get_priority()
 
+            right_child_index = left_child_index + 1
             if right_child_index < num_items:
-                if self.heap[left_child_index].get_priority() > self.heap[right_child_index].get_priority():
-                    large_index = right_child_index
+                right_priority = heap[right_child_index].get_priority()
+                if small_priority > right_priority:
+                    small_index = right_child_index
+                    small_priority = right_priority
 
-            if self.heap[large_index].get_priority() < self.heap[current_index].get_priority():
-                self.heap[large_index], self.heap[current_index] = self.heap[current_index], self.heap[large_index]
-                self.trickle_down(large_index, num_items)
+            if not small_priority < current_priority:
+                break
+
+            heap[current_index] = heap[small_index]
+            current_index = small_index
+            left_child_index = current_index * 2 + 1
+
+        heap[current_index] = current_entry
 
     def display(self):
         """
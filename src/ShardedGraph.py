@@ -0,0 +1,406 @@
+"""
+ShardedGraph.py
+
+This file contains the ShardedGraph class, which splits a graph into regions and answers shortest path queries with
+one worker process per region.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import multiprocessing
+import threading
+
+import numpy as np
+
+from Graph import Graph, PathNotFound, VertexNotFoundError
+from GraphCSR import GraphCSR, reconstruct_path_ids
+from MinHeap import MinHeap
+from Partition import boundary_vertices, partition_graph
+
+# Which kept shortest path tree a worker reads each stretch of a path from: the tree of the query's start, the tree of
+# the query's end (reversed, as the graph is undirected), or the tree of the boundary vertex the stretch starts at
+START_TREE = 0
+END_TREE = 1
+BOUNDARY_TREE = 2
+
+
+class ShardedGraph:
+    """A class to represent a read-only graph split into shards, each searched by its own worker process.
+
+    The snapshot is partitioned into regions. Each worker process holds only the roads inside its region, and starts
+    by finding the distances between every pair of its boundary vertices (those with a road to another region). The
+    coordinator joins these distances and the roads between regions into an overlay graph over just the boundary
+    vertices. A query asks the start and end regions' workers (in parallel) for the distances from the start and end
+    to their boundaries, searches the overlay between them, then has each region on the way fill in its stretch of
+    the path.
+
+    Any shortest path is a run of stretches inside one region, each starting and ending at the query's start or end
+    or at a boundary vertex, joined by roads between regions, so the overlay search finds the exact distance.
+
+    Attributes:
+        graph: The Graph the shards were built from.
+        version: The graph version of the snapshot the shards were built from.
+        vertex_array: The graph's vertices indexed by id, as they were when the shards were built.
+        regions: An int64 array of the region of each vertex, indexed by vertex id.
+        local_ids: An int64 array of each vertex's id within its shard, indexed by vertex id.
+        shard_vertices: An object array of each shard's vertex ids (in local id order).
+        shard_boundaries: An object array of each shard's boundary vertex ids (in the order its worker reports
+            distances to them).
+        boundary_ids: An int64 array of the vertex id of each overlay vertex.
+        overlay_index: An int64 array of the overlay id of each vertex (-1 if not a boundary vertex), indexed by
+            vertex id.
+        overlay: A GraphCSR over the boundary vertices, with the roads between regions and the distances across each
+            region between its boundary vertices as edges.
+        connections: An object array of the pipe to each shard's worker process.
+        processes: An object array of the worker processes.
+        lock: A lock held for each query, as the pipes to the workers can only carry one query at a time.
+    """
+
+    def __init__(self, graph: Graph, shard_count: int):
+        """Initialize a ShardedGraph object by partitioning a graph and starting a worker process per shard.
+
+        Args:
+            graph: The Graph to split.
+            shard_count: The number of shards (and worker processes).
+
+        Raises:
+            ValueError: If shard_count is less than 1.
+        """
+        with graph.lock:
+            csr = graph.get_csr()
+            self.vertex_array = graph.vertex_array[:csr.get_size()].copy()
+        self.graph = graph
+        self.version = csr.version
+        self.regions = partition_graph(csr, shard_count)
+        boundary = boundary_vertices(csr, self.regions)
+        self.boundary_ids = boundary
+        self.overlay_index = np.full(csr.get_size(), -1, dtype=np.int64)
+        self.overlay_index[boundary] = np.arange(boundary.size)
+        self.lock = threading.Lock()
+
+        # Split the snapshot's edges into those inside a region (for the shards) and those between regions
+        rows = np.repeat(np.arange(csr.get_size(), dtype=np.int64), np.diff(csr.offsets))
+        inside = self.regions[rows] == self.regions[csr.targets]
+        self.local_ids = np.empty(csr.get_size(), dtype=np.int64)
+        self.shard_vertices = np.empty(shard_count, dtype=object)
+        self.shard_boundaries = np.empty(shard_count, dtype=object)
+        self.connections = np.empty(shard_count, dtype=object)
+        self.processes = np.empty(shard_count, dtype=object)
+        for shard in range(shard_count):
+            vertex_ids = np.flatnonzero(self.regions == shard)
+            self.local_ids[vertex_ids] = np.arange(vertex_ids.size)
+            self.shard_vertices[shard] = vertex_ids
+            self.shard_boundaries[shard] = boundary[self.regions[boundary] == shard]
+
+            edges = np.flatnonzero(inside & (self.regions[rows] == shard))
+            offsets = np.zeros(vertex_ids.size + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.local_ids[rows[edges]], minlength=vertex_ids.size), out=offsets[1:])
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_shard, daemon=True,
+                                              args=(worker_connection, offsets, self.local_ids[csr.targets[edges]],
+                                                    csr.weights[edges], self.local_ids[self.shard_boundaries[shard]]))
+            process.start()
+            worker_connection.close()
+            self.connections[shard] = connection
+            self.processes[shard] = process
+
+        # The overlay joins each shard's boundary distances (worked out by the workers in parallel) with the roads
+        # between regions
+        overlay_index = self.overlay_index
+        sources = [overlay_index[rows[~inside]]]
+        destinations = [overlay_index[csr.targets[~inside]]]
+        overlay_weights = [csr.weights[~inside]]
+        for shard in range(shard_count):
+            distances = self.connections[shard].recv()
+            shard_overlay_ids = overlay_index[self.shard_boundaries[shard]]
+            pairs = np.isfinite(distances) & ~np.eye(distances.shape[0], dtype=bool)
+            first, second = np.nonzero(pairs)
+            sources.append(shard_overlay_ids[first])
+            destinations.append(shard_overlay_ids[second])
+            overlay_weights.append(distances[first, second])
+        sources = np.concatenate(sources)
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(boundary.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=boundary.size), out=offsets[1:])
+        self.overlay = GraphCSR(self.version, offsets, np.concatenate(destinations)[order],
+                                np.concatenate(overlay_weights)[order], None)
+
+    def __enter__(self) -> "ShardedGraph":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for shard in range(self.connections.size):
+            if self.processes[shard] is not None and self.processes[shard].is_alive():
+                self.connections[shard].send(("close",))
+                self.processes[shard].join()
+            self.connections[shard].close()
+            self.processes[shard] = None
+
+    def get_shard_count(self) -> int:
+        """Get the number of shards.
+
+        Returns:
+            The number of shards.
+        """
+        return self.shard_vertices.size
+
+    def get_boundary_count(self) -> int:
+        """Get the number of boundary vertices, the size of the overlay searched by every query.
+
+        Returns:
+            The number of vertices with a road to another region.
+        """
+        return self.boundary_ids.size
+
+    def dijkstra(self, start_label: str, end_label: str) -> tuple[float, list]:
+        """Find the shortest path between two vertices, searching the shards in their worker processes.
+
+        Args:
+            start_label: Label of the start vertex.
+            end_label: Label of the end vertex.
+
+        Returns:
+            A tuple containing the distance and the path between the two vertices.
+
+        Raises:
+            VertexNotFoundError: If one or both vertices are not found, or were added after the shards were built.
+            PathNotFound: If no path exists between the provided locations.
+        """
+        start_id = self._find_id(start_label)
+        end_id = self._find_id(end_label)
+        if start_id == -1 or end_id == -1:
+            raise VertexNotFoundError("Cannot find one or both locations to perform dijkstra's algorithm")
+        start_shard = self.regions[start_id]
+        end_shard = self.regions[end_id]
+
+        with self.lock:
+            # Ask both ends' workers for their boundary distances before waiting on either, so they search at once.
+            # In the same region, the start's search also finds the distance to the end without leaving the region.
+            same_shard = start_shard == end_shard
+            self.connections[start_shard].send(("distances", self.local_ids[start_id],
+                                                self.local_ids[end_id] if same_shard else -1))
+            self.connections[end_shard].send(("distances", self.local_ids[end_id], -1))
+            start_distances, direct_distance = self.connections[start_shard].recv()
+            end_distances = self.connections[end_shard].recv()[0]
+
+            final_distance, overlay_path = self._search_overlay(start_shard, start_distances, end_shard, end_distances,
+                                                                direct_distance)
+            if final_distance == float("inf"):
+                raise PathNotFound("Path not found between provided locations.")
+            path_ids = self._unpack_path(start_id, end_id, self.boundary_ids[overlay_path])
+        return float(final_distance), [self.vertex_array[vertex_id] for vertex_id in path_ids]
+
+    def _search_overlay(self, start_shard: int, start_distances: np.ndarray, end_shard: int,
+                        end_distances: np.ndarray, direct_distance: float) -> tuple[float, np.ndarray]:
+        """Search the overlay from the start region's boundary to the end region's boundary.
+
+        The search starts from every boundary vertex of the start region at once, at its distance from the start, and
+        stops once the closest vertex left can't beat the best distance to the end found so far.
+
+        Args:
+            start_shard: The region of the start vertex.
+            start_distances: The distance from the start to each boundary vertex of its region.
+            end_shard: The region of the end vertex.
+            end_distances: The distance from the end to each boundary vertex of its region.
+            direct_distance: The distance from the start to the end inside their region (inf if they are in different
+                regions).
+
+        Returns:
+            A tuple of the shortest distance and an int64 array of the overlay ids on the path between the regions'
+            boundaries (empty if the path stays inside one region).
+        """
+        offsets = self.overlay.offsets
+        targets = self.overlay.targets
+        weights = self.overlay.weights
+        distances = np.full(self.boundary_ids.size, np.inf, dtype=np.float64)
+        end_costs = np.full(self.boundary_ids.size, np.inf, dtype=np.float64)
+        prev = np.full(self.boundary_ids.size, -1, dtype=np.int64)
+        end_costs[self.overlay_index[self.shard_boundaries[end_shard]]] = end_distances
+
+        pq = MinHeap(self.boundary_ids.size + 1, growable=True)
+        for overlay_id, distance in zip(self.overlay_index[self.shard_boundaries[start_shard]], start_distances):
+            if distance < distances[overlay_id]:
+                distances[overlay_id] = distance
+                pq.add(distance, overlay_id)
+
+        best_distance = direct_distance
+        best_id = -1
+        while pq.get_count() > 0:
+            current_entry = pq.remove()
+            current_distance = current_entry.get_priority()
+            overlay_id = current_entry.get_value()
+            if current_distance >= best_distance:
+                break
+            if current_distance > distances[overlay_id]:
+                continue
+            if current_distance + end_costs[overlay_id] < best_distance:
+                best_distance = current_distance + end_costs[overlay_id]
+                best_id = overlay_id
+
+            # Each region's boundary vertices are all joined to each other, so relax a vertex's edges as one array
+            neighbour_ids = targets[offsets[overlay_id]:offsets[overlay_id + 1]]
+            alts = current_distance + weights[offsets[overlay_id]:offsets[overlay_id + 1]]
+            shorter = alts < distances[neighbour_ids]
+            neighbour_ids = neighbour_ids[shorter]
+            alts = alts[shorter]
+            prev[neighbour_ids] = overlay_id
+            distances[neighbour_ids] = alts
+            for neighbour_id, alt in zip(neighbour_ids.tolist(), alts.tolist()):
+                pq.add(alt, neighbour_id)
+
+        if best_id == -1:
+            return best_distance, np.empty(0, dtype=np.int64)
+        return best_distance, reconstruct_path_ids(prev, best_id)
+
+    def _unpack_path(self, start_id: int, end_id: int, via_ids: np.ndarray) -> np.ndarray:
+        """Fill in the full path from the boundary vertices it passes through.
+
+        Consecutive vertices in different regions are joined by a road. Each stretch inside one region is found by
+        that region's worker, and every worker finds its stretches at the same time. The first stretch is read from
+        the start's search and the last from the end's search, as a boundary vertex's tree stops once it has reached
+        the rest of the boundary, and may not reach the start or end.
+
+        Args:
+            start_id: The id of the start vertex.
+            end_id: The id of the end vertex.
+            via_ids: The ids of the boundary vertices on the path, in order.
+
+        Returns:
+            An int64 array of the vertex ids on the path.
+        """
+        stops = np.concatenate(([start_id], via_ids, [end_id]))
+        # Each stretch inside a region is a request to that region's worker
+        stretch_shards = self.regions[stops[:-1]]
+        inside = stretch_shards == self.regions[stops[1:]]
+        trees = np.full(stops.size - 1, BOUNDARY_TREE, dtype=np.int64)
+        trees[-1] = END_TREE
+        # A path that stays in one region is a single stretch, found in the start's search (which also reached the end)
+        trees[0] = START_TREE
+        requests = np.empty(self.get_shard_count(), dtype=object)
+        for shard in np.unique(stretch_shards[inside]):
+            stretches = np.flatnonzero(inside & (stretch_shards == shard))
+            requests[shard] = stretches
+            self.connections[shard].send(("paths", self.local_ids[stops[stretches]],
+                                          self.local_ids[stops[stretches + 1]], trees[stretches]))
+
+        stretch_paths = np.empty(stops.size - 1, dtype=object)
+        for shard in range(self.get_shard_count()):
+            if requests[shard] is not None:
+                for stretch, local_path in zip(requests[shard], self.connections[shard].recv()):
+                    stretch_paths[stretch] = self.shard_vertices[shard][local_path]
+
+        # Join the stretches, dropping the vertex each one shares with the stretch before it
+        pieces = [stops[:1]]
+        for i in range(stops.size - 1):
+            pieces.append(stretch_paths[i][1:] if inside[i] else stops[i + 1:i + 2])
+        return np.concatenate(pieces)
+
+    def _find_id(self, label: str) -> int:
+        """Find the id of a vertex by its label, if it was in the graph when the shards were built.
+
+        Args:
+            label: Label of the vertex to find.
+
+        Returns:
+            The id of the vertex, or -1 if not found.
+        """
+        vertex = self.graph.find_vertex(label)
+        if vertex is None or vertex.get_id() >= self.vertex_array.size or \
+                self.vertex_array[vertex.get_id()] is not vertex:
+            return -1
+        return vertex.get_id()
+
+
+def _run_shard(connection, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+               boundary_ids: np.ndarray) -> None:
+    """Serve the searches of one shard, in its worker process, until told to close.
+
+    The worker first sends the distances between every pair of its boundary vertices (inf if one can't reach the other
+    inside the shard), keeping the shortest path tree of each boundary vertex. It then answers requests of
+    ("distances", start id, end id or -1), with the distances from the start to each boundary vertex and to the end,
+    and ("paths", start ids, end ids, trees), with the shortest path of each pair. Every stretch of a path runs
+    between boundary vertices and the start or end of the query, so paths are read from the kept trees (the trees of
+    the last two searches are kept too) without searching again, from the tree each pair names (START_TREE, END_TREE
+    or BOUNDARY_TREE). All ids are local to the shard.
+
+    Args:
+        connection: The worker's end of the pipe to the coordinator.
+        offsets: The CSR offsets of the shard.
+        targets: The CSR targets of the shard.
+        weights: The CSR weights of the shard.
+        boundary_ids: The local ids of the shard's boundary vertices.
+    """
+    csr = GraphCSR(0, offsets, targets, weights, None)
+    boundary_index = np.full(csr.get_size(), -1, dtype=np.int64)
+    boundary_index[boundary_ids] = np.arange(boundary_ids.size)
+
+    boundary_distances = np.empty((boundary_ids.size, boundary_ids.size), dtype=np.float64)
+    boundary_trees = np.full((boundary_ids.size, csr.get_size()), -1, dtype=np.int32)
+    for i, boundary_id in enumerate(boundary_ids):
+        boundary_distances[i] = _boundary_distances(csr, boundary_id, -1, boundary_ids, boundary_index,
+                                                    boundary_trees[i])[0]
+    connection.send(boundary_distances)
+
+    query_ids = np.full(2, -1, dtype=np.int64)
+    query_trees = np.full((2, csr.get_size()), -1, dtype=np.int32)
+    slot = 0
+    while True:
+        request = connection.recv()
+        if request[0] == "distances":
+            # An earlier search from the same vertex is out of date, so only the latest is found by id
+            query_ids[query_ids == request[1]] = -1
+            query_ids[slot] = request[1]
+            query_trees[slot] = -1
+            connection.send(_boundary_distances(csr, request[1], request[2], boundary_ids, boundary_index,
+                                                query_trees[slot]))
+            slot = 1 - slot
+        elif request[0] == "paths":
+            paths = np.empty(request[1].size, dtype=object)
+            for i in range(request[1].size):
+                start_id = request[1][i]
+                end_id = request[2][i]
+                if request[3][i] == START_TREE:
+                    paths[i] = reconstruct_path_ids(query_trees[np.flatnonzero(query_ids == start_id)[0]], end_id)
+                elif request[3][i] == END_TREE:
+                    paths[i] = reconstruct_path_ids(query_trees[np.flatnonzero(query_ids == end_id)[0]], start_id)[::-1]
+                else:
+                    paths[i] = reconstruct_path_ids(boundary_trees[boundary_index[start_id]], end_id)
+            connection.send(paths)
+        else:
+            break
+    connection.close()
+
+
+def _boundary_distances(csr: GraphCSR, start_id: int, end_id: int, boundary_ids: np.ndarray,
+                        boundary_index: np.ndarray, prev: np.ndarray) -> tuple[np.ndarray, float]:
+    """Find the distances from a vertex to each boundary vertex of its shard, and optionally to one other vertex.
+
+    Args:
+        csr: The CSR snapshot of the shard.
+        start_id: The local id of the vertex to search from.
+        end_id: The local id of another vertex to find the distance to, or -1 for none.
+        boundary_ids: The local ids of the shard's boundary vertices.
+        boundary_index: The position of each vertex in boundary_ids (-1 if not a boundary vertex).
+        prev: An array of -1s to fill with the previous vertex id of each vertex reached.
+
+    Returns:
+        A tuple of a float64 array of the distance to each boundary vertex (inf if unreachable inside the shard), and
+        the distance to the end vertex (inf if none or unreachable).
+    """
+    target_counts = np.zeros(csr.get_size(), dtype=np.int64)
+    target_counts[boundary_ids] = 1
+    if end_id != -1:
+        target_counts[end_id] = 1
+    found_ids, found_distances = csr.nearest(start_id, target_counts, int(np.count_nonzero(target_counts)), prev)
+
+    distances = np.full(boundary_ids.size, np.inf, dtype=np.float64)
+    on_boundary = boundary_index[found_ids] != -1
+    distances[boundary_index[found_ids[on_boundary]]] = found_distances[on_boundary]
+    end_distance = found_distances[found_ids == end_id]
+    return distances, float(end_distance[0]) if end_distance.size > 0 else float("inf")
@@ -8,7 +8,7 @@ Author: Jai Dutta
 Student ID: 22073372
 """
 
-from Graph import GraphVertex
+from Graph import DynamicShortestPathTree, GraphVertex
 
 class Vehicle:
     """
@@ -19,12 +19,15 @@ class Vehicle:
         location: The location of the vehicle.
         destination: The destination of the vehicle.
         distance_to_destination: The distance to the destination of the vehicle.
+        route_tree: A DynamicShortestPathTree from the location, kept up to date by the graph. When set, the distance
+            to destination is read from it, so it stays correct as roads change.
     """
     def __init__(self, ID: str, battery_level: int):
         self.ID = ID
         self.location = None
         self.destination = None
         self.distance_to_destination = 0
+        self.route_tree = None
 
         if battery_level > 100 or battery_level < 0:
             raise InvalidBatteryException("Invalid battery percentage, must be between 0-100.")
@@ -43,11 +46,20 @@ class Vehicle:
         return self.destination
 
     def get_distance_to_destination(self) -> float | int:
+        if self.route_tree is not None and self.destination is not None:
+            return float(self.route_tree.get_distances()[self.destination.get_id()])
         return self.distance_to_destination
 
+    def get_route_tree(self) -> DynamicShortestPathTree | None:
+        return self.route_tree
+
     def get_battery_level(self) -> int:
         return self.battery_level
 
+    def is_stranded(self) -> bool:
+        # True if the vehicle's location or destination has since been deleted from the graph
+        return any(vertex is not None and vertex.is_deleted() for vertex in (self.location, self.destination))
+
     def set_location(self, location: GraphVertex):
         if not isinstance(location, GraphVertex):
             raise ValueError("Location must be a GraphVertex")
@@ -64,6 +76,9 @@ class Vehicle:
             raise ValueError("Distance to destination must be positive")
         self.distance_to_destination = distance
 
+    def set_route_tree(self, route_tree: DynamicShortestPathTree | None):
+        self.route_tree = route_tree
+
     def set_battery_level(self, battery_level: int):
         if battery_level > 100 or battery_level < 0:
             raise InvalidBatteryException("Invalid battery percentage, must be between 0-100.")
@@ -0,0 +1,228 @@
+"""
+VertexHashTable.py
+
+This file contains the VertexHashTable class, which is used by the Graph to look up vertices in O(1),
+as well as the VertexHashEntry class, which is used to store each entry in the hash table.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import numpy as np
+
+
+class VertexHashEntry:
+    """
+    Class used to represent an entry in the vertex hash table.
+    Attributes:
+        key: The key of the hash entry (a case-folded label, a tuple of labels or an integer vertex id).
+        value: The value of the hash entry.
+        state: The state of the hash entry. 1 = in use, -1 = removed.
+    """
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.state = 1
+
+    def get_key(self):
+        return self.key
+
+    def get_value(self):
+        return self.value
+
+    def set_value(self, value):
+        self.value = value
+
+    def get_state(self):
+        return self.state
+
+    def set_as_removed(self):
+        self.state = -1
+
+
+class VertexHashTable:
+    """
+    Class used to represent a hash table keyed by vertex labels or vertex ids.
+    Empty slots are left as None rather than filled with blank entries, so that creating many small tables
+    (e.g. one per vertex) stays cheap.
+    Attributes:
+        hash_array: The hash table.
+        count: The number of live entries in the hash table.
+        used: The number of slots that are not empty (live or removed), used for the load factor.
+    """
+    def __init__(self, size: int = 11):
+        self.hash_array = np.empty(self._find_next_prime(size), dtype=object)
+        self.count = 0
+        self.used = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterate over the live entries of the hash table.
+        """
+        for entry in self.hash_array:
+            if entry is not None and entry.state == 1:
+                yield entry
+
+    def get_count(self) -> int:
+        """
+        Returns the number of entries in the hash table.
+        """
+        return self.count
+
+    def put(self, key, value):
+        """
+        Inserts the key/value pair into the hash table. Replaces the value if the key is already present.
+        """
+        self.size_up_check()
+        hash_index = self._hash(key)
+        removed_index = None
+
+        while self.hash_array[hash_index] is not None:
+            entry = self.hash_array[hash_index]
+            if entry.get_state() == 1 and entry.get_key() == key:
+                entry.set_value(value)
+                return
+            if entry.get_state() == -1 and removed_index is None:
+                removed_index = hash_index
+            hash_index = (hash_index + 1) % self.hash_array.size
+
+        # Reuse the first removed slot found along the probe sequence, otherwise take the empty slot
+        if removed_index is not None:
+            hash_index = removed_index
+        else:
+            self.used += 1
+        self.hash_array[hash_index] = VertexHashEntry(key, value)
+        self.count += 1
+
+    def get(self, key):
+        """
+        Finds the value stored against the key and returns it, or None if the key is not present.
+        """
+        hash_index = self._find(key)
+        if hash_index is None:
+            return None
+        return self.hash_array[hash_index].get_value()
+
+    def has_key(self, key) -> bool:
+        """
+        Checks if the hash table contains the given key.
+        """
+        return self._find(key) is not None
+
+    def remove(self, key):
+        """
+        Removes the key from the hash table and returns its value.
+        """
+        hash_index = self._find(key)
+        if hash_index is None:
+            raise KeyNotFoundError(f"Key [{key}] was not found for deletion.")
+        entry = self.hash_array[hash_index]
+        entry.set_as_removed()
+        self.count -= 1
+        return entry.get_value()
+
+    def get_lf(self) -> float:
+        """
+        Returns the load factor of the hash table (removed slots count towards it, as they lengthen probes).
+        """
+        return self.used / self.hash_array.size
+
+    def _find(self, key) -> int | None:
+        """
+        Finds the index of the key in the hash table, or None if it is not present.
+        """
+        hash_index = self._hash(key)
+        entry = self.hash_array[hash_index]
+        while entry is not None:
+            if entry.get_state() == 1 and entry.get_key() == key:
+                return hash_index
+            hash_index = (hash_index + 1) % self.hash_array.size
+            entry = self.hash_array[hash_index]
+        return None
+
+    def size_up_check(self):
+        """
+        Doubles the size of the hash table if the load factor exceeds 75%.
+        """
+        if 0.75 < (self.used + 1) / self.hash_array.size:
+            # If most used slots are removed entries, rehashing at the same size is enough to clear them out
+            if self.count * 2 < self.used:
+                self._resize(self.hash_array.size)
+            else:
+                self._resize(self._find_next_prime(self.hash_array.size * 2))
+
+    def _resize(self, size: int):
+        """
+        Resizes the hash table to the given size, dropping removed entries. The new array is only swapped in once
+        it is full, so a lookup during the resize still sees every entry.
+        """
+        new_array = np.empty(size, dtype=object)
+        count = 0
+
+        for entry in self.hash_array:
+            if entry is not None and entry.get_state() == 1:
+                hash_index = self._hash(entry.get_key(), size)
+                while new_array[hash_index] is not None:
+                    hash_index = (hash_index + 1) % size
+                new_array[hash_index] = entry
+                count += 1
+
+        self.hash_array = new_array
+        self.count = count
+        self.used = count
+
+    def _hash(self, key, size: int = None) -> int:
+        """
+        Hashes the given key to an index. Integer keys (vertex ids) are used directly, and tuples of labels are
+        hashed as their labels joined by a separator. The index is for a table of the given size, or the current
+        table if no size is given.
+        """
+        if isinstance(key, tuple):
+            key = "\0".join(key)
+        if isinstance(key, str):
+            # FNV-1a, as labels like "LOC0001"/"LOC0002" hash to neighbouring slots with the polynomial hash used for
+            # vehicles, which builds long clusters under linear probing. The mask keeps the running hash bounded.
+            hash_gen = 2166136261
+            for i in key:
+                hash_gen = ((hash_gen ^ ord(i)) * 16777619) & 0xFFFFFFFF
+        else:
+            hash_gen = int(key)
+        return hash_gen % (size if size is not None else self.hash_array.size)
+
+    def _find_next_prime(self, start_val: int) -> int:
+        """
+        Returns the next prime number from the start_val.
+        """
+        if start_val < 3:
+            return 3
+
+        if start_val % 2 == 0:
+            prime_val = start_val + 1
+        else:
+            prime_val = start_val
+
+        prime_val = prime_val - 2
+
+        is_prime = False
+        while not is_prime:
+            prime_val = prime_val + 2
+
+            ii = 3
+            is_prime = True
+            while ii * ii <= prime_val and is_prime:
+                if prime_val % ii == 0:
+                    is_prime = False
+                else:
+                    ii += 2
+        return prime_val
+
+
+class KeyNotFoundError(Exception):
+    """
+    Exception raised when a key is not found in the vertex hash table.
+    """
+    pass
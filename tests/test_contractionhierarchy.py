@@ -0,0 +1,130 @@
+"""
+test_contractionhierarchy.py
+
+This file contains the tests for the ContractionHierarchy class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from ContractionHierarchy import *
+from Graph import Graph
+
+
+@pytest.fixture
+def grid_graph():
+    rng = np.random.default_rng(11)
+    g = Graph()
+    for row in range(8):
+        for col in range(8):
+            g.add_vertex(f"{row}-{col}")
+    for row in range(8):
+        for col in range(8):
+            if col < 7:
+                g.add_edge(f"{row}-{col}", f"{row}-{col + 1}", int(rng.integers(1, 10)))
+            if row < 7:
+                g.add_edge(f"{row}-{col}", f"{row + 1}-{col}", int(rng.integers(1, 10)))
+    g.add_vertex("island")
+    return g
+
+
+def test_query_matches_dijkstra(grid_graph):
+    csr = grid_graph.get_csr()
+    hierarchy = ContractionHierarchy.from_csr(csr)
+    dense = csr.to_dense()
+    for start in range(0, 64, 9):
+        distances, _ = csr.dijkstra(start)
+        for end in range(0, 64, 7):
+            distance, path, _ = hierarchy.query(start, end)
+            assert distance == distances[end]
+            assert path[0] == start and path[-1] == end
+            # The unpacked path uses original edges only, and adds up to the distance
+            assert sum(dense[a, b] for a, b in zip(path[:-1], path[1:])) == distance
+
+
+def test_query_no_path(grid_graph):
+    hierarchy = ContractionHierarchy.from_csr(grid_graph.get_csr())
+    island = grid_graph.find_vertex("island").get_id()
+    distance, path, _ = hierarchy.query(0, island)
+    assert distance == np.inf
+    assert path.size == 0
+
+
+def test_zero_weight_roads():
+    g = Graph()
+    for label in ["A", "B", "C", "D"]:
+        g.add_vertex(label)
+    g.add_edge("A", "B", 0)
+    g.add_edge("B", "C", 0)
+    g.add_edge("C", "D", 2)
+    hierarchy = ContractionHierarchy.from_csr(g.get_csr())
+    csr = g.get_csr()
+    for start in range(4):
+        distances, _ = csr.dijkstra(start)
+        for end in range(4):
+            assert hierarchy.query(start, end)[0] == distances[end]
+    assert g.dijkstra("A", "C", algorithm="ch")[0] == 0.0
+
+
+def test_zero_weight_grid(grid_graph):
+    # Make some roads free, so contracting a vertex can leave neighbours joined only by zero-weight roads
+    rng = np.random.default_rng(3)
+    for row in range(8):
+        for col in range(7):
+            if rng.random() < 0.4:
+                grid_graph.update_edge_weight(f"{row}-{col}", f"{row}-{col + 1}", 0)
+    csr = grid_graph.get_csr()
+    hierarchy = ContractionHierarchy.from_csr(csr)
+    for start in range(0, 64, 5):
+        distances, _ = csr.dijkstra(start)
+        for end in range(64):
+            assert hierarchy.query(start, end)[0] == distances[end]
+
+
+def test_save_and_load(grid_graph, tmp_path):
+    grid_graph.save_contraction_hierarchy(tmp_path / "hierarchy.npz")
+    grid_graph.hierarchy = None
+    grid_graph.load_contraction_hierarchy(tmp_path / "hierarchy.npz")
+    hierarchy = grid_graph.hierarchy
+    assert grid_graph.dijkstra("0-0", "7-7", algorithm="ch")[0] == grid_graph.dijkstra("0-0", "7-7")[0]
+    assert grid_graph.hierarchy is hierarchy
+
+
+def test_load_for_different_graph(grid_graph, tmp_path):
+    grid_graph.save_contraction_hierarchy(tmp_path / "hierarchy.npz")
+    other = Graph()
+    other.add_vertex("A")
+    with pytest.raises(ValueError):
+        other.load_contraction_hierarchy(tmp_path / "hierarchy.npz")
+
+
+def test_load_for_different_weights(tmp_path):
+    def build(weights):
+        g = Graph()
+        for label in ["A", "B", "C"]:
+            g.add_vertex(label)
+        g.add_edge("A", "B", weights[0])
+        g.add_edge("B", "C", weights[1])
+        g.add_edge("A", "C", 5)
+        return g
+    build((1, 1)).save_contraction_hierarchy(tmp_path / "hierarchy.npz")
+    # Same locations, but the roads through B are now longer than the direct road
+    other = build((10, 10))
+    with pytest.raises(ValueError):
+        other.load_contraction_hierarchy(tmp_path / "hierarchy.npz")
+    assert other.dijkstra("A", "C", algorithm="ch")[0] == 5.0
+
+
+def test_rebuilt_after_graph_changes(grid_graph):
+    grid_graph.build_contraction_hierarchy()
+    grid_graph.add_edge("0-0", "7-7", 1)
+    distance, path = grid_graph.dijkstra("0-0", "7-7", algorithm="ch")
+    assert distance == 1
+    assert [vertex.get_label() for vertex in path] == ["0-0", "7-7"]
+
+
+if __name__ == '__main__':
+    pytest.main()
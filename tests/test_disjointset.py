@@ -0,0 +1,59 @@
+"""
+test_disjointset.py
+
+This file contains the tests for the DisjointSet class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import pytest
+
+from DisjointSet import *
+from Graph import Graph
+
+
+@pytest.fixture
+def sample_set():
+    components = DisjointSet(5)
+    components.union(0, 1)
+    components.union(1, 2)
+    components.union(3, 4)
+    return components
+
+
+def test_connected(sample_set):
+    assert sample_set.connected(0, 2)
+    assert sample_set.connected(4, 3)
+    assert not sample_set.connected(2, 3)
+
+
+def test_union_merges_sets(sample_set):
+    sample_set.union(2, 4)
+    assert sample_set.connected(0, 3)
+    assert sample_set.find(0) == sample_set.find(4)
+
+
+def test_add_grows(sample_set):
+    sample_set.add(20)
+    assert sample_set.get_size() >= 21
+    assert sample_set.find(20) == 20
+    assert sample_set.connected(0, 2)
+    sample_set.union(20, 3)
+    assert sample_set.connected(20, 4)
+
+
+def test_from_csr():
+    g = Graph()
+    for label in ['A', 'B', 'C', 'D']:
+        g.add_vertex(label)
+    g.add_edge('A', 'B', 1.0)
+    g.add_edge('C', 'D', 1.0)
+    components = DisjointSet.from_csr(g.get_csr())
+    assert components.connected(0, 1)
+    assert components.connected(2, 3)
+    assert not components.connected(1, 2)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -0,0 +1,150 @@
+"""
+test_dispatch.py
+
+This file contains the tests for the vehicle dispatch queries.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from Dispatch import *
+from Graph import Graph, VertexNotFoundError
+from Sorting import VehiclesEmptyException
+from Vehicle import Vehicle
+
+
+@pytest.fixture
+def sample_graph():
+    g = Graph()
+    for label in ['A', 'B', 'C', 'D', 'E']:
+        g.add_vertex(label)
+    g.add_edge('A', 'B', 1.0)
+    g.add_edge('B', 'C', 2.0)
+    g.add_edge('A', 'C', 5.0)
+    g.add_edge('C', 'D', 1.0)
+    return g
+
+
+def make_vehicle(graph, vehicle_id, location_label):
+    vehicle = Vehicle(vehicle_id, 50)
+    vehicle.set_location(graph.find_vertex(location_label))
+    return vehicle
+
+
+@pytest.fixture
+def vehicles(sample_graph):
+    return np.array([make_vehicle(sample_graph, 'V1', 'D'),
+                     make_vehicle(sample_graph, 'V2', 'B'),
+                     make_vehicle(sample_graph, 'V3', 'C'),
+                     make_vehicle(sample_graph, 'V4', 'E')])
+
+
+def test_nearest_vehicle(sample_graph, vehicles):
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'A')
+    assert len(nearest) == 1
+    assert nearest[0][0].get_ID() == 'V2'
+    assert nearest[0][1] == 1.0
+
+
+def test_k_nearest_in_order(sample_graph, vehicles):
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'a', 3)
+    assert [vehicle.get_ID() for vehicle, _ in nearest] == ['V2', 'V3', 'V1']
+    assert [distance for _, distance in nearest] == [1.0, 3.0, 4.0]
+
+
+def test_unreachable_vehicle_skipped(sample_graph, vehicles):
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'A', 10)
+    assert 'V4' not in [vehicle.get_ID() for vehicle, _ in nearest]
+    assert len(nearest) == 3
+
+
+def test_vehicles_at_same_location(sample_graph, vehicles):
+    vehicles = np.append(vehicles, make_vehicle(sample_graph, 'V5', 'B'))
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'A', 2)
+    assert [vehicle.get_ID() for vehicle, _ in nearest] == ['V2', 'V5']
+
+
+def test_vehicle_at_pickup(sample_graph, vehicles):
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'D')
+    assert nearest[0][0].get_ID() == 'V1'
+    assert nearest[0][1] == 0.0
+
+
+def test_deleted_location_skipped(sample_graph, vehicles):
+    sample_graph.delete_vertex('B')
+    nearest = find_nearest_vehicles(sample_graph, vehicles, 'A', 3)
+    assert [vehicle.get_ID() for vehicle, _ in nearest] == ['V3', 'V1']
+
+
+def test_vehicle_without_location_skipped(sample_graph, vehicles):
+    vehicles = np.append(vehicles, Vehicle('V5', 50))
+    assert len(find_nearest_vehicles(sample_graph, vehicles, 'A', 10)) == 3
+
+
+def test_no_vehicles(sample_graph):
+    with pytest.raises(VehiclesEmptyException):
+        find_nearest_vehicles(sample_graph, np.array([]), 'A')
+
+
+def test_pickup_not_found(sample_graph, vehicles):
+    with pytest.raises(VertexNotFoundError):
+        find_nearest_vehicles(sample_graph, vehicles, 'Z')
+
+
+def test_invalid_k(sample_graph, vehicles):
+    with pytest.raises(ValueError):
+        find_nearest_vehicles(sample_graph, vehicles, 'A', 0)
+
+
+@pytest.fixture
+def routed_vehicles(sample_graph, vehicles):
+    destinations = ['A', 'D', 'A', 'A']
+    for vehicle, destination in zip(vehicles, destinations):
+        vehicle.set_destination(sample_graph.find_vertex(destination))
+    return vehicles
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_reroute_vehicles(sample_graph, routed_vehicles, workers):
+    sample_graph.add_edge('B', 'D', 1.0)
+    unreachable = reroute_vehicles(sample_graph, routed_vehicles, workers)
+    assert [vehicle.get_distance_to_destination() for vehicle in routed_vehicles] == [2.0, 1.0, 3.0, float('inf')]
+    assert [vehicle.get_ID() for vehicle in unreachable] == ['V4']
+
+
+def test_reroute_deleted_destination(sample_graph, routed_vehicles):
+    sample_graph.delete_vertex('A')
+    unreachable = reroute_vehicles(sample_graph, routed_vehicles, 1)
+    assert [vehicle.get_ID() for vehicle in unreachable] == ['V1', 'V3', 'V4']
+    assert routed_vehicles[1].get_distance_to_destination() == 3.0
+
+
+def test_reroute_tracked_vehicle(sample_graph, routed_vehicles):
+    vehicle = routed_vehicles[0]
+    vehicle.set_route_tree(sample_graph.track_source('D'))
+    # The vehicle moves on, so the tree from its old location no longer gives its distance
+    vehicle.set_location(sample_graph.find_vertex('B'))
+    reroute_vehicles(sample_graph, routed_vehicles, 1)
+    assert vehicle.get_route_tree().get_source() is sample_graph.find_vertex('B')
+    assert vehicle.get_distance_to_destination() == 1.0
+    assert sample_graph.tracked_trees.get(sample_graph.find_vertex('D').get_id()) is None
+
+
+def test_reroute_keeps_tracking_vehicle(sample_graph, routed_vehicles):
+    vehicle = routed_vehicles[2]
+    vehicle.set_route_tree(sample_graph.track_source('C'))
+    reroute_vehicles(sample_graph, routed_vehicles, 1)
+    assert vehicle.get_distance_to_destination() == 3.0
+    # Roads that change after re-routing still update the distance
+    sample_graph.update_edge_weight('A', 'C', 1.0)
+    assert vehicle.get_distance_to_destination() == 1.0
+    sample_graph.delete_edge('A', 'C')
+    assert vehicle.get_distance_to_destination() == 3.0
+
+
+def test_reroute_skips_vehicles_without_destination(sample_graph, vehicles):
+    assert reroute_vehicles(sample_graph, vehicles, 1).size == 0
+    assert vehicles[0].get_distance_to_destination() == 0
@@ -0,0 +1,80 @@
+"""
+test_distancematrix.py
+
+This file contains the tests for the DistanceMatrix class and the Graph's all-pairs mode.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from DistanceMatrix import *
+from Graph import Graph, PathNotFound
+
+
+@pytest.fixture
+def random_graph():
+    rng = np.random.default_rng(3)
+    g = Graph()
+    for i in range(30):
+        g.add_vertex(f"V{i:02d}")
+    for _ in range(60):
+        a, b = rng.integers(0, 30, 2)
+        if a != b and not g.is_adjacent(f"V{a:02d}", f"V{b:02d}"):
+            g.add_edge(f"V{a:02d}", f"V{b:02d}", int(rng.integers(1, 20)))
+    return g
+
+
+def test_matches_dijkstra(random_graph):
+    matrix = DistanceMatrix.from_csr(random_graph.get_csr())
+    for source in range(0, 30, 7):
+        distances, _ = random_graph.get_csr().dijkstra(source)
+        assert np.array_equal(matrix.distances[source], distances.astype(np.float32))
+
+
+def test_incremental_add_edge_matches_recompute(random_graph):
+    random_graph.enable_all_pairs()
+    random_graph.add_vertex("V30")
+    random_graph.add_edge("V30", "V00", 1)
+    random_graph.add_edge("V30", "V29", 1)
+    assert random_graph.all_pairs.version == random_graph.version
+
+    recomputed = DistanceMatrix.from_csr(random_graph.get_csr())
+    size = recomputed.get_size()
+    assert np.array_equal(random_graph.all_pairs.distances[:size, :size], recomputed.distances)
+
+
+def test_dijkstra_uses_matrix(random_graph):
+    random_graph.enable_all_pairs()
+    random_graph.add_vertex("V30")
+    random_graph.add_edge("V00", "V30", 1)
+    random_graph.add_edge("V30", "V29", 1)
+    distance, path = random_graph.dijkstra("V00", "V29")
+    assert distance == 2.0
+    assert [vertex.get_label() for vertex in path] == ["V00", "V30", "V29"]
+
+
+def test_recomputes_after_delete(random_graph):
+    random_graph.enable_all_pairs()
+    random_graph.add_vertex("V30")
+    random_graph.add_edge("V00", "V30", 1)
+    random_graph.delete_edge("V00", "V30")
+    with pytest.raises(PathNotFound):
+        random_graph.dijkstra("V00", "V30")
+
+
+def test_path_ids_follow_edges(random_graph):
+    matrix = DistanceMatrix.from_csr(random_graph.get_csr())
+    end = int(np.flatnonzero(matrix.distances[0] != np.inf)[-1])
+    path = matrix.get_path_ids(0, end)
+    total = 0
+    for a, b in zip(path[:-1], path[1:]):
+        total += random_graph.get_csr().to_dense()[a, b]
+    assert path[0] == 0 and path[-1] == end
+    assert total == matrix.get_distance(0, end)
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -7,7 +7,11 @@ DSA [COMP1002] Assignment
 Author: Jai Dutta
 Student ID: 22073372
 """
+import sys
+import threading
+
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 
 from Graph import *
 
@@ -39,12 +43,32 @@ def test_add_duplicate_vertex(empty_graph):
         empty_graph.add_vertex('A', 2)
 
 
+def test_find_vertex_ignores_case(sample_graph):
+    assert sample_graph.find_vertex('a').get_label() == 'A'
+    assert sample_graph.find_vertex('D') is None
+
+
 def test_delete_vertex(sample_graph):
     sample_graph.delete_vertex('B')
     assert not sample_graph.has_vertex('B')
     assert sample_graph.get_vertex_count() == 2
 
 
+def test_delete_vertex_removes_edges(sample_graph):
+    vertex = sample_graph.find_vertex('B')
+    sample_graph.delete_vertex('B')
+    assert vertex.is_deleted()
+    assert sample_graph.edge_count == 0
+    assert len(sample_graph.get_adjacent('A')) == 0
+    assert len(sample_graph.get_adjacent('C')) == 0
+    # A new vertex with the same label starts without the old edges
+    sample_graph.add_vertex('B', 2)
+    assert not sample_graph.is_adjacent('A', 'B')
+    assert list(sample_graph.export_adjacency()[0]) == ['A', 'B', 'C']
+    with pytest.raises(PathNotFound):
+        sample_graph.dijkstra('A', 'C')
+
+
 def test_delete_nonexistent_vertex(sample_graph):
     with pytest.raises(VertexNotFoundError):
         sample_graph.delete_vertex('D')
@@ -85,6 +109,22 @@ def test_is_adjacent(sample_graph):
     assert not sample_graph.is_adjacent('A', 'C')
 
 
+def test_hub_vertex_adjacency(empty_graph):
+    empty_graph.add_vertex('HUB')
+    for i in range(10):
+        empty_graph.add_vertex(f'V{i}')
+        empty_graph.add_edge('HUB', f'V{i}', i + 1)
+    empty_graph.delete_edge('V4', 'hub')
+    hub = empty_graph.find_vertex('HUB')
+    assert not empty_graph.is_adjacent('HUB', 'V4')
+    assert empty_graph.is_adjacent('V5', 'HUB')
+    assert hub.get_weight(empty_graph.find_vertex('V5')) == 6
+    assert hub.get_weight(empty_graph.find_vertex('V4')) is None
+    assert [vertex.get_label() for vertex, _ in hub.get_adjacent()] == [f'V{i}' for i in range(10) if i != 4]
+    empty_graph.add_edge('HUB', 'V4', 2)
+    assert hub.get_weight(empty_graph.find_vertex('V4')) == 2
+
+
 def test_dijkstra(sample_graph):
     weight, path = sample_graph.dijkstra('A', 'C')
     assert weight == 3.0
@@ -92,6 +132,352 @@ def test_dijkstra(sample_graph):
         assert vertice.get_label() in ['A', 'B', 'C']
 
 
+def test_dijkstra_prefers_lower_weight_path(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    sample_graph.add_edge('A', 'D', 10.0)
+    sample_graph.add_edge('C', 'D', 1.0)
+    weight, path = sample_graph.dijkstra('a', 'd')
+    assert weight == 4.0
+    assert [vertex.get_label() for vertex in path] == ['A', 'B', 'C', 'D']
+
+
+def test_dijkstra_bidirectional(sample_graph):
+    weight, path = sample_graph.dijkstra('A', 'C', algorithm='bidirectional')
+    assert weight == 3.0
+    assert [vertex.get_label() for vertex in path] == ['A', 'B', 'C']
+    with pytest.raises(ValueError):
+        sample_graph.dijkstra('A', 'C', algorithm='unknown')
+
+
+def test_dijkstra_astar():
+    g = Graph()
+    g.add_vertex('A', coordinates=(0, 0))
+    g.add_vertex('B', coordinates=(3, 4))
+    g.add_vertex('C', coordinates=(6, 8))
+    g.add_edge('A', 'B', 5)
+    g.add_edge('B', 'C', 5)
+    g.add_edge('A', 'C', 20)
+    weight, path = g.dijkstra('A', 'C', algorithm='astar')
+    assert weight == 10
+    assert [vertex.get_label() for vertex in path] == ['A', 'B', 'C']
+    assert g.find_vertex('B').get_coordinates() == (3, 4)
+
+
+def test_dijkstra_no_path(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    with pytest.raises(PathNotFound):
+        sample_graph.dijkstra('A', 'D')
+
+
+def test_dijkstra_route_cache(sample_graph):
+    sample_graph.dijkstra('A', 'C')
+    weight, path = sample_graph.dijkstra('c', 'a')
+    assert weight == 3.0
+    assert [vertex.get_label() for vertex in path] == ['C', 'B', 'A']
+    stats = sample_graph.get_route_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    # A new edge expires every cached route
+    sample_graph.add_edge('A', 'C', 1.0)
+    assert sample_graph.dijkstra('A', 'C')[0] == 1.0
+    assert sample_graph.get_route_cache_stats()["misses"] == 2
+
+
+def test_route_cache_per_algorithm():
+    g = Graph()
+    for label in ['A', 'B', 'C', 'D']:
+        g.add_vertex(label)
+    # Two paths of the same length from A to D
+    g.add_edge('A', 'B', 1.0)
+    g.add_edge('B', 'D', 1.0)
+    g.add_edge('A', 'C', 1.0)
+    g.add_edge('C', 'D', 1.0)
+    g.dijkstra('A', 'D')
+    weight, path = g.dijkstra('A', 'D', algorithm='ch')
+    assert weight == 2.0
+    assert g.get_route_cache_stats()["misses"] == 2
+    assert path == g._find_route(0, 3, 'ch')[1]
+    # Each algorithm's route is still cached, for either direction
+    g.dijkstra('D', 'A', algorithm='ch')
+    g.dijkstra('A', 'D')
+    assert g.get_route_cache_stats()["hits"] == 2
+    assert len(g.route_cache) == 2
+
+
+def test_route_cache_deletions_drop_only_affected_routes(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    sample_graph.add_edge('C', 'D', 1.0)
+    sample_graph.dijkstra('A', 'B')
+    sample_graph.dijkstra('C', 'D')
+    sample_graph.delete_edge('A', 'B')
+    assert len(sample_graph.route_cache) == 1
+    with pytest.raises(PathNotFound):
+        sample_graph.dijkstra('A', 'B')
+    sample_graph.dijkstra('B', 'D')
+    sample_graph.delete_vertex('C')
+    assert len(sample_graph.route_cache) == 0
+
+
+def test_shortest_path_tree(sample_graph):
+    tree = sample_graph.shortest_path_tree('A')
+    assert tree.distance_to('C') == 3.0
+    assert [vertex.get_label() for vertex in tree.path_to('c')] == ['A', 'B', 'C']
+    assert tree.get_source().get_label() == 'A'
+
+
+def test_shortest_path_tree_cached_until_graph_changes(sample_graph):
+    tree = sample_graph.shortest_path_tree('A')
+    assert sample_graph.shortest_path_tree('a') is tree
+    sample_graph.add_edge('A', 'C', 1.0)
+    new_tree = sample_graph.shortest_path_tree('A')
+    assert new_tree is not tree
+    assert new_tree.distance_to('C') == 1.0
+    assert sample_graph.dijkstra('A', 'C')[0] == 1.0
+
+
+def test_shortest_path_tree_unreachable(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    with pytest.raises(PathNotFound):
+        sample_graph.shortest_path_tree('A').distance_to('D')
+
+
+def test_within_distance(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    labels, distances = sample_graph.within_distance('b', 2.0)
+    assert list(labels) == ['B', 'A', 'C']
+    assert list(distances) == [0.0, 1.0, 2.0]
+    labels, _ = sample_graph.within_distance('A', 2.5)
+    assert list(labels) == ['A', 'B']
+
+
+def test_within_distance_follows_changes(sample_graph):
+    sample_graph.within_distance('A', 10.0)
+    sample_graph.add_edge('A', 'C', 0.5)
+    labels, distances = sample_graph.within_distance('A', 10.0)
+    assert list(labels) == ['A', 'C', 'B']
+    assert list(distances) == [0.0, 0.5, 1.0]
+
+
+def test_within_distance_errors(sample_graph):
+    with pytest.raises(VertexNotFoundError):
+        sample_graph.within_distance('Z', 1.0)
+    with pytest.raises(ValueError):
+        sample_graph.within_distance('A', -1.0)
+
+
+def test_track_source_follows_changes(sample_graph):
+    tree = sample_graph.track_source('A')
+    assert tree.distance_to('C') == 3.0
+    sample_graph.add_vertex('D', 4)
+    sample_graph.add_edge('A', 'D', 0.5)
+    sample_graph.add_edge('D', 'C', 1.0)
+    assert tree.distance_to('C') == 1.5
+    assert [vertex.get_label() for vertex in tree.path_to('C')] == ['A', 'D', 'C']
+    sample_graph.delete_edge('D', 'C')
+    assert tree.distance_to('C') == 3.0
+    sample_graph.delete_vertex('B')
+    with pytest.raises(PathNotFound):
+        tree.distance_to('C')
+    assert tree.distance_to('D') == 0.5
+
+
+def test_track_source_shared_until_untracked(sample_graph):
+    tree = sample_graph.track_source('A')
+    assert sample_graph.track_source('a') is tree
+    sample_graph.untrack_source(tree)
+    sample_graph.untrack_source(tree)
+    sample_graph.add_edge('A', 'C', 1.0)
+    # No longer tracked, so left as it was
+    assert tree.distance_to('C') == 3.0
+    assert sample_graph.track_source('A') is not tree
+
+
+def test_k_shortest_paths(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    sample_graph.add_edge('A', 'C', 4.0)
+    sample_graph.add_edge('A', 'D', 1.0)
+    sample_graph.add_edge('D', 'C', 1.0)
+    routes = sample_graph.k_shortest_paths('A', 'C', 5)
+    assert [distance for distance, _ in routes] == [2.0, 3.0, 4.0]
+    assert [[vertex.get_label() for vertex in path] for _, path in routes] == [['A', 'D', 'C'], ['A', 'B', 'C'],
+                                                                               ['A', 'C']]
+
+
+def test_k_shortest_paths_errors(sample_graph):
+    with pytest.raises(VertexNotFoundError):
+        sample_graph.k_shortest_paths('A', 'Z', 2)
+    with pytest.raises(ValueError):
+        sample_graph.k_shortest_paths('A', 'C', 0)
+    sample_graph.add_vertex('D', 4)
+    with pytest.raises(PathNotFound):
+        sample_graph.k_shortest_paths('A', 'D', 2)
+
+
+def test_update_edge_weight(sample_graph):
+    assert sample_graph.dijkstra('A', 'C')[0] == 3.0
+    sample_graph.add_edge('A', 'C', 5.0)
+    sample_graph.update_edge_weight('C', 'A', 2.0)
+    assert sample_graph.find_vertex('A').get_weight(sample_graph.find_vertex('C')) == 2.0
+    assert sample_graph.dijkstra('A', 'C')[0] == 2.0
+    sample_graph.update_edge_weight('A', 'C', 4.0)
+    assert sample_graph.dijkstra('A', 'C')[0] == 3.0
+    assert sample_graph.edge_count == 3
+
+
+def test_update_edge_weight_errors(sample_graph):
+    with pytest.raises(EdgeExistsError):
+        sample_graph.update_edge_weight('A', 'C', 1.0)
+    with pytest.raises(VertexNotFoundError):
+        sample_graph.update_edge_weight('A', 'Z', 1.0)
+
+
+def test_update_edge_weights_batch(sample_graph):
+    tree = sample_graph.track_source('A')
+    sample_graph.get_csr()
+    assert sample_graph.update_edge_weights([('A', 'B', 4.0), ('B', 'C', 1.0), ('A', 'B', 3.0)]) == 3
+    assert tree.distance_to('C') == 4.0
+    # The snapshot is patched with the last weight given for each edge
+    csr = sample_graph.get_csr()
+    assert csr.weights[csr.find_edge(0, 1)] == 3.0
+    assert csr.weights[csr.find_edge(1, 0)] == 3.0
+    # A bad row leaves every edge unchanged
+    with pytest.raises(EdgeExistsError):
+        sample_graph.update_edge_weights([('A', 'B', 1.0), ('A', 'C', 1.0)])
+    assert sample_graph.dijkstra('A', 'B')[0] == 3.0
+
+
+def test_edge_profile(sample_graph):
+    sample_graph.add_edge('A', 'C', 5.0)
+    rush_hour = [5.0] * 24
+    rush_hour[8] = 1.0
+    sample_graph.set_edge_profile('A', 'C', rush_hour)
+    assert sample_graph.dijkstra('A', 'C')[0] == 3.0
+    assert sample_graph.dijkstra('A', 'C', departure_time=8.5)[0] == 1.0
+    assert sample_graph.dijkstra('A', 'C', "bidirectional", departure_time=8.5)[0] == 1.0
+    assert sample_graph.dijkstra('A', 'C', departure_time=12)[0] == 3.0
+    with pytest.raises(ValueError):
+        sample_graph.set_edge_profile('A', 'B', [1.0, 2.0])
+    with pytest.raises(ValueError):
+        sample_graph.dijkstra('A', 'C', "ch", departure_time=8)
+    sample_graph.set_edge_profile('A', 'C', None)
+    assert sample_graph.profile_count == 0
+    assert sample_graph.dijkstra('A', 'C', departure_time=8.5)[0] == 3.0
+
+
+def test_edge_profile_keeps_fixed_weight_state(sample_graph):
+    sample_graph.add_edge('A', 'C', 5.0)
+    sample_graph.enable_all_pairs()
+    all_pairs = sample_graph.get_all_pairs()
+    hierarchy = sample_graph.get_hierarchy()
+    landmarks = sample_graph.get_landmarks()
+    sample_graph.dijkstra('A', 'C')
+    rush_hour = [5.0] * 24
+    rush_hour[8] = 1.0
+    sample_graph.set_edge_profile('A', 'C', rush_hour)
+    # A profile doesn't change the fixed weights, so nothing built from them is rebuilt
+    assert sample_graph.get_all_pairs() is all_pairs
+    assert sample_graph.get_hierarchy() is hierarchy
+    assert sample_graph.get_landmarks() is landmarks
+    assert sample_graph.dijkstra('A', 'C')[0] == 3.0
+    assert sample_graph.get_route_cache_stats()["hits"] == 1
+    assert sample_graph.dijkstra('A', 'C', departure_time=8.5)[0] == 1.0
+    sample_graph.set_edge_profile('A', 'C', None)
+    assert sample_graph.dijkstra('A', 'C', departure_time=8.5)[0] == 3.0
+
+
+def test_from_edge_list(tmp_path):
+    path = tmp_path / "roads.csv"
+    path.write_text("from,to,distance\nDepot,Hospital,4\nairport,depot,2.5\nHospital,Airport,10\nPark\n")
+    g = Graph.from_edge_list(str(path))
+    assert g.get_vertex_count() == 4
+    assert g.edge_count == 3
+    assert [node.get_value().get_label() for node in g.vertices] == ['Depot', 'Hospital', 'Park', 'airport']
+    assert g.find_vertex('AIRPORT').get_weight(g.find_vertex('depot')) == 2.5
+    assert g.dijkstra('Hospital', 'Airport')[0] == 6.5
+    assert not g.is_path('Park', 'Depot')
+    g.add_vertex('Zoo')
+    g.add_edge('Zoo', 'Park', 1)
+    assert g.is_path('zoo', 'park')
+
+
+def test_load_csv_rejects_bad_files(tmp_path, empty_graph):
+    path = tmp_path / "roads.csv"
+    path.write_text("A,B,1\nB,a,2\n")
+    with pytest.raises(EdgeExistsError):
+        empty_graph.load_csv(str(path))
+    assert empty_graph.get_vertex_count() == 0
+    path.write_text("A,B,1\nC,c,2\n")
+    with pytest.raises(EdgeToSameVertex):
+        empty_graph.load_csv(str(path))
+    path.write_text("A,B,1\nC,D,far\n")
+    with pytest.raises(ValueError):
+        empty_graph.load_csv(str(path))
+    path.write_text("A;B;1\n")
+    assert empty_graph.load_csv(str(path), delimiter=";")["edges"] == 1
+    with pytest.raises(ValueError):
+        empty_graph.load_csv(str(path), delimiter=";")
+
+
+def test_save_and_load(sample_graph, tmp_path):
+    sample_graph.add_vertex('AB', coordinates=(3, 4))
+    sample_graph.add_vertex('D')
+    sample_graph.add_edge('AB', 'C', 7.0)
+    sample_graph.delete_vertex('D')
+    sample_graph.save(str(tmp_path / "graph"))
+    loaded = Graph.load(str(tmp_path / "graph"))
+    assert [node.get_value().get_label() for node in loaded.vertices] == ['A', 'AB', 'B', 'C']
+    assert loaded.edge_count == 3
+    assert loaded.find_vertex('ab').get_coordinates() == (3, 4)
+    assert loaded.find_vertex('A').get_coordinates() is None
+    assert loaded.get_csr() is loaded.csr
+    assert loaded.dijkstra('A', 'AB')[0] == 10.0
+    assert loaded.is_path('B', 'AB')
+    loaded.add_vertex('E')
+    loaded.add_edge('E', 'A', 1.0)
+    assert loaded.dijkstra('E', 'C')[0] == 4.0
+
+
+def test_save_and_load_landmarks(sample_graph, tmp_path):
+    sample_graph.add_vertex('AA', 4)
+    sample_graph.add_edge('AA', 'C', 1.0)
+    sample_graph.build_landmarks(2)
+    sample_graph.save(str(tmp_path / "graph"))
+    loaded = Graph.load(str(tmp_path / "graph"))
+    # Saving renumbers the vertices in label order, so the landmarks follow their vertices
+    assert [loaded.csr.labels[i] for i in loaded.landmarks.landmark_ids] == \
+        [sample_graph.get_csr().labels[i] for i in sample_graph.landmarks.landmark_ids]
+    assert loaded.get_landmarks() is loaded.landmarks
+    assert loaded.dijkstra('A', 'AA', 'alt')[0] == 4.0
+    # A later save without current landmarks leaves none behind
+    loaded.add_vertex('D')
+    loaded.save(str(tmp_path / "graph"))
+    assert Graph.load(str(tmp_path / "graph")).landmarks is None
+
+
+def test_dijkstra_alt(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    sample_graph.add_edge('A', 'D', 5.0)
+    distance, path = sample_graph.dijkstra('D', 'C', 'alt')
+    assert distance == 8.0
+    assert [vertex.get_label() for vertex in path] == ['D', 'A', 'B', 'C']
+    landmarks = sample_graph.landmarks
+    # Landmarks are picked again once the graph changes
+    sample_graph.add_edge('D', 'C', 1.0)
+    assert sample_graph.dijkstra('C', 'D', 'alt')[0] == 1.0
+    assert sample_graph.landmarks is not landmarks
+    with pytest.raises(ValueError):
+        sample_graph.dijkstra('D', 'C', 'alt', departure_time=8)
+
+
+def test_vertex_ids_are_stable(sample_graph):
+    c_id = sample_graph.find_vertex('C').get_id()
+    sample_graph.delete_vertex('B')
+    sample_graph.add_vertex('D', 4)
+    assert sample_graph.find_vertex('C').get_id() == c_id
+    assert sample_graph.find_vertex('D').get_id() == 3
+    assert sample_graph.vertex_array[c_id] is sample_graph.find_vertex('C')
+
+
 def test_display_as_matrix(sample_graph, capsys):
     sample_graph.display_as_matrix()
     captured = capsys.readouterr()
@@ -103,6 +489,31 @@ C	0	1	0
 """
     assert expected_output.strip() in captured.out.strip()
 
+def test_display_as_matrix_paged(sample_graph, capsys):
+    sample_graph.display_as_matrix(page_size=2, weighted=True)
+    captured = capsys.readouterr()
+    assert "Rows 1-2, columns 1-2 of 3" in captured.out
+    assert "A\t0\t1\t" in captured.out
+    assert "Rows 3-3, columns 3-3 of 3" in captured.out
+    assert "B\t2\t" in captured.out
+
+
+def test_export_adjacency(sample_graph):
+    sample_graph.add_vertex('AA')
+    sample_graph.add_edge('AA', 'C', 4.0)
+    sample_graph.delete_vertex('B')
+    labels, dense = sample_graph.export_adjacency()
+    assert list(labels) == ['A', 'AA', 'C']
+    assert dense.tolist() == [[0, 0, 0], [0, 0, 4.0], [0, 4.0, 0]]
+    _, (rows, cols, weights) = sample_graph.export_adjacency("coo")
+    assert sorted(zip(rows.tolist(), cols.tolist(), weights.tolist())) == [(1, 2, 4.0), (2, 1, 4.0)]
+    _, (offsets, targets, weights) = sample_graph.export_adjacency("csr")
+    assert offsets.tolist() == [0, 0, 1, 2]
+    assert targets.tolist() == [2, 1]
+    with pytest.raises(ValueError):
+        sample_graph.export_adjacency("bsr")
+
+
 def test_display_as_list(sample_graph, capsys):
     sample_graph.display_as_list()
     captured = capsys.readouterr()
@@ -114,5 +525,97 @@ def test_is_path(sample_graph):
     assert sample_graph.is_path("A", "C")
 
 
+def test_is_path_after_changes(sample_graph):
+    sample_graph.add_vertex('D', 4)
+    assert not sample_graph.is_path("A", "D")
+    sample_graph.add_edge('C', 'D', 1.0)
+    assert sample_graph.is_path("a", "d")
+    sample_graph.delete_edge('B', 'C')
+    assert not sample_graph.is_path("A", "D")
+    assert sample_graph.is_path("C", "D")
+    sample_graph.add_edge('A', 'D', 1.0)
+    assert sample_graph.is_path("B", "C")
+    sample_graph.delete_vertex('A')
+    assert not sample_graph.is_path("B", "C")
+
+
+
+def test_concurrent_queries():
+    g = Graph(route_cache_size=4)
+    for i in range(30):
+        g.add_vertex(f'V{i:02d}')
+    for i in range(29):
+        g.add_edge(f'V{i:02d}', f'V{i + 1:02d}', i % 5 + 1)
+    pairs = [(f'V{i:02d}', f'V{(i * 7) % 30:02d}') for i in range(30)]
+    expected = [g.get_csr().dijkstra(int(a[1:]), int(b[1:]))[0][int(b[1:])] for a, b in pairs]
+
+    def query(pair):
+        return g.dijkstra(*pair)[0], g.is_path(*pair)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(query, pairs * 4))
+    assert results == [(distance, True) for distance in expected * 4]
+
+
+
+def test_search_snapshot_after_delete():
+    g = Graph()
+    for label in ['A', 'B', 'C', 'D']:
+        g.add_vertex(label)
+    g.add_edge('A', 'B', 1)
+    g.add_edge('B', 'C', 1)
+    g.add_edge('C', 'D', 1)
+    csr, vertices = g._get_snapshot()
+    # A search that took its snapshot before the delete still returns whole vertices
+    g.delete_vertex('B')
+    distance, path = g._search_snapshot(csr, vertices, 0, 3, 'dijkstra')
+    assert distance == 3
+    assert [vertex.get_label() for vertex in path] == ['A', 'B', 'C', 'D']
+
+
+@pytest.mark.parametrize('algorithm', ['dijkstra', 'bidirectional', 'ch', 'alt'])
+def test_concurrent_queries_while_deleting(algorithm):
+    g = Graph(route_cache_size=4)
+    for i in range(40):
+        g.add_vertex(f'V{i:02d}')
+    for i in range(39):
+        g.add_edge(f'V{i:02d}', f'V{i + 1:02d}', 1)
+    readers = 4
+    done = threading.Event()
+
+    def query(i):
+        # Queries may find that a location or every path is gone, but must never fail any other way
+        for j in range(150):
+            try:
+                g.dijkstra(f'V{(i + j) % 40:02d}', f'V{(i * 7 + j * 3) % 40:02d}', algorithm=algorithm)
+            except (VertexNotFoundError, PathNotFound):
+                pass
+
+    def churn():
+        # Keep deleting locations and adding them back until every query has run
+        i = 1
+        while not done.is_set():
+            label = f'V{i:02d}'
+            g.delete_vertex(label)
+            g.add_vertex(label)
+            g.add_edge(f'V{i - 1:02d}', label, 1)
+            g.add_edge(label, f'V{i + 1:02d}', 1)
+            i = i % 38 + 1
+
+    # Switch threads as often as possible, so the changes land in the middle of queries
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=readers + 1) as pool:
+            writer = pool.submit(churn)
+            try:
+                list(pool.map(query, range(readers)))
+            finally:
+                done.set()
+            writer.result()
+    finally:
+        sys.setswitchinterval(interval)
+    assert g.get_vertex_count() == 40
+
 if __name__ == '__main__':
     pytest.main()
@@ -0,0 +1,192 @@
+"""
+test_graphcsr.py
+
+This file contains the tests for the GraphCSR class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from Graph import Graph
+from GraphCSR import *
+
+
+@pytest.fixture
+def sample_graph():
+    g = Graph()
+    g.add_vertex('A')
+    g.add_vertex('B')
+    g.add_vertex('C')
+    g.add_vertex('D')
+    g.add_edge('A', 'B', 1.0)
+    g.add_edge('B', 'C', 2.0)
+    g.add_edge('A', 'C', 5.0)
+    return g
+
+
+def test_from_graph(sample_graph):
+    csr = sample_graph.get_csr()
+    assert csr.get_size() == 4
+    assert list(csr.offsets) == [0, 2, 4, 6, 6]
+    assert csr.get_degree(3) == 0
+    assert sorted(csr.targets[csr.offsets[0]:csr.offsets[1]]) == [1, 2]
+    assert csr.labels[2] == 'C'
+
+
+def test_rebuilt_only_after_mutation(sample_graph):
+    csr = sample_graph.get_csr()
+    assert sample_graph.get_csr() is csr
+    sample_graph.add_edge('C', 'D', 1.0)
+    rebuilt = sample_graph.get_csr()
+    assert rebuilt is not csr
+    assert rebuilt.get_degree(3) == 1
+
+
+def test_deleted_vertex_has_no_edges(sample_graph):
+    sample_graph.delete_vertex('B')
+    csr = sample_graph.get_csr()
+    assert csr.labels[1] is None
+    assert 1 not in csr.targets
+
+
+def test_dijkstra(sample_graph):
+    distances, prev = sample_graph.get_csr().dijkstra(0)
+    assert list(distances[:3]) == [0.0, 1.0, 3.0]
+    assert distances[3] == np.inf
+    assert list(reconstruct_path_ids(prev, 2)) == [0, 1, 2]
+
+
+def test_bidirectional_dijkstra_matches_dijkstra():
+    rng = np.random.default_rng(5)
+    g = Graph()
+    for i in range(40):
+        g.add_vertex(f"V{i:02d}")
+    for _ in range(80):
+        a, b = rng.integers(0, 40, 2)
+        if a != b and not g.is_adjacent(f"V{a:02d}", f"V{b:02d}"):
+            g.add_edge(f"V{a:02d}", f"V{b:02d}", int(rng.integers(1, 20)))
+    csr = g.get_csr()
+    dense = csr.to_dense()
+    for start in range(0, 40, 3):
+        distances, _ = csr.dijkstra(start)
+        for end in range(0, 40, 5):
+            distance, path, _ = csr.bidirectional_dijkstra(start, end)
+            assert distance == distances[end]
+            if distance != np.inf:
+                assert path[0] == start and path[-1] == end
+                assert sum(dense[a, b] for a, b in zip(path[:-1], path[1:])) == distance
+
+
+def test_bidirectional_dijkstra_no_path(sample_graph):
+    distance, path, _ = sample_graph.get_csr().bidirectional_dijkstra(0, 3)
+    assert distance == np.inf
+    assert path.size == 0
+
+
+def test_astar_on_grid():
+    g = Graph()
+    for row in range(6):
+        for col in range(6):
+            g.add_vertex(f"{row}-{col}", coordinates=(col * 10.0, row * 10.0))
+    rng = np.random.default_rng(7)
+    for row in range(6):
+        for col in range(6):
+            if col < 5:
+                g.add_edge(f"{row}-{col}", f"{row}-{col + 1}", int(rng.integers(10, 30)))
+            if row < 5:
+                g.add_edge(f"{row}-{col}", f"{row + 1}-{col}", int(rng.integers(10, 30)))
+    csr = g.get_csr()
+    assert csr.get_heuristic_scale() == 1.0
+    distances, _ = csr.dijkstra(0)
+    distance, path, settled = csr.astar(0, 35)
+    assert distance == distances[35]
+    assert path[0] == 0 and path[-1] == 35
+    assert settled <= np.count_nonzero(distances <= distances[35])
+
+
+def test_astar_without_coordinates(sample_graph):
+    csr = sample_graph.get_csr()
+    assert csr.get_heuristic_scale() == 0.0
+    distance, path, _ = csr.astar(0, 2)
+    assert distance == 3.0
+    assert list(path) == [0, 1, 2]
+
+
+def test_is_path(sample_graph):
+    csr = sample_graph.get_csr()
+    assert csr.is_path(0, 2)
+    assert not csr.is_path(0, 3)
+    # Repeated searches reuse the visited array without clearing it
+    assert csr.is_path(2, 0)
+    assert not csr.is_path(3, 1)
+
+
+def test_save_and_load(sample_graph, tmp_path):
+    sample_graph.add_vertex('Zürich', coordinates=(1.5, 2))
+    csr = sample_graph.get_csr()
+    csr.save(str(tmp_path / "snapshot"))
+    loaded = GraphCSR.load(str(tmp_path / "snapshot"), version=7)
+    assert loaded.version == 7
+    assert list(loaded.labels) == ['A', 'B', 'C', 'D', 'Zürich']
+    assert np.array_equal(loaded.offsets, csr.offsets)
+    assert np.array_equal(loaded.targets, csr.targets)
+    assert np.array_equal(loaded.weights, csr.weights)
+    assert loaded.coordinates[4].tolist() == [1.5, 2.0]
+
+
+def test_save_with_deleted_vertex(sample_graph, tmp_path):
+    sample_graph.delete_vertex('D')
+    with pytest.raises(ValueError):
+        sample_graph.get_csr().save(str(tmp_path / "snapshot"))
+
+
+def test_to_dense(sample_graph):
+    matrix = sample_graph.get_csr().to_dense()
+    assert matrix[0, 2] == 5.0
+    assert matrix[2, 0] == 5.0
+    assert matrix[0, 3] == 0.0
+
+
+if __name__ == '__main__':
+    pytest.main()
+
+
+def test_nearest(sample_graph):
+    csr = sample_graph.get_csr()
+    target_counts = np.zeros(csr.get_size(), dtype=np.int64)
+    target_counts[[0, 2, 3]] = [1, 2, 1]
+    found_ids, distances = csr.nearest(1, target_counts, 2)
+    assert list(found_ids) == [0, 2]
+    assert list(distances) == [1.0, 2.0]
+    # D is unreachable, so only A and C are found however many are asked for
+    found_ids, _ = csr.nearest(1, target_counts, 10)
+    assert list(found_ids) == [0, 2]
+
+
+def test_within_distance(sample_graph):
+    csr = sample_graph.get_csr()
+    found_ids, distances = csr.within_distance(0, 3.0)
+    assert list(found_ids) == [0, 1, 2]
+    assert list(distances) == [0.0, 1.0, 3.0]
+    # The next search reuses the same arrays, so distances left by the last one must not leak into it
+    found_ids, distances = csr.within_distance(2, 2.0)
+    assert list(found_ids) == [2, 1]
+    assert list(distances) == [0.0, 2.0]
+    assert list(csr.within_distance(3, 100.0)[0]) == [3]
+
+
+def test_k_shortest_paths(sample_graph):
+    sample_graph.add_edge('C', 'D', 1.0)
+    sample_graph.add_edge('A', 'D', 7.0)
+    distances, paths = sample_graph.get_csr().k_shortest_paths(0, 3, 10)
+    # Every loopless path from A to D, shortest first
+    assert list(distances) == [4.0, 6.0, 7.0]
+    assert [list(path) for path in paths] == [[0, 1, 2, 3], [0, 2, 3], [0, 3]]
+
+
+def test_k_shortest_paths_unreachable(sample_graph):
+    distances, paths = sample_graph.get_csr().k_shortest_paths(0, 3, 3)
+    assert distances.size == 0 and paths.size == 0
@@ -0,0 +1,80 @@
+"""
+test_landmarks.py
+
+This file contains the tests for the Landmarks class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from Graph import Graph
+from Landmarks import *
+
+
+@pytest.fixture
+def grid_graph():
+    rng = np.random.default_rng(5)
+    g = Graph()
+    for row in range(6):
+        for col in range(6):
+            g.add_vertex(f"{row}-{col}")
+    for row in range(6):
+        for col in range(6):
+            if col < 5:
+                g.add_edge(f"{row}-{col}", f"{row}-{col + 1}", int(rng.integers(1, 10)))
+            if row < 5:
+                g.add_edge(f"{row}-{col}", f"{row + 1}-{col}", int(rng.integers(1, 10)))
+    g.add_vertex("island")
+    return g
+
+
+def test_landmarks_spread_out(grid_graph):
+    csr = grid_graph.get_csr()
+    landmarks = Landmarks.from_csr(csr, 3)
+    assert landmarks.distances.shape == (37, 3)
+    assert landmarks.distances.dtype == np.float32
+    assert np.unique(landmarks.landmark_ids).size == 3
+    # The grid's corners are far apart, and the island can't be reached from the grid so gets a landmark of its own
+    assert grid_graph.find_vertex("island").get_id() in landmarks.landmark_ids
+    for i, landmark_id in enumerate(landmarks.landmark_ids):
+        assert np.array_equal(landmarks.distances[:, i], csr.dijkstra(landmark_id)[0].astype(np.float32))
+
+
+def test_lower_bounds_admissible(grid_graph):
+    csr = grid_graph.get_csr()
+    landmarks = Landmarks.from_csr(csr, 4)
+    for end_id in range(0, 36, 5):
+        distances, _ = csr.dijkstra(end_id)
+        bounds = landmarks.lower_bounds(end_id)
+        assert np.all(bounds <= distances)
+        assert bounds[end_id] == 0
+    island = grid_graph.find_vertex("island").get_id()
+    assert np.all(landmarks.lower_bounds(island)[:36] == np.inf)
+
+
+def test_alt_search_matches_dijkstra(grid_graph):
+    csr = grid_graph.get_csr()
+    landmarks = Landmarks.from_csr(csr, 4)
+    for start_id in range(0, 36, 7):
+        distances, _ = csr.dijkstra(start_id)
+        for end_id in range(0, 36, 4):
+            distance, path, settled = csr.astar(start_id, end_id, landmarks.lower_bounds(end_id))
+            assert distance == distances[end_id]
+            assert path[0] == start_id and path[-1] == end_id
+
+
+def test_save_and_load(grid_graph, tmp_path):
+    landmarks = Landmarks.from_csr(grid_graph.get_csr(), 2)
+    landmarks.save(str(tmp_path))
+    loaded = Landmarks.load(str(tmp_path), mmap_mode="r")
+    assert np.array_equal(loaded.landmark_ids, landmarks.landmark_ids)
+    assert np.array_equal(loaded.distances, landmarks.distances)
+    assert Landmarks.load(str(tmp_path / "missing")) is None
+
+
+def test_invalid_count(grid_graph):
+    with pytest.raises(ValueError):
+        Landmarks.from_csr(grid_graph.get_csr(), 0)
@@ -63,6 +63,20 @@ def test_remove(sample_ll):
     with pytest.raises(IndexError):
         assert not sample_ll[0]
 
+def test_remove_node(sample_ll):
+    middle = sample_ll[1]
+    assert sample_ll.remove_node(middle) == 2
+    assert len(sample_ll) == 2
+    assert 1 == sample_ll[1].get_value()
+
+    sample_ll.insert_node_last(middle)
+    assert len(sample_ll) == 3
+    assert 2 == sample_ll.peek_last()
+
+    tail = sample_ll.insert_last(0)
+    sample_ll.remove_node(tail)
+    assert 2 == sample_ll.peek_last()
+
 def test_remove_empty(empty_ll):
     with pytest.raises(ListEmpty):
         empty_ll.remove_first()
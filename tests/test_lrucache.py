@@ -0,0 +1,73 @@
+"""
+test_lrucache.py
+
+This file contains the tests for the LRUCache class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import pytest
+
+from LRUCache import *
+
+@pytest.fixture
+def sample_cache():
+    cache = LRUCache(3)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("c", 3)
+    return cache
+
+def test_get(sample_cache):
+    assert sample_cache.get("a") == 1
+    assert sample_cache.get("z") is None
+
+def test_evicts_least_recently_used(sample_cache):
+    sample_cache.get("a")
+    sample_cache.put("d", 4)
+    assert len(sample_cache) == 3
+    assert sample_cache.get("b") is None
+    assert sample_cache.get("a") == 1
+    assert sample_cache.get("d") == 4
+
+def test_put_existing_key(sample_cache):
+    sample_cache.put("a", 10)
+    sample_cache.put("d", 4)
+    assert sample_cache.get("a") == 10
+    assert sample_cache.get("b") is None
+
+def test_remove_and_clear(sample_cache):
+    sample_cache.remove("b")
+    assert sample_cache.get("b") is None
+    assert len(sample_cache) == 2
+    sample_cache.clear()
+    assert len(sample_cache) == 0
+
+def test_counters(sample_cache):
+    sample_cache.get("a")
+    sample_cache.get("z")
+    sample_cache.put("d", 4)
+    assert sample_cache.get_stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 3}
+
+def test_invalidate(sample_cache):
+    sample_cache.invalidate()
+    assert sample_cache.get("a") is None
+    assert sample_cache.items() == []
+    sample_cache.put("d", 4)
+    assert sample_cache.items() == [("d", 4)]
+    assert sample_cache.get("d") == 4
+
+def test_tuple_keys():
+    cache = LRUCache(2)
+    cache.put(("a", "b"), 1)
+    assert cache.get(("a", "b")) == 1
+    assert cache.get(("b", "a")) is None
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+if __name__ == "__main__":
+    pytest.main()
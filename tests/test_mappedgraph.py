@@ -0,0 +1,93 @@
+"""
+test_mappedgraph.py
+
+This file contains the tests for the MappedGraph class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from Graph import *
+from MappedGraph import *
+
+
+@pytest.fixture
+def mapped_graph(tmp_path):
+    g = Graph()
+    g.add_vertex('Depot', coordinates=(0, 0))
+    g.add_vertex('hospital', coordinates=(3, 4))
+    g.add_vertex('Airport', coordinates=(6, 8))
+    g.add_vertex('Zürich', coordinates=(0, 1))
+    g.add_vertex('Park', coordinates=(9, 9))
+    g.add_edge('Depot', 'Hospital', 5)
+    g.add_edge('Hospital', 'Airport', 5)
+    g.add_edge('Depot', 'Airport', 20)
+    g.add_edge('Depot', 'Zürich', 1)
+    g.build_landmarks(2)
+    g.save(str(tmp_path / "graph"))
+    return MappedGraph(str(tmp_path / "graph"))
+
+
+def test_arrays_are_mapped(mapped_graph):
+    assert isinstance(mapped_graph.csr.targets.base, np.memmap)
+    assert isinstance(mapped_graph.label_text.base, np.memmap)
+    assert not mapped_graph.csr.weights.flags.writeable
+    assert mapped_graph.get_vertex_count() == 5
+
+
+def test_find_vertex(mapped_graph):
+    vertex = mapped_graph.find_vertex('HOSPITAL')
+    assert vertex.get_label() == 'hospital'
+    assert vertex.get_coordinates() == (3, 4)
+    assert mapped_graph.find_vertex('zürich').get_label() == 'Zürich'
+    assert mapped_graph.find_vertex('Nowhere') is None
+    assert mapped_graph.find_vertex('') is None
+    assert mapped_graph.has_vertex('park')
+
+
+def test_get_adjacent(mapped_graph):
+    adjacent = mapped_graph.get_adjacent('depot')
+    assert sorted((vertex.get_label(), weight) for vertex, weight in adjacent) == \
+        [('Airport', 20.0), ('Zürich', 1.0), ('hospital', 5.0)]
+    with pytest.raises(VertexNotFoundError):
+        mapped_graph.get_adjacent('Nowhere')
+
+
+def test_dijkstra(mapped_graph):
+    for algorithm in MAPPED_ALGORITHMS:
+        distance, path = mapped_graph.dijkstra('Zürich', 'airport', algorithm)
+        assert distance == 11
+        assert [vertex.get_label() for vertex in path] == ['Zürich', 'Depot', 'hospital', 'Airport']
+    with pytest.raises(PathNotFound):
+        mapped_graph.dijkstra('Depot', 'Park')
+    with pytest.raises(ValueError):
+        mapped_graph.dijkstra('Depot', 'Park', 'ch')
+
+
+def test_alt_needs_saved_landmarks(tmp_path):
+    g = Graph()
+    g.add_vertex('A')
+    g.add_vertex('B')
+    g.add_edge('A', 'B', 2)
+    g.save(str(tmp_path / "graph"))
+    mapped_graph = MappedGraph(str(tmp_path / "graph"))
+    assert mapped_graph.landmarks is None
+    with pytest.raises(ValueError):
+        mapped_graph.dijkstra('A', 'B', 'alt')
+
+
+def test_is_path(mapped_graph):
+    assert mapped_graph.is_path('airport', 'Zürich')
+    assert not mapped_graph.is_path('Park', 'Depot')
+    mapped_graph.components = None
+    assert mapped_graph.is_path('airport', 'Zürich')
+    assert not mapped_graph.is_path('Park', 'Depot')
+    with pytest.raises(VertexNotFoundError):
+        mapped_graph.is_path('Nowhere', 'Depot')
+
+
+if __name__ == '__main__':
+    pytest.main()
@@ -52,5 +52,12 @@ def test_display(sample_heap, capsys):
     captured = capsys.readouterr()
     assert captured.out == "[0] Priority: 10 | Value: B\n[1] Priority: 50 | Value: A\n[2] Priority: 1000 | Value: C\n"
 
+def test_growable():
+    mh = MinHeap(1, growable=True)
+    for priority in [5, 3, 8, 1]:
+        mh.add(priority, priority)
+    assert mh.get_count() == 4
+    assert [mh.remove().get_priority() for _ in range(4)] == [1, 3, 5, 8]
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,67 @@
+"""
+test_partition.py
+
+This file contains the tests for the graph partitioner.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import numpy as np
+import pytest
+
+from Graph import Graph
+from Partition import *
+
+
+@pytest.fixture
+def ladder_graph():
+    # Two rows of 8 locations joined like a ladder
+    g = Graph()
+    for row in 'AB':
+        for col in range(8):
+            g.add_vertex(f'{row}{col}')
+    for row in 'AB':
+        for col in range(7):
+            g.add_edge(f'{row}{col}', f'{row}{col + 1}', 1.0)
+    for col in range(8):
+        g.add_edge(f'A{col}', f'B{col}', 1.0)
+    return g
+
+
+def test_partition_balanced(ladder_graph):
+    regions = partition_graph(ladder_graph.get_csr(), 4)
+    assert sorted(np.bincount(regions).tolist()) == [4, 4, 4, 4]
+
+
+def test_partition_uneven_parts(ladder_graph):
+    regions = partition_graph(ladder_graph.get_csr(), 3)
+    assert sorted(np.bincount(regions).tolist()) == [5, 5, 6]
+
+
+def test_partition_small_boundary(ladder_graph):
+    csr = ladder_graph.get_csr()
+    regions = partition_graph(csr, 2)
+    # The halves are bands of the ladder cut across it (straight or with one step), not scattered locations
+    assert boundary_vertices(csr, regions).size <= 6
+
+
+def test_partition_disconnected():
+    g = Graph()
+    for label in ['A', 'B', 'C', 'D']:
+        g.add_vertex(label)
+    g.add_edge('A', 'B', 1.0)
+    regions = partition_graph(g.get_csr(), 2)
+    assert np.bincount(regions).tolist() == [2, 2]
+
+
+def test_single_region(ladder_graph):
+    csr = ladder_graph.get_csr()
+    regions = partition_graph(csr, 1)
+    assert np.all(regions == 0)
+    assert boundary_vertices(csr, regions).size == 0
+
+
+def test_partition_invalid_parts(ladder_graph):
+    with pytest.raises(ValueError):
+        partition_graph(ladder_graph.get_csr(), 0)
@@ -0,0 +1,100 @@
+"""
+test_shardedgraph.py
+
+This file contains the tests for the ShardedGraph class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+import pytest
+
+from Graph import Graph, PathNotFound, VertexNotFoundError
+from ShardedGraph import *
+
+
+@pytest.fixture
+def grid_graph():
+    # A 6 x 6 grid with uneven road lengths, so shortest paths wander between regions
+    g = Graph()
+    for row in range(6):
+        for col in range(6):
+            g.add_vertex(f'R{row}C{col}')
+    for row in range(6):
+        for col in range(6):
+            if col < 5:
+                g.add_edge(f'R{row}C{col}', f'R{row}C{col + 1}', float((row * 7 + col * 3) % 5 + 1))
+            if row < 5:
+                g.add_edge(f'R{row}C{col}', f'R{row + 1}C{col}', float((row * 2 + col * 5) % 4 + 1))
+    g.add_vertex('Island')
+    return g
+
+
+@pytest.fixture
+def sharded(grid_graph):
+    sharded_graph = ShardedGraph(grid_graph, 3)
+    yield sharded_graph
+    sharded_graph.close()
+
+
+def path_length(graph, path):
+    total = 0.0
+    for vertex, next_vertex in zip(path, path[1:]):
+        total += [weight for neighbour, weight in graph.get_adjacent(vertex.get_label()) if neighbour is next_vertex][0]
+    return total
+
+
+def test_sharded_matches_dijkstra(grid_graph, sharded):
+    labels = [f'R{row}C{col}' for row in range(6) for col in range(6)]
+    for start in labels[::5]:
+        for end in labels[::3]:
+            distance, path = sharded.dijkstra(start, end)
+            assert distance == grid_graph.dijkstra(start, end)[0]
+            assert path[0].get_label() == start
+            assert path[-1].get_label() == end
+            assert path_length(grid_graph, path) == distance
+
+
+def test_sharded_same_location(sharded):
+    distance, path = sharded.dijkstra('R2C2', 'r2c2')
+    assert distance == 0.0
+    assert [vertex.get_label() for vertex in path] == ['R2C2']
+
+
+def test_sharded_overlay(sharded):
+    assert sharded.get_shard_count() == 3
+    assert 0 < sharded.get_boundary_count() < 37
+
+
+def test_sharded_errors(grid_graph, sharded):
+    with pytest.raises(VertexNotFoundError):
+        sharded.dijkstra('R0C0', 'Nowhere')
+    with pytest.raises(PathNotFound):
+        sharded.dijkstra('R0C0', 'Island')
+    # Locations added after the shards were built aren't in any shard
+    grid_graph.add_vertex('Later')
+    with pytest.raises(VertexNotFoundError):
+        sharded.dijkstra('Later', 'R0C0')
+
+
+def test_single_shard(grid_graph):
+    with ShardedGraph(grid_graph, 1) as sharded_graph:
+        assert sharded_graph.get_boundary_count() == 0
+        assert sharded_graph.dijkstra('R0C0', 'R5C5')[0] == grid_graph.dijkstra('R0C0', 'R5C5')[0]
+
+
+def test_sharded_full_path_on_line():
+    # Every stretch of a path along a line ends at a location that the boundary searches stop short of
+    g = Graph()
+    labels = ['A', 'B', 'C', 'D', 'E', 'F']
+    for label in labels:
+        g.add_vertex(label)
+    for label, next_label in zip(labels, labels[1:]):
+        g.add_edge(label, next_label, 1.0)
+    with ShardedGraph(g, 2) as sharded_graph:
+        distance, path = sharded_graph.dijkstra('A', 'F')
+        assert distance == 5.0
+        assert [vertex.get_label() for vertex in path] == labels
+        assert [vertex.get_label() for vertex in sharded_graph.dijkstra('F', 'A')[1]] == labels[::-1]
+        assert [vertex.get_label() for vertex in sharded_graph.dijkstra('B', 'E')[1]] == labels[1:5]
+        assert [vertex.get_label() for vertex in sharded_graph.dijkstra('C', 'A')[1]] == ['C', 'B', 'A']
@@ -11,7 +11,7 @@ Student ID: 22073372
 import pytest
 
 from Vehicle import *
-from Graph import GraphVertex
+from Graph import Graph, GraphVertex
 
 @pytest.fixture
 def vehicle():
@@ -34,5 +34,21 @@ def test_get_distance_to_destination(vehicle):
 def test_get_battery_level(vehicle):
     assert vehicle.get_battery_level() == 70
 
-
-
+def test_is_stranded(vehicle):
+    assert not vehicle.is_stranded()
+    vehicle.get_destination().deleted = True
+    assert vehicle.is_stranded()
+
+def test_route_tree_distance():
+    graph = Graph()
+    for label in ["A", "B", "C"]:
+        graph.add_vertex(label)
+    graph.add_edge("A", "B", 5)
+    graph.add_edge("B", "C", 5)
+    v = Vehicle("V1", 50)
+    v.set_location(graph.find_vertex("A"))
+    v.set_destination(graph.find_vertex("C"))
+    v.set_route_tree(graph.track_source("A"))
+    assert v.get_distance_to_destination() == 10
+    graph.add_edge("A", "C", 3)
+    assert v.get_distance_to_destination() == 3
@@ -0,0 +1,56 @@
+"""
+test_vertexhashtable.py
+
+This file contains the tests for the VertexHashTable class.
+
+DSA [COMP1002] Assignment
+Author: Jai Dutta
+Student ID: 22073372
+"""
+
+import pytest
+
+from VertexHashTable import *
+
+@pytest.fixture
+def vertex_hashtable():
+    vht = VertexHashTable()
+    vht.put("a", 1)
+    vht.put("b", 2)
+    vht.put("c", 3)
+    return vht
+
+def test_put(vertex_hashtable):
+    vertex_hashtable.put("d", 4)
+    assert vertex_hashtable.get_count() == 4
+    assert vertex_hashtable.get("d") == 4
+
+def test_put_existing_key_replaces(vertex_hashtable):
+    vertex_hashtable.put("a", 10)
+    assert vertex_hashtable.get_count() == 3
+    assert vertex_hashtable.get("a") == 10
+
+def test_get_missing(vertex_hashtable):
+    assert vertex_hashtable.get("z") is None
+    assert not vertex_hashtable.has_key("z")
+
+def test_remove(vertex_hashtable):
+    assert vertex_hashtable.remove("b") == 2
+    assert not vertex_hashtable.has_key("b")
+    assert vertex_hashtable.get_count() == 2
+    with pytest.raises(KeyNotFoundError):
+        vertex_hashtable.remove("b")
+
+def test_integer_keys_and_resize():
+    vht = VertexHashTable(3)
+    for i in range(500):
+        vht.put(i, str(i))
+    for i in range(0, 500, 2):
+        vht.remove(i)
+    assert vht.get_count() == 250
+    assert vht.get(251) == "251"
+    assert vht.get(250) is None
+    assert vht.get_lf() <= 0.75
+
+if __name__ == "__main__":
+    pytest.main()